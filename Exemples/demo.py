@@ -41,6 +41,7 @@ Une figure est également sauvegardée (`reseau_satisfaction_finale.png`).
 
 import sys
 import os
+import logging
 import matplotlib.pyplot as plt
 import copy
 
@@ -52,6 +53,9 @@ sys.path.insert(
 from data import Noeud, Liaison, ReseauHydraulique, optimiser_liaisons, satisfaction
 from affichage import afficherCarte, afficherCarteEnoncer
 
+# Les calculs sont silencieux par défaut : on affiche ici leur déroulement
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 # === Étape 1 : Définition des noeuds et liaisons ===
 
 ListeNoeuds = [
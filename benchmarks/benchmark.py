@@ -0,0 +1,292 @@
+"""
+benchmark.py – Mesures de performance du calcul de flot, de l'optimisation et de l'affichage.
+
+Chaque cas (construction du réseau, flot maximal, liaisons saturées, optimisation,
+satisfaction, sauvegarde / chargement JSON, carte) est mesuré sur plusieurs tailles de
+réseau, du réseau "Demo" de `reseaux.json` jusqu'à 10^5 nœuds. Pour chaque mesure sont
+relevés :
+    - le temps d'exécution (meilleur de plusieurs répétitions, en secondes),
+    - le pic de mémoire allouée (tracemalloc, en octets),
+    - le nombre de calculs complets de flot maximal (appels aux moteurs de `MOTEURS`).
+
+Les résultats sont écrits en JSON et peuvent être comparés à une référence enregistrée
+précédemment : le script se termine avec le code 1 si un cas est plus lent que la
+référence au-delà de la tolérance.
+
+Utilisation :
+-------------
+    ```bash
+    uv run benchmarks/benchmark.py --sortie reference.json
+    uv run benchmarks/benchmark.py --echelles demo 1e3 --reference reference.json
+    ```
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+# 📁 Ajout du chemin vers le dossier 'src' pour importer les modules du projet
+RACINE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(RACINE, 'src'))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import scipy  # noqa: E402
+
+from affichage import afficherCarte  # noqa: E402
+from cache import CACHE_FLOTS  # noqa: E402
+from data import (  # noqa: E402
+    GestionReseau,
+    ReseauHydraulique,
+    optimiser_liaisons,
+    satisfaction,
+)
+from generateur import generer_reseau, parametres_echelle  # noqa: E402
+from moteurs import MOTEURS  # noqa: E402
+
+ECHELLES = {"demo": None, "1e2": 100, "1e3": 1_000, "1e4": 10_000, "1e5": 100_000}
+
+
+def reseau_echelle(echelle: str):
+    """Nœuds et liaisons du réseau d'une échelle ('demo' : réseau Demo de reseaux.json)."""
+    if ECHELLES[echelle] is None:
+        return GestionReseau.charger_reseau(
+            os.path.join(RACINE, "reseaux.json"), "Demo"
+        )
+    gestion = generer_reseau(**parametres_echelle(ECHELLES[echelle]), graine=0)
+    return gestion.ListeNoeuds, gestion.ListeLiaisons
+
+
+def _reseau_calcule(noeuds, liaisons):
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    result, _ = reseau.calculerFlotMaximal()
+    return reseau, result
+
+
+def _cas_sauvegarde(noeuds, liaisons):
+    dossier = tempfile.mkdtemp()
+    fichier = os.path.join(dossier, "reseaux.json")
+    return lambda: GestionReseau.sauvegarder_reseaux(noeuds, liaisons, fichier, "bench")
+
+
+def _cas_chargement(noeuds, liaisons):
+    dossier = tempfile.mkdtemp()
+    fichier = os.path.join(dossier, "reseaux.json")
+    GestionReseau.sauvegarder_reseaux(noeuds, liaisons, fichier, "bench")
+    return lambda: GestionReseau.charger_reseaux(fichier)
+
+
+def _cas_carte(noeuds, liaisons):
+    reseau, result = _reseau_calcule(noeuds, liaisons)
+
+    def dessiner():
+        afficherCarte(result, reseau.index_noeuds, noeuds, liaisons)
+        plt.close("all")
+
+    return dessiner
+
+
+def _cas_saturees(noeuds, liaisons):
+    reseau, result = _reseau_calcule(noeuds, liaisons)
+    return lambda: reseau.liaisons_saturees(result)
+
+
+def _cas_optimisation(noeuds, liaisons):
+    a_optimiser = [(li.depart, li.arrivee) for li in liaisons[:10]]
+    return lambda: optimiser_liaisons(
+        noeuds, liaisons, a_optimiser, niveaux=[5, 10, 15, 20]
+    )
+
+
+def _cas_satisfaction(noeuds, liaisons):
+    return lambda: satisfaction(noeuds, liaisons, cap_max=25, max_travaux=3)
+
+
+# nom du cas -> (préparation(noeuds, liaisons) -> fonction mesurée, nœuds max)
+CAS = {
+    "init": (lambda n, li: lambda: ReseauHydraulique(n, li, verbeux=False), None),
+    "flot_maximal": (
+        lambda n, li: ReseauHydraulique(n, li, verbeux=False).calculerFlotMaximal,
+        None,
+    ),
+    "liaisons_saturees": (_cas_saturees, None),
+    "optimiser_liaisons": (_cas_optimisation, None),
+    "satisfaction": (_cas_satisfaction, 10_000),
+    "sauvegarder_reseaux": (_cas_sauvegarde, None),
+    "charger_reseaux": (_cas_chargement, None),
+    # Disposition kamada-kawai en O(n²) : limitée aux petits réseaux
+    "afficherCarte": (_cas_carte, 100),
+}
+
+
+@contextlib.contextmanager
+def compter_appels_flot():
+    """Compte les calculs complets de flot maximal (appels aux moteurs de MOTEURS)."""
+    compteur = {"appels": 0}
+    originaux = dict(MOTEURS)
+
+    def compte(moteur):
+        def appel(*args, **kwargs):
+            compteur["appels"] += 1
+            return moteur(*args, **kwargs)
+
+        return appel
+
+    MOTEURS.update({nom: compte(moteur) for nom, moteur in originaux.items()})
+    try:
+        yield compteur
+    finally:
+        MOTEURS.update(originaux)
+
+
+def mesurer(fonction, repetitions: int = 3) -> dict:
+    """
+    Temps (meilleur de `repetitions` exécutions), pic de mémoire et nombre de calculs de
+    flot d'une fonction. La mémoire et les appels sont relevés lors d'une exécution à
+    part, tracemalloc ralentissant l'exécution. Le cache des flots est vidé avant chaque
+    exécution : les calculs mesurés sont toujours des calculs complets.
+    """
+    temps = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repetitions):
+            CACHE_FLOTS.vider()
+            debut = time.perf_counter()
+            fonction()
+            temps.append(time.perf_counter() - debut)
+
+        CACHE_FLOTS.vider()
+        tracemalloc.start()
+        try:
+            with compter_appels_flot() as compteur:
+                fonction()
+            _, pic = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "temps_s": min(temps),
+        "memoire_pic_o": pic,
+        "appels_flot": compteur["appels"],
+    }
+
+
+def executer(echelles=None, cas=None, repetitions: int = 3) -> dict:
+    """
+    Exécute les cas demandés (tous par défaut) sur les échelles demandées.
+
+    Un cas n'est pas mesuré sur les réseaux dépassant sa taille maximale.
+
+    Returns:
+        dict: {"meta": {...}, "resultats": [{"cas", "echelle", "nb_noeuds",
+        "nb_liaisons", "temps_s", "memoire_pic_o", "appels_flot"}, ...]}
+    """
+    echelles = list(ECHELLES) if echelles is None else echelles
+    cas = list(CAS) if cas is None else cas
+    resultats = []
+    for echelle in echelles:
+        noeuds, liaisons = reseau_echelle(echelle)
+        for nom in cas:
+            preparer, limite = CAS[nom]
+            if limite is not None and len(noeuds) > limite:
+                continue
+            mesure = mesurer(preparer(noeuds, liaisons), repetitions)
+            resultats.append(
+                {
+                    "cas": nom,
+                    "echelle": echelle,
+                    "nb_noeuds": len(noeuds),
+                    "nb_liaisons": len(liaisons),
+                    **mesure,
+                }
+            )
+    meta = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "repetitions": repetitions,
+    }
+    return {"meta": meta, "resultats": resultats}
+
+
+def comparer(resultats: dict, reference: dict, tolerance: float = 0.10) -> list:
+    """
+    Compare des résultats à une référence, cas par cas (même cas, même échelle).
+
+    Returns:
+        Liste de dictionnaires {"cas", "echelle", "rapport_temps", "rapport_memoire",
+        "appels_flot", "appels_flot_reference", "regression"} ; `regression` est vrai si
+        le temps dépasse celui de la référence de plus de `tolerance` (10 % par défaut).
+    """
+    references = {(r["cas"], r["echelle"]): r for r in reference["resultats"]}
+    comparaisons = []
+    for r in resultats["resultats"]:
+        ref = references.get((r["cas"], r["echelle"]))
+        if ref is None:
+            continue
+        rapport = r["temps_s"] / ref["temps_s"] if ref["temps_s"] else float("inf")
+        comparaisons.append(
+            {
+                "cas": r["cas"],
+                "echelle": r["echelle"],
+                "rapport_temps": rapport,
+                "rapport_memoire": (
+                    r["memoire_pic_o"] / ref["memoire_pic_o"]
+                    if ref["memoire_pic_o"]
+                    else float("inf")
+                ),
+                "appels_flot": r["appels_flot"],
+                "appels_flot_reference": ref["appels_flot"],
+                "regression": rapport > 1 + tolerance,
+            }
+        )
+    return comparaisons
+
+
+def main(arguments=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--echelles", nargs="+", choices=list(ECHELLES))
+    parser.add_argument("--cas", nargs="+", choices=list(CAS))
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--reference", help="Fichier JSON de référence à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(arguments)
+
+    resultats = executer(args.echelles, args.cas, args.repetitions)
+    if args.sortie:
+        with open(args.sortie, 'w') as f:
+            json.dump(resultats, f, indent=4)
+    else:
+        print(json.dumps(resultats, indent=4))
+
+    if not args.reference:
+        return 0
+    with open(args.reference, 'r') as f:
+        reference = json.load(f)
+    comparaisons = comparer(resultats, reference, args.tolerance)
+    for c in comparaisons:
+        marque = "❌" if c["regression"] else "✅"
+        print(
+            f"{marque} {c['cas']:<20} {c['echelle']:<5} temps x{c['rapport_temps']:.2f}"
+            f"  mémoire x{c['rapport_memoire']:.2f}"
+            f"  flots {c['appels_flot_reference']} -> {c['appels_flot']}",
+            file=sys.stderr,
+        )
+    return 1 if any(c["regression"] for c in comparaisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 import networkx as nx
 import matplotlib.pyplot as plt
-from data import ReseauHydraulique
+from data import ReseauHydraulique, ResultatFlot
 
 
 def afficherCarte(
@@ -14,7 +14,7 @@ def afficherCarte(
     reçus par les villes et délivrés par les sources.
 
     Args:
-        result: Résultat du calcul de flot (de maximum_flow).
+        result: Résultat du calcul de flot (`ResultatFlot` ou résultat brut de maximum_flow).
         index_noeuds (dict): Dictionnaire nom -> index.
         noeuds (List[Noeud]): Liste des nœuds du réseau.
         liaisons (List[Liaison]): Liste des liaisons du réseau.
@@ -48,7 +48,16 @@ def afficherCarte(
     sources = {}
 
     # Calcul des flux sources/villes si result est fourni
-    if result:
+    flux_arcs = None
+    if isinstance(result, ResultatFlot):
+        # Flux déjà extraits arête par arête : aucune reconstruction du réseau
+        flux_arcs = result.flux_par_arc()
+        for nom, noeud in infos_noeuds.items():
+            if noeud.type == "ville":
+                appro[nom] = flux_arcs.get((nom, 'super_puits'), 0)
+            elif noeud.type == "source":
+                sources[nom] = flux_arcs.get(('super_source', nom), 0)
+    elif result:
         reseau_temp = ReseauHydraulique(noeuds, liaisons)
         index_noeuds = reseau_temp.index_noeuds
 
@@ -81,7 +90,13 @@ def afficherCarte(
 
     # Détection des liaisons saturées
     saturees_set = set()
-    if montrer_saturees and result:
+    if montrer_saturees and flux_arcs is not None:
+        saturees_set = {
+            (liaison.depart, liaison.arrivee)
+            for liaison in liaisons
+            if flux_arcs.get((liaison.depart, liaison.arrivee)) == liaison.capacite
+        }
+    elif montrer_saturees and result:
         saturations = reseau_temp.liaisons_saturees(result=result)
         saturees_set = set((d, a) for d, a, _ in saturations)
 
@@ -123,7 +138,9 @@ def afficherCarte(
     edge_labels = {}
     for u, v in G.edges:
         cap = G[u][v]['weight']
-        if result:
+        if flux_arcs is not None:
+            edge_labels[(u, v)] = f"{int(flux_arcs.get((u, v), 0))} / {cap}"
+        elif result:
             try:
                 flux = result.flow[index_noeuds[u], index_noeuds[v]]
                 edge_labels[(u, v)] = f"{int(flux)} / {cap}"
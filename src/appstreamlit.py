@@ -17,6 +17,7 @@ Fonctionnalités principales :
     - afficher_carte_flot() : Affichage graphique du réseau avec calcul du flot maximal.
     - menu_travaux() : Optimisation manuelle des liaisons sélectionnées.
     - menu_generalisation() : Optimisation automatique selon différents scénarios prédéfinis.
+    - afficher_contingence() : Tableau N-1 des pertes de flot, classé par gravité.
     - menu_chargement() : Chargement d’un réseau existant depuis un fichier.
     - reset_reseau() : Réinitialisation complète du réseau en cours.
 
@@ -57,10 +58,12 @@ from data import (
     ReseauHydraulique,
     optimiser_liaisons,
     satisfaction,
+    resume_travaux,
     Noeud,
     Liaison,
 )
 from affichage import afficherCarte, afficherCarteEnoncer
+from contingence import analyse_contingence, libelle_element
 
 st.set_page_config(page_title="AquaFlow", layout="wide", page_icon="🚰")
 
@@ -110,6 +113,20 @@ if "reseau_valide" not in st.session_state:
 reseau = st.session_state["reseau"]
 
 
+def reseau_hydro_assechement():
+    """
+    Réseau de calcul conservé entre les interactions du scénario d'assèchement.
+
+    Il est mis à jour à chaud (assèchement d'une source, renforcement d'une liaison)
+    au lieu d'être reconstruit et recalculé à chaque étape.
+    """
+    if st.session_state.get("reseau_hydro_assechement") is None:
+        st.session_state["reseau_hydro_assechement"] = ReseauHydraulique(
+            reseau.ListeNoeuds, reseau.ListeLiaisons
+        )
+    return st.session_state["reseau_hydro_assechement"]
+
+
 def reset_reseau():
     if (
         "reseau_original_noeuds" in st.session_state
@@ -123,6 +140,7 @@ def reset_reseau():
             st.session_state["reseau_original_liaisons"]
         )
         st.session_state["reseau_valide"] = True  # Ou False selon ce que tu souhaites
+        st.session_state.pop("reseau_hydro_assechement", None)
         st.success("Le réseau a été réinitialisé à son état validé initial.")
     else:
         st.warning("Impossible de réinitialiser : état initial non trouvé.")
@@ -146,6 +164,7 @@ def menu_saisie_reseau():
         if st.button("✅ Valider le réseau"):
             if reseau.ListeNoeuds and reseau.ListeLiaisons:
                 st.session_state["reseau_valide"] = True
+                st.session_state.pop("reseau_hydro_assechement", None)
                 # Sauvegarde de la version initiale du réseau
                 st.session_state["reseau_original_noeuds"] = copy.deepcopy(
                     reseau.ListeNoeuds
@@ -160,18 +179,18 @@ def menu_saisie_reseau():
             else:
                 st.warning("Veuillez ajouter au moins un noeud et une liaison.")
     with col2:
-        nom_fichier = st.text_input(
-            "Nom du fichier de sauvegarde", value="reseau1.json"
-        )
+        nom_fichier = st.text_input("Nom du fichier de sauvegarde", value="reseaux.db")
+        nom_reseau = st.text_input("Nom du réseau", value="reseau_1")
         if st.button("💾 Sauvegarder ce réseau"):
-            if nom_fichier:
-                reseau.sauvegarder_reseaux(nom_fichier)
-                st.success(f"Réseau sauvegardé dans {nom_fichier}")
+            if nom_fichier and nom_reseau:
+                GestionReseau.sauvegarder_reseaux(
+                    reseau.ListeNoeuds, reseau.ListeLiaisons, nom_fichier, nom_reseau
+                )
+                st.success(f"Réseau {nom_reseau} sauvegardé dans {nom_fichier}")
 
 
 def ajouter_noeuds(type_noeud):
     icones = {"source": "💧", "ville": "🏙️", "intermediaire": "🔵"}
-    noms_existants = {n.nom for n in reseau.ListeNoeuds}
     nom = st.text_input(
         f"{icones[type_noeud]} Nom de la {type_noeud}", key=f"{type_noeud}_nom"
     )
@@ -193,7 +212,7 @@ def ajouter_noeuds(type_noeud):
         if nom.strip() == "":
             st.warning("Le nom ne peut pas être vide.")
             return
-        if nom_upper in noms_existants:
+        if reseau.noeud_existe(nom_upper):
             st.warning("Ce nom est déjà utilisé.")
         else:
             try:
@@ -203,6 +222,7 @@ def ajouter_noeuds(type_noeud):
                     else Noeud(nom_upper, type_noeud)
                 )
                 reseau.ListeNoeuds.append(noeud)
+                st.session_state.pop("reseau_hydro_assechement", None)
                 st.success(f"{type_noeud.capitalize()} ajoutée : {nom_upper}")
             except Exception as e:
                 st.error(str(e))
@@ -210,7 +230,7 @@ def ajouter_noeuds(type_noeud):
 
 def ajouter_liaisons():
     st.markdown("Ajoutez une liaison entre deux nœuds existants.")
-    noms_noeuds = {n.nom for n in reseau.ListeNoeuds}
+    noms_noeuds = reseau.noms_noeuds()
     depart = st.text_input("Départ de la liaison", key="liaison_depart")
     arrivee = st.text_input("Arrivée de la liaison", key="liaison_arrivee")
     capacite = st.number_input(
@@ -227,15 +247,13 @@ def ajouter_liaisons():
             st.warning("Une liaison ne peut pas relier un noeud à lui-même.")
         elif depart_upper not in noms_noeuds or arrivee_upper not in noms_noeuds:
             st.warning("Noeud de départ ou d’arrivée introuvable.")
-        elif any(
-            liaison.depart == depart_upper and liaison.arrivee == arrivee_upper
-            for liaison in reseau.ListeLiaisons
-        ):
+        elif reseau.ListeLiaisons.contient((depart_upper, arrivee_upper)):
             st.warning("Cette liaison existe déjà.")
         else:
             try:
                 liaison = Liaison(depart_upper, arrivee_upper, capacite)
                 reseau.ListeLiaisons.append(liaison)
+                st.session_state.pop("reseau_hydro_assechement", None)
                 st.success(f"Liaison ajoutée : {depart_upper} ➝ {arrivee_upper}")
             except Exception as e:
                 st.error(str(e))
@@ -330,12 +348,21 @@ def menu_travaux():
     for s in selection:
         u, v = s.split("➝")
         liaisons_a_optimiser.append((u.strip(), v.strip()))
+    mode = st.radio(
+        "Méthode",
+        ["glouton", "exact"],
+        format_func=lambda m: (
+            "Gloutonne (meilleure liaison à chaque étape)"
+            if m == "glouton"
+            else "Exacte (meilleure combinaison de travaux)"
+        ),
+    )
     if st.button("🚀 Lancer l'optimisation"):
         if not liaisons_a_optimiser:
             st.warning("Aucune liaison sélectionnée.")
             return
         config_finale, travaux = optimiser_liaisons(
-            reseau.ListeNoeuds, reseau.ListeLiaisons, liaisons_a_optimiser
+            reseau.ListeNoeuds, reseau.ListeLiaisons, liaisons_a_optimiser, mode=mode
         )
         st.success("Optimisation terminée.")
         for i, (liaison, cap, flot) in enumerate(travaux):
@@ -380,9 +407,17 @@ def menu_generalisation():
         return
     choix = st.radio(
         "Scénario",
-        ["Optimiser pour approvisionner 100% des villes", "Assèchement d'une source"],
+        [
+            "Optimiser pour approvisionner 100% des villes",
+            "Assèchement d'une source",
+            "Analyse N-1 (perte de chaque élément)",
+        ],
     )
 
+    if choix == "Analyse N-1 (perte de chaque élément)":
+        afficher_contingence()
+        return
+
     if choix == "Optimiser pour approvisionner 100% des villes":
         # Crée une copie propre du réseau pour l’optimisation
         noeuds_copie = copy.deepcopy(reseau.ListeNoeuds)
@@ -411,6 +446,15 @@ def menu_generalisation():
                 cap_max=capacite_maximale,
                 max_travaux=10,
             )
+            coupe = ReseauHydraulique(
+                noeuds_copie, nouvelle_config, verbeux=False
+            ).coupe_minimale()
+            st.markdown("**🔻 Goulot d'étranglement restant (coupe minimale) :**")
+            st.write(
+                ", ".join(
+                    f"{depart} ➝ {arrivee} ({cap} u.)" for depart, arrivee, cap in coupe
+                )
+            )
             if not travaux:
                 st.warning(
                     "⚠️ Objectif non atteignable avec la configuration actuelle du réseau et les capacités testées."
@@ -419,33 +463,12 @@ def menu_generalisation():
                 st.success("Optimisation globale terminée.")
 
                 # Résumé des travaux par liaison
-                resume_travaux = {}
-                for (depart, arrivee), cap, new_flot in travaux:
-                    key = (depart, arrivee)
-                    if key not in resume_travaux:
-                        # Capacité de départ dans la config initiale
-                        cap_depart = next(
-                            (
-                                liaison_obj.capacite
-                                for liaison_obj in liaisons_copie
-                                if liaison_obj.depart == depart
-                                and liaison_obj.arrivee == arrivee
-                            ),
-                            None,
-                        )
-                        resume_travaux[key] = {
-                            "cap_depart": cap_depart,
-                            "cap_fin": cap,
-                            "flot": new_flot,
-                        }
-                    else:
-                        resume_travaux[key]["cap_fin"] = cap
-                        resume_travaux[key]["flot"] = new_flot
+                resume = resume_travaux(liaisons_copie, travaux)
 
                 st.markdown("**Résumé des travaux par liaison :**")
                 # Trie les travaux par valeur du flot maximal atteint lors du dernier changement (ordre croissant)
                 for (depart, arrivee), infos in sorted(
-                    resume_travaux.items(), key=lambda x: x[1]['flot']
+                    resume.items(), key=lambda x: x[1]['flot']
                 ):
                     st.write(
                         f"Liaison {depart} ➝ {arrivee} : capacité {infos['cap_depart']} ➔ {infos['cap_fin']} unités, "
@@ -494,6 +517,9 @@ def menu_generalisation():
             if st.button("💣 Assécher une source aléatoirement"):
                 source_choisie = random.choice(sources)
                 st.session_state["source_assechee"] = source_choisie.nom
+                reseau_hydro_assechement().modifier_capacite_noeud(
+                    source_choisie.nom, 0
+                )
                 for n in reseau.ListeNoeuds:
                     if n.nom == source_choisie.nom:
                         n.capaciteMax = 0
@@ -505,6 +531,7 @@ def menu_generalisation():
             )
             if st.button("💣 Assécher la source sélectionnée"):
                 st.session_state["source_assechee"] = source_select
+                reseau_hydro_assechement().modifier_capacite_noeud(source_select, 0)
                 for n in reseau.ListeNoeuds:
                     if n.nom == source_select:
                         n.capaciteMax = 0
@@ -514,11 +541,12 @@ def menu_generalisation():
                 f"Source choisie : <span style='color:#d62728;font-weight:bold'>{st.session_state['source_assechee']}</span>",
                 unsafe_allow_html=True,
             )
-            reseau_hydro = ReseauHydraulique(reseau.ListeNoeuds, reseau.ListeLiaisons)
-            result, index_noeuds = reseau_hydro.calculerFlotMaximal()
+            # Flot mis à jour à chaud : pas de recalcul complet après chaque assèchement
+            reseau_hydro = reseau_hydro_assechement()
+            result = reseau_hydro.resultat_courant()
             fig = afficherCarte(
                 result=result,
-                index_noeuds=index_noeuds,
+                index_noeuds=reseau_hydro.index_noeuds,
                 noeuds=reseau.ListeNoeuds,
                 liaisons=reseau.ListeLiaisons,
                 montrer_saturees=True,
@@ -537,19 +565,15 @@ def menu_generalisation():
                 for liaison in reseau.ListeLiaisons:
                     if liaison.depart == u and liaison.arrivee == v:
                         liaison.capacite += 5
+                        reseau_hydro.augmenter_capacite(u, v, liaison.capacite)
                         st.write(
                             f"Liaison {u} ➝ {v} renforcée à {liaison.capacite} unités."
                         )
                         break
-                reseau_hydro = ReseauHydraulique(
-                    reseau.ListeNoeuds, reseau.ListeLiaisons
-                )
-                result_modifie, index_noeuds_modifie = (
-                    reseau_hydro.calculerFlotMaximal()
-                )
+                result_modifie = reseau_hydro.resultat_courant()
                 fig = afficherCarte(
                     result=result_modifie,
-                    index_noeuds=index_noeuds_modifie,
+                    index_noeuds=reseau_hydro.index_noeuds,
                     noeuds=reseau.ListeNoeuds,
                     liaisons=reseau.ListeLiaisons,
                     montrer_saturees=True,
@@ -560,6 +584,7 @@ def menu_generalisation():
             # Ajouter un bouton pour réinitialiser l'état si besoin
             if st.button("🔄 Réinitialiser l'assèchement"):
                 st.session_state["source_assechee"] = None
+                st.session_state.pop("reseau_hydro_assechement", None)
 
                 if (
                     "reseau_original_noeuds" in st.session_state
@@ -578,30 +603,83 @@ def menu_generalisation():
                     )
 
 
+def afficher_contingence():
+    st.markdown(
+        "Flot maximal du réseau privé de chaque élément, un à la fois : les éléments "
+        "les plus critiques apparaissent en tête."
+    )
+    types = ["source"]
+    if st.checkbox("Inclure les liaisons"):
+        types.append("liaison")
+    if st.checkbox("Inclure les nœuds intermédiaires"):
+        types.append("intermediaire")
+
+    if st.button("📉 Lancer l'analyse N-1"):
+        tableau = analyse_contingence(
+            reseau.ListeNoeuds, reseau.ListeLiaisons, niveau=1, elements=types
+        )
+        if not tableau:
+            st.warning("Aucun élément à analyser.")
+            return
+        st.dataframe(
+            [
+                {
+                    "Élément retiré": ", ".join(
+                        libelle_element(e) for e in ligne["elements"]
+                    ),
+                    "Flot (u.)": ligne["flot"],
+                    "Perte (u.)": ligne["perte"],
+                    "Perte (%)": round(100 * ligne["perte_relative"], 1),
+                    "Villes en déficit": ", ".join(
+                        f"{ville} (-{manque})"
+                        for ville, manque in ligne["deficits"].items()
+                    ),
+                    "Nouvelles liaisons saturées": ", ".join(
+                        f"{u} ➝ {v}" for u, v in ligne["nouvelles_saturees"]
+                    ),
+                }
+                for ligne in tableau
+            ],
+            hide_index=True,
+        )
+
+
 def menu_chargement():
     st.header("📂 Chargement d'un réseau existant")
     st.info("Chargez un réseau sauvegardé pour le visualiser ou l'optimiser.")
-    fichier = st.text_input("Nom du fichier à charger", value="reseaux.json")
+    fichier = st.text_input(
+        "Nom du fichier à charger (.json ou base .db)", value="reseaux.json"
+    )
 
-    # Charger les réseaux une seule fois et les garder en mémoire
+    # Seul le catalogue (noms et tailles) est gardé en mémoire
 
     if st.button("🔄 Charger le réseau"):
         try:
-            reseaux = GestionReseau.charger_reseaux(fichier)
-            if not reseaux:
+            catalogue = GestionReseau.catalogue_reseaux(fichier)
+            if not catalogue:
                 st.warning("Aucun réseau trouvé dans ce fichier.")
             else:
-                st.session_state["reseaux_charges"] = reseaux
+                st.session_state["catalogue_reseaux"] = catalogue
                 st.session_state["dernier_fichier_charge"] = fichier
                 st.success("Réseaux chargés avec succès.")
         except Exception as e:
             st.error(f"Erreur lors du chargement : {e}")
 
-    reseaux = st.session_state.get("reseaux_charges", {})
-    if reseaux:
-        nom_reseau = st.selectbox("Choisir un réseau", list(reseaux.keys()))
+    # Le réseau choisi n'est lu qu'à la validation
+    catalogue = st.session_state.get("catalogue_reseaux", {})
+    if catalogue:
+        nom_reseau = st.selectbox(
+            "Choisir un réseau",
+            list(catalogue.keys()),
+            format_func=lambda nom: (
+                f"{nom} ({catalogue[nom]['nb_noeuds']} nœuds, "
+                f"{catalogue[nom]['nb_liaisons']} liaisons)"
+            ),
+        )
         if st.button("✅ Valider le chargement"):
-            noeuds, liaisons = reseaux[nom_reseau]
+            noeuds, liaisons = GestionReseau.charger_reseau(
+                st.session_state["dernier_fichier_charge"], nom_reseau
+            )
             st.session_state["reseau"] = GestionReseau(noeuds, liaisons)
             st.session_state["reseau_valide"] = False  # On force la validation manuelle
             st.success("Réseau chargé. Cliquez sur 'Valider le réseau' pour continuer.")
@@ -611,6 +689,7 @@ def menu_chargement():
         reseau = st.session_state["reseau"]
         if reseau.ListeNoeuds and reseau.ListeLiaisons:
             st.session_state["reseau_valide"] = True
+            st.session_state.pop("reseau_hydro_assechement", None)
             # Sauvegarde de la version initiale du réseau
             st.session_state["reseau_original_noeuds"] = copy.deepcopy(
                 reseau.ListeNoeuds
@@ -0,0 +1,384 @@
+"""
+cache.py – Mémoïsation des calculs de flot maximal, par empreinte du réseau.
+
+Un réseau est identifié par l'empreinte de sa matrice de capacités (structure CSR et
+capacités, donc nœuds, types, capacités et liaisons), des indices de la super source et
+du super puits et du moteur de calcul. Deux réseaux identiques, construits par exemple à
+chaque interaction avec l'application, partagent ainsi le même résultat : le second
+calcul se réduit à une recherche dans un dictionnaire.
+
+Le module fournit :
+    - empreinte_flot(...) : empreinte d'un problème de flot,
+    - CacheFlots : cache LRU borné en nombre d'entrées et en mémoire, avec statistiques,
+    - CacheDisque : cache persistant (fichier SQLite), partagé entre processus et entre
+      exécutions, à brancher sous un `CacheFlots` (désactivé par défaut),
+    - CACHE_FLOTS : cache partagé utilisé par défaut par `ReseauHydraulique` et
+      `ReseauCompact` (data.py).
+
+Exemple (traitement par lots relancé chaque nuit) :
+
+    >>> CACHE_FLOTS.disque = CacheDisque("flots.db", max_octets=2**30)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def empreinte_flot(matrice: csr_matrix, source: int, puits: int, moteur: str) -> str:
+    """
+    Empreinte (BLAKE2b, 128 bits) d'un problème de flot : dimensions, structure et
+    capacités de la matrice CSR, source, puits et moteur de calcul.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{matrice.shape[0]}:{source}:{puits}:{moteur}:".encode())
+    for tableau in (matrice.indptr, matrice.indices, matrice.data):
+        h.update(np.ascontiguousarray(tableau, dtype=np.int64).data)
+    return h.hexdigest()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flots (
+    cle TEXT PRIMARY KEY,
+    valeur INTEGER NOT NULL,
+    moteur TEXT NOT NULL,
+    flux BLOB NOT NULL,
+    coupe BLOB,
+    octets INTEGER NOT NULL,
+    acces REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flots_acces ON flots (acces);
+"""
+
+
+def _encoder(tableau: np.ndarray) -> bytes:
+    return zlib.compress(np.ascontiguousarray(tableau, dtype=np.int64).data, 1)
+
+
+def _decoder(donnees: bytes) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(donnees), dtype=np.int64)
+
+
+class CacheDisque:
+    """
+    Cache persistant des flots maximaux : empreinte -> (valeur du flot, flux de chaque
+    arête, moteur, coupe minimale), dans un fichier SQLite.
+
+    Les tableaux sont stockés en entiers 64 bits compressés (zlib). Quand la taille des
+    entrées dépasse `max_octets`, les entrées les moins récemment lues ou écrites sont
+    supprimées. La base est en mode WAL : plusieurs processus peuvent la lire pendant
+    qu'un autre y écrit, chaque écriture (entrée et évictions) étant une transaction.
+    Un processus créé par `fork` ouvre sa propre connexion.
+
+    Args:
+        chemin (str): Fichier de la base (créé s'il n'existe pas).
+        max_octets (int): Taille maximale cumulée des tableaux compressés.
+        delai (float): Attente maximale (s) d'un verrou tenu par un autre processus.
+    """
+
+    def __init__(
+        self, chemin: str, max_octets: int = 512 * 2**20, delai: float = 30.0
+    ) -> None:
+        self.chemin = str(chemin)
+        self.max_octets = max_octets
+        self.delai = delai
+        self.succes = self.echecs = self.evictions = 0
+        self._verrou = threading.Lock()
+        self._pid = None
+        self._connexion = None
+        self._connecter()
+
+    def _connecter(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            self._connexion = sqlite3.connect(
+                self.chemin, timeout=self.delai, check_same_thread=False
+            )
+            self._connexion.execute("PRAGMA journal_mode=WAL")
+            self._connexion.executescript(_SCHEMA)
+            self._pid = os.getpid()
+        return self._connexion
+
+    def __enter__(self) -> "CacheDisque":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    def fermer(self) -> None:
+        if self._connexion is not None and self._pid == os.getpid():
+            self._connexion.close()
+        self._connexion = self._pid = None
+
+    def __len__(self) -> int:
+        with self._verrou:
+            requete = "SELECT COUNT(*) FROM flots"
+            return self._connecter().execute(requete).fetchone()[0]
+
+    def __contains__(self, cle: str) -> bool:
+        with self._verrou:
+            requete = "SELECT 1 FROM flots WHERE cle = ?"
+            return self._connecter().execute(requete, (cle,)).fetchone() is not None
+
+    def lire(self, cle: str) -> Optional[Tuple[int, np.ndarray, str, np.ndarray]]:
+        """(valeur, flux, moteur, coupe ou None) si `cle` est en cache, sinon None."""
+        with self._verrou:
+            connexion = self._connecter()
+            ligne = connexion.execute(
+                "SELECT valeur, moteur, flux, coupe FROM flots WHERE cle = ?", (cle,)
+            ).fetchone()
+            if ligne is None:
+                self.echecs += 1
+                return None
+            self.succes += 1
+            try:
+                with connexion:
+                    connexion.execute(
+                        "UPDATE flots SET acces = ? WHERE cle = ?", (time.time(), cle)
+                    )
+            except sqlite3.OperationalError:
+                # Base verrouillée par un autre processus : seul l'ordre LRU en pâtit
+                pass
+        valeur, moteur, flux, coupe = ligne
+        return (
+            valeur,
+            _decoder(flux),
+            moteur,
+            None if coupe is None else _decoder(coupe),
+        )
+
+    def ecrire(
+        self,
+        cle: str,
+        valeur: int,
+        flux: np.ndarray,
+        moteur: str,
+        coupe: Optional[np.ndarray] = None,
+    ) -> None:
+        """Enregistre (ou remplace) une entrée puis évince les plus anciennes en excès."""
+        donnees_flux = _encoder(flux)
+        donnees_coupe = None if coupe is None else _encoder(coupe)
+        octets = len(donnees_flux) + len(donnees_coupe or b"")
+        if octets > self.max_octets:
+            return
+        with self._verrou:
+            connexion = self._connecter()
+            with connexion:
+                connexion.execute(
+                    "INSERT INTO flots VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(cle) DO UPDATE SET valeur = excluded.valeur, "
+                    "moteur = excluded.moteur, flux = excluded.flux, "
+                    "coupe = excluded.coupe, octets = excluded.octets, "
+                    "acces = excluded.acces",
+                    (
+                        cle,
+                        int(valeur),
+                        moteur,
+                        donnees_flux,
+                        donnees_coupe,
+                        octets,
+                        time.time(),
+                    ),
+                )
+                self._evincer(connexion)
+
+    def _evincer(self, connexion: sqlite3.Connection) -> None:
+        requete = "SELECT COALESCE(SUM(octets), 0) FROM flots"
+        total = connexion.execute(requete).fetchone()[0]
+        if total <= self.max_octets:
+            return
+        requete = "SELECT cle, octets FROM flots ORDER BY acces"
+        for cle, octets in connexion.execute(requete).fetchall():
+            if total <= self.max_octets:
+                break
+            connexion.execute("DELETE FROM flots WHERE cle = ?", (cle,))
+            total -= octets
+            self.evictions += 1
+
+    def vider(self) -> None:
+        """Supprime toutes les entrées."""
+        with self._verrou:
+            connexion = self._connecter()
+            with connexion:
+                connexion.execute("DELETE FROM flots")
+
+    def statistiques(self) -> dict:
+        """Succès, échecs et évictions de ce processus, nombre d'entrées et taille."""
+        with self._verrou:
+            requete = "SELECT COUNT(*), COALESCE(SUM(octets), 0) FROM flots"
+            entrees, octets = self._connecter().execute(requete).fetchone()
+        return {
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+            "entrees": entrees,
+            "octets": octets,
+        }
+
+
+class CacheFlots:
+    """
+    Cache LRU des flots maximaux : empreinte -> (valeur du flot, flux de chaque arête,
+    moteur, coupe minimale éventuelle).
+
+    Les entrées les moins récemment utilisées sont évincées dès que le nombre d'entrées
+    dépasse `max_entrees` ou que la taille des tableaux stockés dépasse `max_octets`. Les
+    flux sont copiés à l'écriture comme à la lecture : les mises à jour à chaud d'un
+    réseau ne modifient jamais une entrée. Le cache peut être partagé entre threads.
+
+    Un `CacheDisque` peut être branché comme second niveau (attribut `disque`) : il est
+    consulté quand une empreinte est absente de la mémoire, et reçoit chaque nouveau
+    résultat, coupe minimale comprise.
+
+    Args:
+        max_entrees (int): Nombre maximal d'entrées (0 désactive le cache).
+        max_octets (int): Taille maximale cumulée des tableaux stockés.
+        disque (CacheDisque, optional): Cache persistant de second niveau.
+
+    Exemple d'utilisation :
+
+        >>> cache = CacheFlots(max_entrees=64)
+        >>> reseau = ReseauHydraulique(noeuds, liaisons, cache=cache)
+        >>> cache.statistiques()
+    """
+
+    def __init__(
+        self,
+        max_entrees: int = 256,
+        max_octets: int = 256 * 2**20,
+        disque: Optional[CacheDisque] = None,
+    ) -> None:
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+        self.disque = disque
+        self.octets = 0
+        self.succes = self.echecs = self.evictions = 0
+        self.configurer(max_entrees, max_octets)
+
+    def configurer(
+        self, max_entrees: Optional[int] = None, max_octets: Optional[int] = None
+    ) -> None:
+        """Change les limites du cache mémoire et évince les entrées en excès."""
+        with self._verrou:
+            if max_entrees is not None:
+                self.max_entrees = max_entrees
+            if max_octets is not None:
+                self.max_octets = max_octets
+            self._evincer()
+
+    @property
+    def actif(self) -> bool:
+        return self.max_entrees > 0
+
+    @property
+    def coupe_requise(self) -> bool:
+        """Vrai si la coupe minimale doit accompagner les résultats (cache disque)."""
+        return self.disque is not None
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+    def __contains__(self, cle: str) -> bool:
+        return cle in self._entrees
+
+    def lire(self, cle: str) -> Optional[Tuple[int, np.ndarray, str, np.ndarray]]:
+        """
+        (valeur, copie des flux, moteur, coupe ou None) si `cle` est en mémoire ou sur
+        disque, sinon None. Une entrée lue sur disque est remontée en mémoire.
+        """
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None:
+                self._entrees.move_to_end(cle)
+                self.succes += 1
+        if entree is None:
+            entree = self.disque.lire(cle) if self.disque is not None else None
+            with self._verrou:
+                if entree is None:
+                    self.echecs += 1
+                    return None
+                self.succes += 1
+                self._stocker(cle, *entree)
+        valeur, flux, moteur, coupe = entree
+        return valeur, flux.copy(), moteur, coupe
+
+    def ecrire(
+        self,
+        cle: str,
+        valeur: int,
+        flux: np.ndarray,
+        moteur: str,
+        coupe: Optional[np.ndarray] = None,
+    ) -> None:
+        """Mémorise un résultat (une copie des tableaux est conservée)."""
+        if not self.actif:
+            return
+        with self._verrou:
+            self._stocker(cle, valeur, flux, moteur, coupe)
+        if self.disque is not None:
+            self.disque.ecrire(cle, valeur, flux, moteur, coupe)
+
+    def _stocker(self, cle, valeur, flux, moteur, coupe) -> None:
+        tableaux = []
+        for tableau in (flux, coupe):
+            if tableau is not None:
+                tableau = np.array(tableau, copy=True)
+                tableau.flags.writeable = False
+            tableaux.append(tableau)
+        ancien = self._entrees.pop(cle, None)
+        if ancien is not None:
+            self.octets -= _taille(ancien)
+        entree = (valeur, tableaux[0], moteur, tableaux[1])
+        self._entrees[cle] = entree
+        self.octets += _taille(entree)
+        self._evincer()
+
+    def _evincer(self) -> None:
+        while self._entrees and (
+            len(self._entrees) > self.max_entrees or self.octets > self.max_octets
+        ):
+            _, entree = self._entrees.popitem(last=False)
+            self.octets -= _taille(entree)
+            self.evictions += 1
+
+    def vider(self) -> None:
+        """
+        Supprime toutes les entrées en mémoire (les statistiques et le cache disque sont
+        conservés).
+        """
+        with self._verrou:
+            self._entrees.clear()
+            self.octets = 0
+
+    def statistiques(self) -> dict:
+        """
+        Succès, échecs, évictions, nombre d'entrées, taille et taux de succès (succès
+        du cache disque compris), plus les statistiques du cache disque s'il existe.
+        """
+        total = self.succes + self.echecs
+        stats = {
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+            "entrees": len(self._entrees),
+            "octets": self.octets,
+            "taux_succes": self.succes / total if total else 0.0,
+        }
+        if self.disque is not None:
+            stats["disque"] = self.disque.statistiques()
+        return stats
+
+
+def _taille(entree: tuple) -> int:
+    _, flux, _, coupe = entree
+    return flux.nbytes + (coupe.nbytes if coupe is not None else 0)
+
+
+CACHE_FLOTS = CacheFlots()
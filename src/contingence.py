@@ -0,0 +1,546 @@
+"""
+contingence.py – Analyse de contingence (N-1, N-k) d'un réseau hydraulique.
+
+Pour chaque élément du réseau (source et, en option, liaison ou nœud intermédiaire), on
+calcule le flot maximal obtenu quand l'élément est retiré, le déficit de chaque ville et
+les liaisons qui deviennent saturées. Retirer un élément revient à annuler la capacité de
+ses arêtes : tous les scénarios partagent la topologie du réseau et repartent du flot de
+base par mises à jour à chaud (`moteurs.flots_scenarios`), éventuellement sur plusieurs
+processus.
+
+Le module fournit :
+    - ELEMENTS : types d'éléments analysables,
+    - elements_reseau(reseau, types) : éléments d'un réseau et positions de leurs arêtes,
+    - libelle_element(element) : libellé lisible d'un élément,
+    - analyse_contingence(noeuds, liaisons, niveau=1, ...) : tableau de contingence trié
+      par perte de flot décroissante,
+    - analyse_n_k(noeuds, liaisons, k, ...) : pannes simultanées de k éléments, avec
+      élagage par bornes et, au-delà d'un seuil, échantillonnage stratifié.
+
+Exemple d'utilisation :
+
+    >>> tableau = analyse_contingence(noeuds, liaisons, elements=("source", "liaison"))
+    >>> tableau[0]["elements"], tableau[0]["perte"], tableau[0]["deficits"]
+    >>> analyse = analyse_n_k(noeuds, liaisons, k=3, elements=("source",))
+    >>> analyse["pires"][0], analyse["perte_moyenne"], analyse["intervalle_perte"]
+"""
+
+import heapq
+import math
+from concurrent.futures import Executor
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.stats import norm
+
+from data import EvaluateurCandidats, Liaison, Noeud, ReseauHydraulique
+from instrumentation import compter, mesurer
+
+ELEMENTS = ("source", "liaison", "intermediaire")
+
+# Nombre maximal de cellules (scénarios x arêtes) d'un lot de scénarios
+CELLULES_LOT = 2**22
+
+Element = Tuple[str, object]
+
+
+def elements_reseau(
+    reseau: ReseauHydraulique, types: Sequence[str] = ("source",)
+) -> List[Tuple[Element, np.ndarray]]:
+    """
+    Éléments retirables d'un réseau, avec les positions (dans `matrice_sparse.data`) des
+    arêtes à annuler pour retirer chacun d'eux.
+
+    Un élément est le couple (type, identifiant) : ("source", nom),
+    ("intermediaire", nom) ou ("liaison", (depart, arrivee)). Une liaison en double n'est
+    retenue qu'une fois.
+
+    Raises: ValueError: si un type d'élément est inconnu.
+    """
+    inconnus = set(types) - set(ELEMENTS)
+    if inconnus:
+        raise ValueError(
+            f"❌ Types d'éléments inconnus : {sorted(inconnus)}. Choisir parmi {ELEMENTS}."
+        )
+    elements = []
+    if "source" in types:
+        for nom, noeud in reseau.noeuds.items():
+            if noeud.type == "source":
+                position = reseau.position_arete("super_source", nom)
+                elements.append((("source", nom), np.array([position])))
+    if "liaison" in types:
+        vues = set()
+        for liaison, position in zip(
+            reseau.liaisons, reseau.positions_liaisons.tolist()
+        ):
+            paire = (liaison.depart, liaison.arrivee)
+            if paire not in vues:
+                vues.add(paire)
+                elements.append((("liaison", paire), np.array([position])))
+    if "intermediaire" in types:
+        # Annuler les arêtes entrantes (ou sortantes) d'un nœud suffit à l'isoler : on
+        # retient le côté le moins fourni, pour rester sous le seuil des mises à jour à
+        # chaud de `moteurs.flots_scenarios`.
+        matrice = reseau.matrice_sparse
+        ordre = np.argsort(reseau.arrivees_aretes, kind="stable")
+        debuts = np.searchsorted(
+            reseau.arrivees_aretes[ordre], np.arange(matrice.shape[0] + 1)
+        )
+        for nom, noeud in reseau.noeuds.items():
+            if noeud.type == "intermediaire":
+                i = reseau.index_noeuds[nom]
+                entrantes = ordre[debuts[i] : debuts[i + 1]]
+                sortantes = np.arange(matrice.indptr[i], matrice.indptr[i + 1])
+                elements.append(
+                    (("intermediaire", nom), min(entrantes, sortantes, key=len))
+                )
+    return elements
+
+
+def libelle_element(element: Element) -> str:
+    """Libellé d'un élément : 'source S1', 'liaison A ➝ B'..."""
+    type_element, identifiant = element
+    if type_element == "liaison":
+        return f"liaison {identifiant[0]} ➝ {identifiant[1]}"
+    return f"{type_element} {identifiant}"
+
+
+class _Scenarios:
+    """
+    Évaluation de combinaisons d'éléments retirés sur la topologie d'un réseau : valeurs
+    du flot seules, ou lignes complètes du tableau de contingence.
+    """
+
+    def __init__(
+        self,
+        reseau: ReseauHydraulique,
+        candidats: List[Tuple[Element, np.ndarray]],
+        evaluateur: EvaluateurCandidats,
+    ) -> None:
+        self.reseau = reseau
+        self.candidats = candidats
+        self.evaluateur = evaluateur
+        resultat = reseau.resultat_courant()
+        self.base = resultat.flow_value
+        self.capacites_base = reseau.matrice_sparse.data
+        self.taille_lot = max(1, CELLULES_LOT // max(1, reseau.matrice_sparse.nnz))
+
+        # Flot de base traversant chaque candidat : la perte due au retrait d'un
+        # ensemble d'éléments ne dépasse jamais la somme de leurs flots (ni leurs
+        # capacités)
+        self.flots_candidats = np.array(
+            [int(resultat.flux[positions].sum()) for _, positions in candidats],
+            dtype=np.int64,
+        )
+
+        self.villes = [nom for nom, n in reseau.noeuds.items() if n.type == "ville"]
+        self.pos_villes = np.array(
+            [reseau.position_arete(ville, "super_puits") for ville in self.villes],
+            dtype=np.int64,
+        )
+        self.demandes = self.capacites_base[self.pos_villes]
+
+        # Liaisons distinctes (une position par paire), pour le suivi des saturations
+        self.paires, pos_liaisons = [], []
+        for (_, paire), positions in elements_reseau(reseau, ("liaison",)):
+            self.paires.append(paire)
+            pos_liaisons.append(positions[0])
+        self.pos_liaisons = np.array(pos_liaisons, dtype=np.int64)
+        cap_liaisons = self.capacites_base[self.pos_liaisons]
+        self.saturees_base = (resultat.flux[self.pos_liaisons] == cap_liaisons) & (
+            cap_liaisons > 0
+        )
+
+    def _capacites(self, lot: Sequence[Tuple[int, ...]]) -> np.ndarray:
+        capacites = np.tile(self.capacites_base, (len(lot), 1))
+        for ligne, combinaison in enumerate(lot):
+            for k in combinaison:
+                capacites[ligne, self.candidats[k][1]] = 0
+        return capacites
+
+    def flots(self, combinaisons: Sequence[Tuple[int, ...]]) -> np.ndarray:
+        """Flot maximal du réseau privé de chaque combinaison."""
+        valeurs = np.empty(len(combinaisons), dtype=np.int64)
+        for debut in range(0, len(combinaisons), self.taille_lot):
+            lot = combinaisons[debut : debut + self.taille_lot]
+            compter("scenarios", len(lot))
+            valeurs[debut : debut + len(lot)], _ = self.evaluateur.evaluer_scenarios(
+                self._capacites(lot)
+            )
+        return valeurs
+
+    def lignes(self, combinaisons: Sequence[Tuple[int, ...]]) -> List[Dict]:
+        """Lignes du tableau de contingence (voir `analyse_contingence`)."""
+        base, tableau = self.base, []
+        for debut in range(0, len(combinaisons), self.taille_lot):
+            lot = combinaisons[debut : debut + self.taille_lot]
+            capacites = self._capacites(lot)
+            compter("scenarios", len(lot))
+            valeurs, flux = self.evaluateur.evaluer_scenarios(capacites, avec_flux=True)
+
+            manques = self.demandes - flux[:, self.pos_villes]
+            caps = capacites[:, self.pos_liaisons]
+            nouvelles = (
+                (flux[:, self.pos_liaisons] == caps) & (caps > 0) & ~self.saturees_base
+            )
+            for ligne, combinaison in enumerate(lot):
+                valeur = int(valeurs[ligne])
+                tableau.append(
+                    {
+                        "elements": tuple(self.candidats[k][0] for k in combinaison),
+                        "flot": valeur,
+                        "perte": base - valeur,
+                        "perte_relative": (base - valeur) / base if base else 0.0,
+                        "deficits": {
+                            self.villes[v]: int(manques[ligne, v])
+                            for v in np.flatnonzero(manques[ligne] > 0).tolist()
+                        },
+                        "nouvelles_saturees": [
+                            self.paires[j]
+                            for j in np.flatnonzero(nouvelles[ligne]).tolist()
+                        ],
+                    }
+                )
+        return tableau
+
+
+def analyse_contingence(
+    noeuds: List[Noeud],
+    liaisons: List[Liaison],
+    niveau: int = 1,
+    elements: Sequence[str] = ("source",),
+    n_jobs: int = 1,
+    executor: Optional[Executor] = None,
+    moteur: str = "auto",
+) -> List[Dict]:
+    """
+    Tableau de contingence N-`niveau` : flot maximal du réseau privé de chaque
+    combinaison de `niveau` éléments des types demandés.
+
+    Les scénarios sont évalués par lots sur la topologie du réseau de base, chacun
+    repartant du flot de base par mises à jour à chaud ; les lots sont répartis sur
+    `n_jobs` processus (ou sur `executor`). Pour les grands `niveau`, voir
+    `analyse_n_k`, qui évite l'énumération de toutes les combinaisons.
+
+    Args:
+        noeuds (List[Noeud]): Nœuds du réseau.
+        liaisons (List[Liaison]): Liaisons du réseau.
+        niveau (int): Nombre d'éléments retirés simultanément (1 : analyse N-1).
+        elements (Sequence[str]): Types d'éléments retirés ('source', 'liaison',
+            'intermediaire').
+        n_jobs (int): Nombre de processus de calcul.
+        executor (Executor, optional): Exécuteur à utiliser à la place de `n_jobs`.
+        moteur (str): Moteur de calcul du flot de base.
+
+    Returns:
+        Liste de dictionnaires triée par perte décroissante, un par combinaison :
+            - elements : tuple des éléments retirés (voir `elements_reseau`),
+            - flot : flot maximal sans ces éléments,
+            - perte : flot de base - flot,
+            - perte_relative : perte rapportée au flot de base,
+            - deficits : {ville: demande non servie} des villes non entièrement servies
+              (pour le flot maximal trouvé : sa répartition entre villes n'est pas
+              toujours unique),
+            - nouvelles_saturees : liaisons (depart, arrivee) saturées dans le scénario
+              et non saturées dans le réseau de base.
+
+    Raises: ValueError: si `niveau` < 1 ou si un type d'élément est inconnu.
+    """
+    if niveau < 1:
+        raise ValueError("❌ Le niveau de contingence doit être au moins 1.")
+    reseau = ReseauHydraulique(noeuds, liaisons, moteur=moteur)
+    candidats = elements_reseau(reseau, elements)
+    combinaisons = list(combinations(range(len(candidats)), niveau))
+
+    compter("contingence", len(combinaisons))
+    with (
+        mesurer("contingence"),
+        EvaluateurCandidats(reseau, n_jobs, executor) as evaluateur,
+    ):
+        tableau = _Scenarios(reseau, candidats, evaluateur).lignes(combinaisons)
+    tableau.sort(key=lambda ligne: -ligne["perte"])
+    return tableau
+
+
+def _intervalle(
+    moyenne: float, variance: float, quantile: float, borne: float
+) -> Tuple[float, float]:
+    demi = quantile * math.sqrt(max(variance, 0.0))
+    return float(max(0.0, moyenne - demi)), float(min(borne, moyenne + demi))
+
+
+class _AnalyseNK:
+    """
+    Pertes de flot des combinaisons de `k` candidats, bornées par le flot de base qui
+    traverse les éléments retirés : une combinaison dont aucun élément ne porte de flot
+    ne fait rien perdre et n'est jamais calculée.
+    """
+
+    def __init__(self, scenarios: _Scenarios, k: int) -> None:
+        self.scenarios = scenarios
+        self.k = k
+        self.base = scenarios.base
+        self.poids = scenarios.flots_candidats
+        self.nb_calculs = 0
+
+    def pertes(self, combinaisons: np.ndarray) -> np.ndarray:
+        """Perte de chaque combinaison (tableau combinaisons x k d'indices de candidats)."""
+        pertes = np.zeros(len(combinaisons), dtype=np.int64)
+        if len(combinaisons) == 0:
+            return pertes
+        a_calculer = np.flatnonzero(self.poids[combinaisons].sum(axis=1) > 0)
+        if len(a_calculer):
+            lot = [tuple(c) for c in combinaisons[a_calculer].tolist()]
+            pertes[a_calculer] = self.base - self.scenarios.flots(lot)
+            self.nb_calculs += len(lot)
+        return pertes
+
+    def enumerer(self, nb_pires: int) -> Dict:
+        """Toutes les combinaisons : pertes et statistiques exactes."""
+        n = len(self.poids)
+        combinaisons = np.array(
+            list(combinations(range(n), self.k)), dtype=np.int64
+        ).reshape(-1, self.k)
+        pertes = self.pertes(combinaisons)
+        ordre = np.argsort(-pertes, kind="stable")[:nb_pires]
+        ordre = ordre[pertes[ordre] > 0]
+        moyenne = float(pertes.mean()) if len(pertes) else 0.0
+        probabilite = float((pertes > 0).mean()) if len(pertes) else 0.0
+        return {
+            "methode": "enumeration",
+            "perte_moyenne": moyenne,
+            "intervalle_perte": (moyenne, moyenne),
+            "probabilite_perte": probabilite,
+            "intervalle_probabilite": (probabilite, probabilite),
+            "strates": [],
+            "pires": [tuple(c) for c in combinaisons[ordre].tolist()],
+            "pires_exactes": True,
+        }
+
+    def pires(self, nb_pires: int, max_calculs: int, taille_lot: int = 64):
+        """
+        Recherche par séparation et évaluation des `nb_pires` combinaisons de plus forte
+        perte : les candidats sont parcourus par flot décroissant et une branche est
+        abandonnée dès que la somme des plus grands flots encore disponibles ne dépasse
+        pas la plus petite des pertes retenues.
+
+        Returns:
+            Tuple (combinaisons triées par perte décroissante, recherche complète ou non
+            – elle s'arrête après `max_calculs` scénarios calculés).
+        """
+        k, base = self.k, self.base
+        ordre = np.argsort(-self.poids, kind="stable")
+        poids = self.poids[ordre].tolist()
+        cumul = np.concatenate(([0], np.cumsum(poids))).tolist()
+        n = len(poids)
+        limite = self.nb_calculs + max_calculs
+        retenues = []  # tas (perte, combinaison) des meilleures combinaisons
+        seuil = [0]
+
+        def explorer(debut: int, choisis: list, somme: int):
+            reste = k - len(choisis)
+            if reste == 0:
+                yield tuple(choisis)
+                return
+            for i in range(debut, n - reste + 1):
+                # Poids triés : la borne ne fait que décroître avec i
+                if min(base, somme + cumul[i + reste] - cumul[i]) <= seuil[0]:
+                    return
+                yield from explorer(i + 1, choisis + [i], somme + poids[i])
+
+        parcours = explorer(0, [], 0)
+        complete = True
+        while True:
+            lot = [c for _, c in zip(range(taille_lot), parcours)]
+            if not lot:
+                break
+            if self.nb_calculs >= limite:
+                complete = False
+                break
+            combinaisons = ordre[np.array(lot, dtype=np.int64)]
+            for perte, combinaison in zip(
+                self.pertes(combinaisons).tolist(), combinaisons.tolist()
+            ):
+                if perte <= seuil[0]:
+                    continue
+                element = (perte, tuple(sorted(combinaison)))
+                if len(retenues) < nb_pires:
+                    heapq.heappush(retenues, element)
+                else:
+                    heapq.heappushpop(retenues, element)
+                if len(retenues) == nb_pires:
+                    seuil[0] = retenues[0][0]
+        retenues.sort(key=lambda element: (-element[0], element[1]))
+        return [c for _, c in retenues], complete
+
+    def echantillonner(self, nb_tirages: int, confiance: float, rng) -> Dict:
+        """
+        Estimation stratifiée de la perte moyenne et de la probabilité de perte.
+
+        Strate j : combinaisons comptant exactement j candidats qui portent du flot. La
+        strate 0 ne perd rien ; les tirages sont répartis entre les autres strates au
+        prorata de leur taille (au moins 2 par strate), une strate plus petite que son
+        allocation étant énumérée.
+        """
+        k = self.k
+        porteurs = np.flatnonzero(self.poids > 0)
+        autres = np.flatnonzero(self.poids == 0)
+        c, z = len(porteurs), len(autres)
+        total = math.comb(c + z, k)
+        strates = [
+            (j, math.comb(c, j) * math.comb(z, k - j))
+            for j in range(1, min(k, c) + 1)
+            if k - j <= z
+        ]
+        effectif = sum(taille for _, taille in strates)
+
+        quantile = float(norm.ppf(0.5 + confiance / 2))
+        moyenne = variance = probabilite = variance_p = 0.0
+        details = []
+        for j, taille in strates:
+            allocation = max(2, round(nb_tirages * taille / effectif))
+            if taille <= allocation:
+                combinaisons = np.array(
+                    [
+                        a + b
+                        for a in combinations(porteurs.tolist(), j)
+                        for b in combinations(autres.tolist(), k - j)
+                    ],
+                    dtype=np.int64,
+                ).reshape(-1, k)
+            else:
+                combinaisons = np.array(
+                    [
+                        np.concatenate(
+                            (
+                                rng.choice(porteurs, j, replace=False),
+                                rng.choice(autres, k - j, replace=False),
+                            )
+                        )
+                        for _ in range(allocation)
+                    ],
+                    dtype=np.int64,
+                ).reshape(-1, k)
+            pertes = self.pertes(combinaisons)
+            touchees = (pertes > 0).astype(float)
+            poids = taille / total
+            moyenne += poids * pertes.mean()
+            probabilite += poids * touchees.mean()
+            if taille > allocation:
+                variance += poids**2 * pertes.var(ddof=1) / len(pertes)
+                variance_p += poids**2 * touchees.var(ddof=1) / len(pertes)
+            details.append(
+                {
+                    "porteurs": j,
+                    "taille": taille,
+                    "tirages": len(pertes),
+                    "perte_moyenne": float(pertes.mean()),
+                    "probabilite_perte": float(touchees.mean()),
+                }
+            )
+        return {
+            "methode": "monte_carlo",
+            "perte_moyenne": float(moyenne),
+            "intervalle_perte": _intervalle(moyenne, variance, quantile, self.base),
+            "probabilite_perte": float(probabilite),
+            "intervalle_probabilite": _intervalle(
+                probabilite, variance_p, quantile, 1.0
+            ),
+            "strates": details,
+        }
+
+
+def analyse_n_k(
+    noeuds: List[Noeud],
+    liaisons: List[Liaison],
+    k: int = 2,
+    elements: Sequence[str] = ("source", "liaison"),
+    nb_pires: int = 20,
+    max_combinaisons: int = 20_000,
+    max_calculs: int = 20_000,
+    nb_tirages: int = 2_000,
+    confiance: float = 0.95,
+    graine: Optional[int] = 0,
+    n_jobs: int = 1,
+    executor: Optional[Executor] = None,
+    moteur: str = "auto",
+) -> Dict:
+    """
+    Analyse N-k : pertes de flot quand `k` éléments tombent en panne simultanément.
+
+    La perte due au retrait d'un ensemble d'éléments ne dépasse jamais le flot de base
+    qui les traverse (ni, a fortiori, leur capacité) : les combinaisons qui ne portent
+    aucun flot sont écartées sans calcul, et la recherche des pires combinaisons abandonne
+    toute branche dont la borne ne peut plus battre les pertes déjà trouvées.
+
+    Jusqu'à `max_combinaisons` combinaisons, toutes sont énumérées et les statistiques
+    sont exactes. Au-delà, les pires combinaisons sont cherchées par séparation et
+    évaluation (au plus `max_calculs` scénarios calculés) et la perte moyenne et la
+    probabilité de perte sont estimées par un échantillonnage stratifié (Monte-Carlo)
+    de `nb_tirages` combinaisons, avec leurs intervalles de confiance.
+
+    Args:
+        noeuds (List[Noeud]): Nœuds du réseau.
+        liaisons (List[Liaison]): Liaisons du réseau.
+        k (int): Nombre d'éléments retirés simultanément.
+        elements (Sequence[str]): Types d'éléments retirés ('source', 'liaison',
+            'intermediaire').
+        nb_pires (int): Nombre de pires combinaisons détaillées.
+        max_combinaisons (int): Nombre maximal de combinaisons énumérées.
+        max_calculs (int): Nombre maximal de scénarios calculés par la recherche des
+            pires combinaisons.
+        nb_tirages (int): Nombre de combinaisons tirées pour l'estimation.
+        confiance (float): Niveau des intervalles de confiance.
+        graine (int, optional): Graine du tirage.
+        n_jobs (int): Nombre de processus de calcul.
+        executor (Executor, optional): Exécuteur à utiliser à la place de `n_jobs`.
+        moteur (str): Moteur de calcul du flot de base.
+
+    Returns:
+        Dictionnaire :
+            - k, nb_combinaisons, flot_base,
+            - methode : 'enumeration' ou 'monte_carlo',
+            - perte_moyenne, intervalle_perte : perte moyenne sur toutes les
+              combinaisons et son intervalle de confiance (réduit à un point si exact),
+            - probabilite_perte, intervalle_probabilite : part des combinaisons qui font
+              perdre du flot,
+            - strates : détail de l'échantillonnage par strate (vide si exact),
+            - pires : lignes du tableau de contingence (voir `analyse_contingence`) des
+              combinaisons de plus forte perte,
+            - pires_exactes : False si la recherche des pires combinaisons a été
+              interrompue,
+            - scenarios_calcules : nombre de scénarios de flot calculés.
+
+    Raises: ValueError: si `k` est hors de [1, nombre d'éléments] ou si un type
+        d'élément est inconnu.
+    """
+    reseau = ReseauHydraulique(noeuds, liaisons, moteur=moteur)
+    candidats = elements_reseau(reseau, elements)
+    if not 1 <= k <= len(candidats):
+        raise ValueError(
+            f"❌ k doit être compris entre 1 et le nombre d'éléments ({len(candidats)})."
+        )
+    total = math.comb(len(candidats), k)
+
+    compter("contingence_n_k")
+    with (
+        mesurer("contingence"),
+        EvaluateurCandidats(reseau, n_jobs, executor) as evaluateur,
+    ):
+        scenarios = _Scenarios(reseau, candidats, evaluateur)
+        analyse = _AnalyseNK(scenarios, k)
+        if total <= max_combinaisons:
+            resultat = analyse.enumerer(nb_pires)
+        else:
+            resultat = analyse.echantillonner(
+                nb_tirages, confiance, np.random.default_rng(graine)
+            )
+            resultat["pires"], resultat["pires_exactes"] = analyse.pires(
+                nb_pires, max_calculs
+            )
+        resultat["scenarios_calcules"] = analyse.nb_calculs
+        resultat["pires"] = scenarios.lignes(resultat["pires"])
+
+    resultat["pires"].sort(key=lambda ligne: -ligne["perte"])
+    return {"k": k, "nb_combinaisons": total, "flot_base": scenarios.base, **resultat}
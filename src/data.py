@@ -1,9 +1,40 @@
-from typing import List, Tuple, Dict, Optional
-from numpy import array
+from typing import Callable, List, Tuple, Dict, Iterable, Optional
 import json
+import logging
 import os
+import sys
+from collections import Counter
+import numpy as np
 from scipy.sparse import csr_matrix
-from scipy.sparse.csgraph import maximum_flow
+from concurrent.futures import Executor, ProcessPoolExecutor
+from moteurs import (
+    MOTEURS,
+    GrapheResiduel,
+    appliquer_capacite,
+    calibrer,
+    choisir_moteur,
+    dimensionner,
+    dimensionner_lot,
+    evaluer_capacite,
+    flots_scenarios,
+    initialiser_travailleur,
+    planifier_milp,
+)
+from cache import CACHE_FLOTS, CacheFlots, empreinte_flot
+from instrumentation import compter, mesurer, noter_matrice
+from stockage import (
+    StockageSQLite,
+    catalogue,
+    ecrire_tableaux,
+    est_base_sqlite,
+    lire_reseau,
+    ouvrir_tableaux,
+)
+
+# Silencieux par défaut : les messages n'apparaissent que si l'application configure
+# `logging` (par exemple logging.basicConfig(level=logging.INFO)).
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 
 class Noeud:
@@ -19,6 +50,8 @@ class Noeud:
                             (0 si le nœud est intermédiaire)
     """
 
+    __slots__ = ("nom", "type", "capaciteMax")
+
     VALID_TYPES = {"source", "ville", "intermediaire"}
 
     def __init__(self, nom: str, type: str, capaciteMax: int = 0) -> None:
@@ -64,6 +97,8 @@ class Liaison:
         capacite (int): Capacité maximale de la liaison.
     """
 
+    __slots__ = ("depart", "arrivee", "capacite")
+
     def __init__(self, depart: str, arrivee: str, capacite: int) -> None:
         self.depart = depart
         self.arrivee = arrivee
@@ -93,6 +128,412 @@ class Liaison:
         return Liaison(data["depart"], data["arrivee"], data["capacite"])
 
 
+class ReseauCompact:
+    """
+    Représentation compacte d'un réseau hydraulique sous forme de tableaux NumPy.
+
+    Un réseau d'un million de liaisons y occupe quelques dizaines de Mo, contre plus d'un
+    Go sous forme de listes d'objets `Noeud` / `Liaison`. Les noms de nœuds sont internés
+    et stockés une seule fois ; les liaisons ne sont que des indices de nœuds.
+
+    Les liaisons sont rangées dans l'ordre (depart, arrivee) d'une matrice CSR, ce qui
+    permet de construire la matrice d'adjacence sans copie ; `ordre` conserve leur ordre
+    d'origine pour le retour aux listes d'objets. Une liaison en double remplace la
+    précédente, comme dans `ReseauHydraulique`.
+
+    Attributs :
+        noms (List[str]) : Nom de chaque nœud (internés), dans l'ordre d'origine.
+        index (Dict[str, int]) : Dictionnaire nom -> indice de nœud.
+        types (np.ndarray) : Code du type de chaque nœud (indice dans `TYPES`), int8.
+        capacites_noeuds (np.ndarray) : Capacité maximale de chaque nœud, int64.
+        departs, arrivees (np.ndarray) : Indices des extrémités de chaque liaison, int32.
+        capacites (np.ndarray) : Capacité de chaque liaison, int64.
+        ordre (np.ndarray) : Rang de chaque liaison dans la liste d'origine, int64.
+
+    Le réseau peut être écrit au format binaire (`enregistrer`) puis rouvert en mémoire
+    projetée (`ouvrir`), sans analyse de texte ni objets Python par nœud ou liaison.
+
+    Exemple d'utilisation :
+
+        >>> compact = ReseauCompact.depuis_listes(noeuds, liaisons)
+        >>> matrice = compact.matrice_csr()
+        >>> valeur, flux = compact.flot_maximal()
+        >>> noeuds, liaisons = compact.vers_listes()
+        >>> compact.enregistrer("reseau_bin")
+        >>> valeur, flux = ReseauCompact.ouvrir("reseau_bin").flot_maximal()
+    """
+
+    TYPES = ("source", "ville", "intermediaire")
+
+    def __init__(
+        self,
+        noms: List[str],
+        types: np.ndarray,
+        capacites_noeuds: np.ndarray,
+        departs: np.ndarray,
+        arrivees: np.ndarray,
+        capacites: np.ndarray,
+        ordre: Optional[np.ndarray] = None,
+    ) -> None:
+        self._noms = [sys.intern(nom) for nom in noms]
+        self._index = {nom: i for i, nom in enumerate(self._noms)}
+        self._table_noms = None
+        if len(self._index) != len(self._noms):
+            raise ValueError("❌ Deux nœuds portent le même nom.")
+        self.types = np.asarray(types, dtype=np.int8)
+        self.capacites_noeuds = np.asarray(capacites_noeuds, dtype=np.int64)
+
+        departs = np.asarray(departs, dtype=np.int32)
+        arrivees = np.asarray(arrivees, dtype=np.int32)
+        capacites = np.asarray(capacites, dtype=np.int64)
+        if ordre is None:
+            ordre = np.arange(len(departs), dtype=np.int64)
+        # Tri en ordre CSR ; en cas de doublon, la dernière liaison est conservée
+        cles = departs.astype(np.int64) * len(self._noms) + arrivees
+        tri = np.lexsort((np.arange(len(cles)), cles))
+        derniers = np.ones(len(tri), dtype=bool)
+        derniers[:-1] = cles[tri][1:] != cles[tri][:-1]
+        tri = tri[derniers]
+        self.departs = departs[tri]
+        self.arrivees = arrivees[tri]
+        self.capacites = capacites[tri]
+        self.ordre = np.asarray(ordre, dtype=np.int64)[tri]
+
+    @classmethod
+    def depuis_listes(
+        cls, noeuds: List[Noeud], liaisons: List[Liaison]
+    ) -> "ReseauCompact":
+        """
+        Construit la représentation compacte à partir des listes d'objets.
+
+        Raises: KeyError: si une liaison référence un nœud inconnu.
+        """
+        noms = [noeud.nom for noeud in noeuds]
+        codes = {type_noeud: code for code, type_noeud in enumerate(cls.TYPES)}
+        index = {nom: i for i, nom in enumerate(noms)}
+        nb = len(liaisons)
+        return cls(
+            noms,
+            np.fromiter(
+                (codes[n.type] for n in noeuds), dtype=np.int8, count=len(noms)
+            ),
+            np.fromiter(
+                (n.capaciteMax for n in noeuds), dtype=np.int64, count=len(noms)
+            ),
+            np.fromiter(
+                (index[li.depart] for li in liaisons), dtype=np.int32, count=nb
+            ),
+            np.fromiter(
+                (index[li.arrivee] for li in liaisons), dtype=np.int32, count=nb
+            ),
+            np.fromiter((li.capacite for li in liaisons), dtype=np.int64, count=nb),
+        )
+
+    TABLEAUX = (
+        "types",
+        "capacites_noeuds",
+        "departs",
+        "arrivees",
+        "capacites",
+        "ordre",
+    )
+
+    def enregistrer(self, dossier: str) -> None:
+        """
+        Écrit le réseau au format binaire : un dossier contenant un fichier .npy par
+        tableau et une table des noms (noms UTF-8 concaténés et positions de début).
+        """
+        octets = [nom.encode("utf-8") for nom in self.noms]
+        debuts = np.zeros(len(octets) + 1, dtype=np.int64)
+        np.cumsum([len(o) for o in octets], out=debuts[1:])
+        tableaux = {nom: getattr(self, nom) for nom in self.TABLEAUX}
+        tableaux["noms"] = np.frombuffer(b"".join(octets), dtype=np.uint8)
+        tableaux["debuts_noms"] = debuts
+        ecrire_tableaux(
+            dossier,
+            tableaux,
+            nb_noeuds=self.nb_noeuds,
+            nb_liaisons=self.nb_liaisons,
+        )
+
+    @classmethod
+    def ouvrir(cls, dossier: str) -> "ReseauCompact":
+        """
+        Ouvre un réseau écrit par `enregistrer`, sans copie ni décodage : les tableaux
+        sont projetés en mémoire (`numpy.memmap`) et la table des noms n'est décodée
+        qu'au premier accès à `noms` ou `index`. Le flot maximal peut donc être calculé
+        sans jamais créer d'objet Python par nœud ou par liaison.
+
+        Raises:
+            FileNotFoundError: si le dossier ne contient pas de réseau binaire.
+            ValueError: si le format n'est pas reconnu.
+        """
+        _, tableaux = ouvrir_tableaux(dossier)
+        compact = cls.__new__(cls)
+        for nom in cls.TABLEAUX:
+            setattr(compact, nom, tableaux[nom])
+        compact._noms = compact._index = None
+        compact._table_noms = (tableaux["noms"], tableaux["debuts_noms"])
+        return compact
+
+    @property
+    def noms(self) -> List[str]:
+        if self._noms is None:
+            octets, debuts = self._table_noms
+            texte, debuts = bytes(octets), debuts.tolist()
+            self._noms = [
+                sys.intern(texte[d:f].decode("utf-8"))
+                for d, f in zip(debuts[:-1], debuts[1:])
+            ]
+        return self._noms
+
+    @property
+    def index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {nom: i for i, nom in enumerate(self.noms)}
+        return self._index
+
+    def vers_listes(self) -> Tuple[List[Noeud], List[Liaison]]:
+        """
+        Reconstruit les listes d'objets `Noeud` et `Liaison` (liaisons dans leur ordre
+        d'origine).
+        """
+        noms, types = self.noms, self.TYPES
+        noeuds = [
+            Noeud(nom, types[code], cap)
+            for nom, code, cap in zip(
+                noms, self.types.tolist(), self.capacites_noeuds.tolist()
+            )
+        ]
+        rangs = np.argsort(self.ordre, kind="stable")
+        liaisons = [
+            Liaison(noms[i], noms[j], cap)
+            for i, j, cap in zip(
+                self.departs[rangs].tolist(),
+                self.arrivees[rangs].tolist(),
+                self.capacites[rangs].tolist(),
+            )
+        ]
+        return noeuds, liaisons
+
+    @property
+    def nb_noeuds(self) -> int:
+        return len(self.types)
+
+    @property
+    def nb_liaisons(self) -> int:
+        return len(self.departs)
+
+    def indptr(self) -> np.ndarray:
+        """Pointeurs de lignes CSR des liaisons."""
+        return np.concatenate(
+            ([0], np.cumsum(np.bincount(self.departs, minlength=self.nb_noeuds)))
+        ).astype(np.int32)
+
+    def matrice_csr(self) -> csr_matrix:
+        """
+        Matrice d'adjacence (capacités) des liaisons. Les tableaux `arrivees` et
+        `capacites` sont partagés avec la matrice, sans copie.
+        """
+        n = self.nb_noeuds
+        return csr_matrix(
+            (self.capacites, self.arrivees, self.indptr()), shape=(n, n), copy=False
+        )
+
+    def matrice_flot(self) -> Tuple[csr_matrix, int, int]:
+        """
+        Matrice des capacités du problème de flot : liaisons, plus une super source reliée
+        aux sources et un super puits relié aux villes (indices n et n + 1), comme dans
+        `ReseauHydraulique`.
+
+        Returns:
+            Tuple (matrice CSR triée, indice de la super source, indice du super puits)
+        """
+        n = self.nb_noeuds
+        sources, villes = self.types_noeuds("source"), self.types_noeuds("ville")
+        lignes = np.concatenate(
+            (self.departs, np.full(len(sources), n, dtype=np.int32), villes)
+        )
+        colonnes = np.concatenate(
+            (self.arrivees, sources, np.full(len(villes), n + 1, dtype=np.int32))
+        )
+        capacites = np.concatenate(
+            (
+                self.capacites,
+                self.capacites_noeuds[sources],
+                self.capacites_noeuds[villes],
+            )
+        )
+        matrice = csr_matrix((capacites, (lignes, colonnes)), shape=(n + 2, n + 2))
+        matrice.sort_indices()
+        return matrice, n, n + 1
+
+    def flot_maximal(
+        self, moteur: str = "auto", cache: Optional[CacheFlots] = CACHE_FLOTS
+    ) -> Tuple[int, np.ndarray]:
+        """
+        Calcule le flot maximal directement sur les tableaux, sans objets Python.
+        Un réseau identique déjà résolu est repris de `cache` (None : pas de cache).
+
+        Returns:
+            Tuple (valeur du flot, flux de chaque liaison dans l'ordre de `departs`)
+        """
+        with mesurer("construction"):
+            matrice, source, puits = self.matrice_flot()
+        if moteur == "auto":
+            moteur = choisir_moteur(matrice)
+        trouve = cle = None
+        if cache is not None and cache.actif:
+            cle = empreinte_flot(matrice, source, puits, moteur)
+            trouve = cache.lire(cle)
+        if trouve is not None:
+            compter("cache_succes")
+            valeur, flux, _, _ = trouve
+        else:
+            compter("flot_maximal")
+            noter_matrice(matrice.shape[0], matrice.nnz)
+            with mesurer("resolution"):
+                valeur, flux = MOTEURS[moteur](matrice, source, puits)
+            if cle is not None:
+                cache.ecrire(cle, valeur, flux, moteur)
+        n = matrice.shape[0]
+        departs = np.repeat(np.arange(n, dtype=np.int64), np.diff(matrice.indptr))
+        positions = np.searchsorted(
+            departs * n + matrice.indices,
+            self.departs.astype(np.int64) * n + self.arrivees,
+        )
+        return valeur, flux[positions]
+
+    def types_noeuds(self, type_noeud: str) -> np.ndarray:
+        """Indices des nœuds d'un type donné ('source', 'ville' ou 'intermediaire')."""
+        return np.flatnonzero(self.types == self.TYPES.index(type_noeud))
+
+    def __len__(self) -> int:
+        return self.nb_liaisons
+
+    def __str__(self):
+        return f"ReseauCompact : {self.nb_noeuds} nœuds, {self.nb_liaisons} liaisons"
+
+
+def _cle_noeud(noeud: Noeud) -> str:
+    return noeud.nom
+
+
+def _cle_liaison(liaison: Liaison) -> Tuple[str, str]:
+    return liaison.depart, liaison.arrivee
+
+
+def _cle_liaison_majuscules(liaison: Liaison) -> Tuple[str, str]:
+    return liaison.depart.upper(), liaison.arrivee.upper()
+
+
+class ListeIndexee(list):
+    """
+    Liste qui tient à jour un index des clés de ses éléments, pour tester en O(1)
+    la présence d'un nœud (par nom) ou d'une liaison (par couple depart, arrivee).
+
+    Toutes les opérations de modification d'une liste (append, extend, insert, remove,
+    pop, clear, affectation ou suppression par indice ou tranche, +=, *=) mettent l'index
+    à jour : le code existant qui manipule `ListeNoeuds` / `ListeLiaisons` comme des
+    listes reste valable.
+
+    Args:
+        elements: Éléments initiaux.
+        cles: Fonctions de clé indexées, par nom (une table de comptage par fonction) ;
+            la première est la clé par défaut de `contient` et `cles`.
+    """
+
+    def __init__(self, elements=(), cles: Optional[Dict[str, Callable]] = None) -> None:
+        super().__init__(elements)
+        self._cles = dict(cles or {})
+        self._reindexer()
+
+    def __reduce_ex__(self, protocole):
+        # Copie et sérialisation reconstruisent l'index depuis les éléments
+        return self.__class__, (list(self), self._cles)
+
+    def _reindexer(self) -> None:
+        self._index = {nom: Counter(map(cle, self)) for nom, cle in self._cles.items()}
+
+    def _ajouter(self, elements) -> None:
+        for nom, cle in self._cles.items():
+            self._index[nom].update(map(cle, elements))
+
+    def _retirer(self, elements) -> None:
+        for nom, cle in self._cles.items():
+            index = self._index[nom]
+            for valeur in map(cle, elements):
+                index[valeur] -= 1
+                if index[valeur] <= 0:
+                    del index[valeur]
+
+    def _table(self, cle: Optional[str]) -> Counter:
+        if cle is None:
+            cle = next(iter(self._cles))
+        return self._index[cle]
+
+    def indexe(self, cle: str) -> bool:
+        """Indique si la liste tient un index pour la clé nommée `cle`."""
+        return cle in self._cles
+
+    def contient(self, valeur, cle: Optional[str] = None) -> bool:
+        """Indique si un élément a la clé `valeur` (pour la clé nommée `cle`)."""
+        return valeur in self._table(cle)
+
+    def cles(self, cle: Optional[str] = None):
+        """Vue (test d'appartenance en O(1)) des clés présentes pour la clé `cle`."""
+        return self._table(cle).keys()
+
+    def append(self, element) -> None:
+        super().append(element)
+        self._ajouter((element,))
+
+    def extend(self, elements) -> None:
+        elements = list(elements)
+        super().extend(elements)
+        self._ajouter(elements)
+
+    def __iadd__(self, elements):
+        self.extend(elements)
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._reindexer()
+        return self
+
+    def insert(self, position, element) -> None:
+        super().insert(position, element)
+        self._ajouter((element,))
+
+    def remove(self, element) -> None:
+        del self[self.index(element)]
+
+    def pop(self, position=-1):
+        element = super().pop(position)
+        self._retirer((element,))
+        return element
+
+    def clear(self) -> None:
+        super().clear()
+        self._reindexer()
+
+    def __setitem__(self, position, valeur) -> None:
+        if isinstance(position, slice):
+            anciens, valeur = self[position], list(valeur)
+            nouveaux = valeur
+        else:
+            anciens, nouveaux = (self[position],), (valeur,)
+        super().__setitem__(position, valeur)
+        self._retirer(anciens)
+        self._ajouter(nouveaux)
+
+    def __delitem__(self, position) -> None:
+        anciens = self[position] if isinstance(position, slice) else (self[position],)
+        super().__delitem__(position)
+        self._retirer(anciens)
+
+
 # Fonction de création
 def creer_noeud(
     nom: str,
@@ -165,10 +606,14 @@ def creer_liaison(
     if capacite <= 0:
         raise ValueError("❌ La capacité de la liaison doit être un entier positif.")
 
-    if any(
-        liaison.depart == depart and liaison.arrivee == arrivee
-        for liaison in liaisons_existantes
-    ):
+    if isinstance(liaisons_existantes, ListeIndexee):
+        doublon = liaisons_existantes.contient((depart, arrivee))
+    else:
+        doublon = any(
+            liaison.depart == depart and liaison.arrivee == arrivee
+            for liaison in liaisons_existantes
+        )
+    if doublon:
         raise ValueError("❌ Cette liaison existe déjà.")
 
     return Liaison(depart, arrivee, capacite)
@@ -182,7 +627,8 @@ class GestionReseau:
     - la saisie interactive des nœuds (sources, villes, intermédiaires),
     - la saisie interactive des liaisons entre ces nœuds,
     - la gestion et le stockage des listes de nœuds et de liaisons,
-    - la sauvegarde et le chargement des réseaux dans/depuis un fichier JSON,
+    - la sauvegarde et le chargement des réseaux dans/depuis un fichier JSON ou une
+      base SQLite (un enregistrement par réseau, voir stockage.py),
     - la vérification d'existence des liaisons,
     - la suppression des fichiers de sauvegarde.
 
@@ -190,12 +636,21 @@ class GestionReseau:
         ListeNoeuds (List[Noeud]) : Liste des objets Noeud représentant les nœuds du réseau.
         ListeLiaisons (List[Liaison]) : Liste des objets Liaison représentant les connexions entre nœuds.
 
+    Les deux listes sont des `ListeIndexee` : un index des noms de nœuds et des couples
+    (depart, arrivee) est tenu à jour à chaque modification, ce qui rend les tests
+    d'existence et de doublon en O(1). Une liste ordinaire affectée à l'un de ces
+    attributs est automatiquement indexée.
+
     Méthodes principales :
         - saisir_noeuds(type_noeud) : Saisie interactive des nœuds selon leur type.
         - saisir_liaisons() : Saisie interactive des liaisons entre nœuds.
         - liaison_existe(depart, arrivee, liaisons) : Vérifie si une liaison existe déjà.
+        - noeud_existe(nom) / noms_noeuds() : Existence d'un nœud en O(1).
+        - ajouter_noeuds(noeuds) / ajouter_liaisons(liaisons) : Ajout en lot, validé en une passe.
         - sauvegarder_reseau(noeuds, liaisons, fichier, reseau_nom) : Sauvegarde un réseau dans un fichier JSON.
         - charger_reseaux(fichier) : Charge tous les réseaux enregistrés dans un fichier JSON.
+        - catalogue_reseaux(fichier) : Liste les réseaux (noms, tailles, empreintes) sans les charger.
+        - charger_reseau(fichier, reseau_nom) : Charge un seul réseau.
         - supprimer_reseaux(fichier) : Supprime le fichier de sauvegarde des réseaux.
 
     Exemple d'utilisation :
@@ -212,10 +667,87 @@ class GestionReseau:
     def __init__(
         self, ListeNoeuds: List[Noeud] = None, ListeLiaisons: List[Liaison] = None
     ) -> None:
-        self.ListeNoeuds: List[Noeud] = ListeNoeuds if ListeNoeuds is not None else []
-        self.ListeLiaisons: List[Liaison] = (
-            ListeLiaisons if ListeLiaisons is not None else []
-        )
+        self.ListeNoeuds = ListeNoeuds if ListeNoeuds is not None else []
+        self.ListeLiaisons = ListeLiaisons if ListeLiaisons is not None else []
+
+    @property
+    def ListeNoeuds(self) -> ListeIndexee:
+        return self._noeuds
+
+    @ListeNoeuds.setter
+    def ListeNoeuds(self, noeuds: List[Noeud]) -> None:
+        # Toute liste affectée est indexée par nom de nœud
+        if not isinstance(noeuds, ListeIndexee):
+            noeuds = ListeIndexee(noeuds, {"nom": _cle_noeud})
+        self._noeuds = noeuds
+
+    @property
+    def ListeLiaisons(self) -> ListeIndexee:
+        return self._liaisons
+
+    @ListeLiaisons.setter
+    def ListeLiaisons(self, liaisons: List[Liaison]) -> None:
+        # Index exact (creer_liaison) et index insensible à la casse (liaison_existe)
+        if not isinstance(liaisons, ListeIndexee):
+            liaisons = ListeIndexee(
+                liaisons,
+                {
+                    "liaison": _cle_liaison,
+                    "liaison_majuscules": _cle_liaison_majuscules,
+                },
+            )
+        self._liaisons = liaisons
+
+    def noms_noeuds(self):
+        """Noms des nœuds du réseau (vue maintenue à jour, test d'appartenance en O(1))."""
+        return self._noeuds.cles()
+
+    def noeud_existe(self, nom: str) -> bool:
+        """Vérifie en O(1) si un nœud de ce nom existe."""
+        return self._noeuds.contient(nom)
+
+    def ajouter_noeuds(self, noeuds: Iterable[Noeud]) -> None:
+        """
+        Ajoute un lot de nœuds après les avoir tous validés en une seule passe.
+
+        Chaque nœud est vérifié comme par `creer_noeud` (type, capacité, nom unique
+        parmi les nœuds existants et au sein du lot). L'ajout est atomique : si un
+        nœud est invalide, aucun nœud du lot n'est ajouté.
+
+        Raises: ValueError: au premier nœud invalide.
+        """
+        noeuds = list(noeuds)
+        noms = set()
+        for noeud in noeuds:
+            if self.noeud_existe(noeud.nom):
+                raise ValueError("❌ Ce nom est déjà utilisé. Choisis un autre nom.")
+            creer_noeud(noeud.nom, noeud.type, noeud.capaciteMax, noms)
+            noms.add(noeud.nom)
+        self._noeuds.extend(noeuds)
+
+    def ajouter_liaisons(self, liaisons: Iterable[Liaison]) -> None:
+        """
+        Ajoute un lot de liaisons après les avoir toutes validées en une seule passe.
+
+        Chaque liaison est vérifiée comme par `creer_liaison` (nœuds existants, pas de
+        boucle, capacité positive, pas de doublon parmi les liaisons existantes ni au
+        sein du lot). L'ajout est atomique : si une liaison est invalide, aucune
+        liaison du lot n'est ajoutée.
+
+        Raises: ValueError: à la première liaison invalide.
+        """
+        liaisons = list(liaisons)
+        noms = self.noms_noeuds()
+        lot = ListeIndexee(cles={"liaison": _cle_liaison})
+        for liaison in liaisons:
+            if self._liaisons.contient((liaison.depart, liaison.arrivee)):
+                raise ValueError("❌ Cette liaison existe déjà.")
+            lot.append(
+                creer_liaison(
+                    liaison.depart, liaison.arrivee, liaison.capacite, noms, lot
+                )
+            )
+        self._liaisons.extend(liaisons)
 
     def __str__(self):
         res = "=== Gestion du Réseau ===\n"
@@ -249,7 +781,7 @@ class GestionReseau:
         Retourne : None (modifie directement la liste globale ListeNoeuds)
         """
         demande_capacite = type_noeud != "intermediaire"
-        noms_existants = {n.nom for n in self.ListeNoeuds}
+        noms_existants = self.noms_noeuds()
 
         while True:
             nom = input(f"Nom de la {type_noeud} : ").strip().upper()
@@ -276,7 +808,6 @@ class GestionReseau:
             try:
                 noeud = creer_noeud(nom, type_noeud, capacite, noms_existants)
                 self.ListeNoeuds.append(noeud)
-                noms_existants.add(nom)
                 print(f"✅ {type_noeud.capitalize()} ajoutée : {nom}")
             except ValueError as e:
                 print(e)
@@ -301,7 +832,7 @@ class GestionReseau:
 
         >>> None (modifie directement la liste globale ListeLiaisons)
         """
-        noms_existants = {n.nom for n in self.ListeNoeuds}
+        noms_existants = self.noms_noeuds()
 
         while True:
             depart = input("Départ de la liaison : ").strip().upper()
@@ -342,9 +873,14 @@ class GestionReseau:
     def liaison_existe(depart: str, arrivee: str, liaisons) -> bool:
         """
         Vérifie si une liaison existe entre deux sommets (insensible à la casse).
+
+        En O(1) lorsque `liaisons` est la liste indexée d'un `GestionReseau`,
+        par parcours linéaire pour une liste ordinaire.
         """
         depart = depart.upper()
         arrivee = arrivee.upper()
+        if isinstance(liaisons, ListeIndexee) and liaisons.indexe("liaison_majuscules"):
+            return liaisons.contient((depart, arrivee), "liaison_majuscules")
         for liaison in liaisons:
             if liaison.depart.upper() == depart and liaison.arrivee.upper() == arrivee:
                 return True
@@ -364,28 +900,39 @@ class GestionReseau:
             reseau_nom (str): Nom attribué au réseau à sauvegarder.
             noeuds (List[Noeud]): Liste des objets Noeud à sauvegarder.
             liaisons (List[Liaison]): Liste des objets Liaison à sauvegarder.
-            fichier (str): Nom du fichier JSON dans lequel sauvegarder les données (par défaut 'reseaux.json').
+            fichier (str): Fichier JSON ou base SQLite (.db) dans lequel sauvegarder les données.
+
+        Si `fichier` est une base SQLite (extension .db, .sqlite ou .sqlite3), seul
+        l'enregistrement du réseau `reseau_nom` est écrit, sans relire les autres réseaux
+        (voir `stockage.StockageSQLite`). Un fichier JSON est entièrement relu et réécrit.
 
         Exemple:
             >>> sauvegarder_reseau("reseau_1", ListeNoeuds, ListeLiaisons)
         """
+        contenu = {
+            "noeuds": [n.to_dict() for n in noeuds],
+            "liaisons": [liaison.to_dict() for liaison in liaisons],
+        }
+        if est_base_sqlite(fichier):
+            with StockageSQLite(fichier) as base:
+                base.enregistrer(reseau_nom, contenu)
+            return
+
         data = {}
         if os.path.exists(fichier):
-            with open(fichier, 'r') as f:
+            with open(fichier, 'r', encoding="utf-8") as f:
                 data = json.load(f)
 
-        data[reseau_nom] = {
-            "noeuds": [n.to_dict() for n in noeuds],
-            "liaisons": [liaison.to_dict() for liaison in liaisons],
-        }
+        data[reseau_nom] = contenu
 
-        with open(fichier, 'w') as f:
+        with open(fichier, 'w', encoding="utf-8") as f:
             json.dump(data, f, indent=4)
 
     @staticmethod
     def charger_reseaux(fichier: str) -> Dict[str, Tuple[List[Noeud], List[Liaison]]]:
         """
-        Charge tous les réseaux hydrauliques sauvegardés depuis un fichier JSON.
+        Charge tous les réseaux hydrauliques sauvegardés depuis un fichier JSON
+        ou une base SQLite.
 
         Args:
         fichier (str): Nom du fichier JSON à lire.
@@ -403,8 +950,12 @@ class GestionReseau:
         if not os.path.exists(fichier):
             raise FileNotFoundError(f"Fichier {fichier} non trouvé.")
 
-        with open(fichier, 'r') as f:
-            data = json.load(f)
+        if est_base_sqlite(fichier):
+            with StockageSQLite(fichier) as base:
+                data = {nom: base.lire(nom) for nom in base.noms()}
+        else:
+            with open(fichier, 'r', encoding="utf-8") as f:
+                data = json.load(f)
 
         reseaux = {}
         for nom_reseau, contenu in data.items():
@@ -414,6 +965,45 @@ class GestionReseau:
 
         return reseaux
 
+    @staticmethod
+    def catalogue_reseaux(fichier: str) -> Dict[str, Dict]:
+        """
+        Liste les réseaux d'un fichier JSON ou d'une base SQLite sans les charger.
+
+        Le catalogue est mis en cache selon la date de modification du fichier : le
+        réafficher ne relit pas le fichier tant qu'il n'a pas changé.
+
+        Returns:
+            Dict[str, Dict]: pour chaque nom de réseau, un dictionnaire avec
+            "nb_noeuds", "nb_liaisons" et "empreinte" (SHA-256 du contenu).
+
+        Exemple:
+            >>> catalogue = GestionReseau.catalogue_reseaux("reseaux.json")
+            >>> catalogue["Demo"]["nb_liaisons"]
+        """
+        return catalogue(fichier)
+
+    @staticmethod
+    def charger_reseau(
+        fichier: str, reseau_nom: str
+    ) -> Tuple[List[Noeud], List[Liaison]]:
+        """
+        Charge un seul réseau d'un fichier JSON ou d'une base SQLite.
+
+        Seul le contenu de ce réseau est lu et converti en objets `Noeud` / `Liaison`.
+
+        Raises:
+            FileNotFoundError: si le fichier n'existe pas.
+            KeyError: si aucun réseau de ce nom n'est enregistré dans le fichier.
+
+        Exemple:
+            >>> noeuds, liaisons = GestionReseau.charger_reseau("reseaux.json", "Demo")
+        """
+        contenu = lire_reseau(fichier, reseau_nom)
+        noeuds = [Noeud.from_dict(nd) for nd in contenu.get("noeuds", [])]
+        liaisons = [Liaison.from_dict(ld) for ld in contenu.get("liaisons", [])]
+        return noeuds, liaisons
+
     @staticmethod
     def supprimer_reseaux(fichier: str = 'reseaux.json') -> None:
         """
@@ -432,6 +1022,128 @@ class GestionReseau:
             os.remove(fichier)
 
 
+def convertir_json_en_binaire(fichier: str, reseau_nom: str, dossier: str) -> None:
+    """
+    Convertit un réseau sauvegardé (fichier JSON ou base SQLite) au format binaire
+    de `ReseauCompact`.
+
+    Raises:
+        KeyError: si le réseau n'existe pas dans le fichier.
+        ValueError: si le réseau contient des liaisons en double, que le format
+            binaire ne peut pas conserver.
+    """
+    noeuds, liaisons = GestionReseau.charger_reseau(fichier, reseau_nom)
+    compact = ReseauCompact.depuis_listes(noeuds, liaisons)
+    if compact.nb_liaisons != len(liaisons):
+        raise ValueError("❌ Le réseau contient des liaisons en double.")
+    compact.enregistrer(dossier)
+
+
+def convertir_binaire_en_json(dossier: str, fichier: str, reseau_nom: str) -> None:
+    """
+    Sauvegarde un réseau au format binaire sous le nom `reseau_nom` dans un fichier
+    JSON ou une base SQLite (voir `GestionReseau.sauvegarder_reseaux`).
+    """
+    noeuds, liaisons = ReseauCompact.ouvrir(dossier).vers_listes()
+    GestionReseau.sauvegarder_reseaux(noeuds, liaisons, fichier, reseau_nom)
+
+
+class ResultatFlot:
+    """
+    Résultat structuré d'un calcul de flot maximal.
+
+    Les flux sont stockés arête par arête dans des tableaux NumPy alignés sur l'ordre
+    des données de la matrice sparse du réseau, ce qui évite tout parcours des n² cellules.
+
+    Attributs :
+        flow_value (int) : Valeur du flot maximal entre la super source et le super puits.
+        departs (np.ndarray) : Indice du nœud de départ de chaque arête.
+        arrivees (np.ndarray) : Indice du nœud d'arrivée de chaque arête.
+        flux (np.ndarray) : Flot circulant sur chaque arête.
+        capacites (np.ndarray) : Capacité de chaque arête.
+        saturees (np.ndarray) : Masque booléen des arêtes saturées (flux == capacité).
+        index_inverse (Dict[int, str]) : Dictionnaire indice -> nom de nœud.
+        moteur (str) : Nom du moteur de calcul qui a produit le flot (voir `moteurs.MOTEURS`).
+
+    Exemple d'utilisation :
+
+        >>> result, index_noeuds = reseau.calculerFlotMaximal(afficher=False)
+        >>> result.flow_value
+        >>> print(result.rapport())
+    """
+
+    def __init__(
+        self,
+        flow_value: int,
+        departs: np.ndarray,
+        arrivees: np.ndarray,
+        flux: np.ndarray,
+        capacites: np.ndarray,
+        index_inverse: Dict[int, str],
+        moteur: Optional[str] = None,
+    ) -> None:
+        self.flow_value = flow_value
+        self.departs = departs
+        self.arrivees = arrivees
+        self.flux = flux
+        self.capacites = capacites
+        self.index_inverse = index_inverse
+        self.moteur = moteur
+        self._flow = None
+
+    @property
+    def saturees(self) -> np.ndarray:
+        return self.flux == self.capacites
+
+    @property
+    def flow(self) -> csr_matrix:
+        """
+        Matrice sparse des flux (même forme que la matrice des capacités), pour compatibilité
+        avec le résultat brut de `maximum_flow`.
+        """
+        if self._flow is None:
+            n = len(self.index_inverse)
+            self._flow = csr_matrix(
+                (self.flux, (self.departs, self.arrivees)), shape=(n, n)
+            )
+        return self._flow
+
+    def flux_par_arc(self) -> Dict[Tuple[str, str], int]:
+        """
+        Retourne le flux de chaque arête sous forme {(nom_depart, nom_arrivee): flux}.
+        """
+        noms = self.index_inverse
+        return {
+            (noms[i], noms[j]): f
+            for i, j, f in zip(
+                self.departs.tolist(), self.arrivees.tolist(), self.flux.tolist()
+            )
+        }
+
+    def rapport(self) -> str:
+        """
+        Formate le détail des flux utilisés (arêtes de flux strictement positif).
+
+        Le texte n'est construit qu'à l'appel, jamais pendant le calcul du flot.
+        """
+        lignes = [
+            f"💧 Flot maximal total : {self.flow_value} unités\n➡️ Détail des flux utilisés :\n"
+        ]
+        utilises = np.flatnonzero(self.flux > 0)
+        for k in utilises.tolist():
+            nom_i = self.index_inverse.get(
+                int(self.departs[k]), f"[inconnu:{self.departs[k]}]"
+            )
+            nom_j = self.index_inverse.get(
+                int(self.arrivees[k]), f"[inconnu:{self.arrivees[k]}]"
+            )
+            lignes.append(f"{nom_i} ➝ {nom_j} : {self.flux[k]} unités")
+        return "\n".join(lignes)
+
+    def __str__(self):
+        return self.rapport()
+
+
 class ReseauHydraulique:
     """
     Classe représentant un réseau hydraulique orienté pour le calcul de flot maximal.
@@ -440,7 +1152,7 @@ class ReseauHydraulique:
     - de construire la matrice d'adjacence du réseau à partir d'une liste de nœuds et de liaisons,
     - d'ajouter automatiquement une super source et un super puits pour modéliser l'approvisionnement global,
     - de calculer le flot maximal entre la super source et le super puits,
-    - d'obtenir le détail des flux utilisés sur chaque liaison,
+    - d'obtenir le détail des flux utilisés sur chaque liaison (objet `ResultatFlot`),
     - d'identifier les liaisons saturées (utilisées à leur capacité maximale).
 
     Attributs :
@@ -448,14 +1160,46 @@ class ReseauHydraulique:
         liaisons (List[Liaison]) : Liste des objets Liaison représentant les connexions entre nœuds.
         index_noeuds (Dict[str, int]) : Dictionnaire associant chaque nom de nœud à un indice de matrice.
         index_inverse (Dict[int, str]) : Dictionnaire inverse pour retrouver le nom d'un nœud à partir de son indice.
-        matrice_np (np.ndarray) : Matrice d'adjacence du réseau (capacités).
-        matrice_sparse (csr_matrix) : Version sparse de la matrice pour les algorithmes de flot.
+        matrice_sparse (csr_matrix) : Matrice d'adjacence sparse du réseau (capacités),
+            construite directement depuis les liaisons sans passer par une matrice dense.
+        departs_aretes, arrivees_aretes (np.ndarray) : Extrémités de chaque arête, dans l'ordre
+            de `matrice_sparse.data`.
+        positions_liaisons (np.ndarray) : Position de chaque liaison de `liaisons` dans `matrice_sparse.data`.
+        capacites_liaisons (np.ndarray) : Capacité de chaque liaison de `liaisons`.
+        verbeux (bool) : Si True, `calculerFlotMaximal` affiche le détail des flux par défaut
+            (False par défaut : le détail est seulement journalisé au niveau DEBUG).
+        moteur (str) : Moteur de calcul du flot ('dinic', 'edmonds_karp', 'push_relabel',
+            'networkx'), ou 'auto' pour le choisir selon le profil du réseau.
+        moteur_utilise (str) : Moteur effectivement utilisé pour le dernier calcul complet.
+        cache (CacheFlots) : Cache des flots maximaux par empreinte du réseau (cache partagé
+            `cache.CACHE_FLOTS` par défaut, None pour toujours recalculer).
+        matrice_np (np.ndarray) : Version dense de la matrice, matérialisée uniquement à la demande
+            (coût O(n²), à réserver aux petits réseaux).
 
     Méthodes principales :
-        - __init__(noeuds, liaisons) : Construit la matrice du réseau avec super source/puits.
+        - __init__(noeuds, liaisons, verbeux, moteur, cache) : Construit la matrice du réseau avec super source/puits.
         - __str__() : Affiche une représentation textuelle du réseau.
         - calculerFlotMaximal() : Calcule le flot maximal et affiche le détail des flux.
         - liaisons_saturees(result) : Retourne la liste des liaisons saturées pour un résultat de flot donné.
+        - flux_liaisons(result), taux_utilisation(result), capacites_residuelles(result) :
+          Indicateurs de toutes les liaisons, calculés en une opération vectorisée.
+        - position_arete(depart, arrivee) : Position d'une arête dans `matrice_sparse.data`.
+        - augmenter_capacite / diminuer_capacite / modifier_capacite(depart, arrivee, nouvelle_cap) :
+          Changement de capacité d'une liaison avec mise à jour à chaud du flot maximal.
+        - modifier_capacite_noeud(nom, nouvelle_cap) : Idem pour une source ou une ville
+          (assèchement d'une source).
+        - evaluer_capacite(depart, arrivee, nouvelle_cap) : Flot obtenu après un changement,
+          sans modifier le réseau.
+        - dimensionner_capacite(depart, arrivee, cap_max, pas, niveaux) : Plus petite
+          capacité d'une liaison donnant le gain de flot maximal.
+        - scenarios_capacites(modifications), evaluer_scenarios(capacites) : Flot maximal
+          d'un lot de vecteurs de capacités sur la même topologie.
+        - valeur_flot(), resultat_courant() : Flot maximal courant.
+        - coupe_minimale() : Arêtes formant le goulot d'étranglement du flot courant.
+        - liaisons_ameliorables() : Liaisons dont une hausse de capacité augmenterait le flot.
+
+    Constructions, calculs complets, mises à jour à chaud et leurs durées sont relevés
+    dans un bloc `instrumentation.instrumenter()` (inactif par défaut).
 
     Exemple d'utilisation :
 
@@ -464,10 +1208,39 @@ class ReseauHydraulique:
         >>> liaisons_sats = reseau.liaisons_saturees(result)
     """
 
-    def __init__(self, noeuds: List[Noeud], liaisons: List[Liaison]):
+    def __init__(
+        self,
+        noeuds: List[Noeud],
+        liaisons: List[Liaison],
+        verbeux: bool = False,
+        moteur: str = "auto",
+        cache: Optional[CacheFlots] = CACHE_FLOTS,
+    ):
+        if moteur != "auto" and moteur not in MOTEURS:
+            raise ValueError(
+                f"❌ Moteur inconnu : {moteur} (disponibles : auto, {', '.join(MOTEURS)})."
+            )
         self.noeuds = {n.nom: n for n in noeuds}
         self.liaisons = liaisons
-
+        self.verbeux = verbeux
+        self.moteur = moteur
+        self.moteur_utilise = None
+        self.cache = cache
+        compter("ReseauHydraulique")
+        with mesurer("construction"):
+            self._construire()
+
+        # État du dernier flot calculé, réutilisé pour les mises à jour incrémentales
+        self._flux = None
+        self._valeur_flot = None
+        self._liaisons_copiees = False
+
+    def _construire(self) -> None:
+        """
+        Construit les index de nœuds, la matrice sparse et la table des arêtes
+        à partir de `self.noeuds` et `self.liaisons`.
+        """
+        liaisons = self.liaisons
         self.index_noeuds = {nom: i for i, nom in enumerate(self.noeuds.keys())}
         self.index_noeuds["super_source"] = len(self.index_noeuds)
         self.index_noeuds["super_puits"] = len(self.index_noeuds)
@@ -475,92 +1248,840 @@ class ReseauHydraulique:
         self.index_inverse = {v: k for k, v in self.index_noeuds.items()}
         n = len(self.index_noeuds)
 
-        self.matrice_np = array([[0] * n for _ in range(n)])
-
+        # Arêtes (i, j) -> capacité : une liaison en double écrase la précédente,
+        # comme l'affectation cellule par cellule d'une matrice dense.
+        aretes = {}
+        lignes_liaisons, colonnes_liaisons = [], []
         for liaison in liaisons:
             i, j = self.index_noeuds[liaison.depart], self.index_noeuds[liaison.arrivee]
-            self.matrice_np[i][j] = liaison.capacite
+            aretes[(i, j)] = liaison.capacite
+            lignes_liaisons.append(i)
+            colonnes_liaisons.append(j)
 
+        super_source = self.index_noeuds["super_source"]
+        super_puits = self.index_noeuds["super_puits"]
         for node in self.noeuds.values():
             idx = self.index_noeuds[node.nom]
             if node.type == "source":
-                self.matrice_np[self.index_noeuds["super_source"]][
-                    idx
-                ] = node.capaciteMax
+                aretes[(super_source, idx)] = node.capaciteMax
             elif node.type == "ville":
-                self.matrice_np[idx][
-                    self.index_noeuds["super_puits"]
-                ] = node.capaciteMax
+                aretes[(idx, super_puits)] = node.capaciteMax
+
+        nb_aretes = len(aretes)
+        lignes = np.fromiter((i for i, _ in aretes), dtype=np.int32, count=nb_aretes)
+        colonnes = np.fromiter((j for _, j in aretes), dtype=np.int32, count=nb_aretes)
+        capacites = np.fromiter(aretes.values(), dtype=np.int64, count=nb_aretes)
+
+        # Les capacités nulles restent des entrées explicites : la structure du graphe
+        # ne dépend que de la topologie, pas des valeurs.
+        self.matrice_sparse = csr_matrix((capacites, (lignes, colonnes)), shape=(n, n))
+        self.matrice_sparse.sort_indices()
+
+        # Table des arêtes : extrémités de chaque entrée de matrice_sparse.data, et position
+        # de chaque liaison dans ce tableau (les clés i * n + j sont triées en ordre CSR).
+        matrice = self.matrice_sparse
+        self.departs_aretes = np.repeat(
+            np.arange(n, dtype=np.int32), np.diff(matrice.indptr)
+        )
+        self.arrivees_aretes = matrice.indices
+        cles = self.departs_aretes.astype(np.int64) * n + self.arrivees_aretes
+        self.positions_liaisons = np.searchsorted(
+            cles,
+            np.asarray(lignes_liaisons, dtype=np.int64) * n
+            + np.asarray(colonnes_liaisons, dtype=np.int64),
+        )
+        self.capacites_liaisons = np.fromiter(
+            (liaison.capacite for liaison in liaisons),
+            dtype=np.int64,
+            count=len(liaisons),
+        )
+        self._index_aretes = None
+        self._residuel = None
+        self._coupe = None
 
-        self.matrice_sparse = csr_matrix(self.matrice_np)
+    @property
+    def matrice_np(self) -> np.ndarray:
+        """
+        Matrice d'adjacence dense (capacités), calculée à la demande depuis la matrice sparse.
+
+        Attention : occupe O(n²) en mémoire, à n'utiliser que pour l'inspection de petits réseaux.
+        """
+        return self.matrice_sparse.toarray()
 
     def __str__(self):
         noeuds_str = "\n".join(str(n) for n in self.noeuds.values())
         liaisons_str = "\n".join(str(liaison) for liaison in self.liaisons)
         return f"--- Noeuds ---\n{noeuds_str}\n\n--- Liaisons ---\n{liaisons_str}"
 
-    def calculerFlotMaximal(self):
+    def calculerFlotMaximal(self, afficher: Optional[bool] = None):
         """
-        Calcule le flot maximal entre la super source et le super puits,
-        et affiche les flux utilisés sur chaque liaison.
+        Calcule le flot maximal entre la super source et le super puits.
+
+        Les flux de chaque arête sont extraits en une seule passe sur les entrées non nulles
+        de la matrice sparse. Le détail n'est formaté et affiché que si `afficher` est vrai.
+
+        Args:
+            afficher (bool, optional): Affiche le rapport des flux utilisés.
+                Par défaut, reprend l'attribut `verbeux` du réseau.
 
         >>> Returns:
-            result: objet de résultat de `maximum_flow`
+            result: objet `ResultatFlot` (flow_value, flux par arête, arêtes saturées...)
             index_noeuds: dictionnaire {nom: index} utile pour interpréter les matrices
         """
-        result = maximum_flow(
-            self.matrice_sparse,
+        self._resoudre()
+        result = self.resultat_courant()
+
+        if afficher if afficher is not None else self.verbeux:
+            print(result.rapport())
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", result.rapport())
+
+        return result, self.index_noeuds
+
+    def _resoudre(self) -> None:
+        """
+        Calcule le flot maximal depuis zéro avec le moteur du réseau et mémorise
+        le flux de chaque arête. Un réseau identique déjà résolu est repris du cache.
+        """
+        self.moteur_utilise = self._moteur_calcul()
+        self._coupe = None
+        source = self.index_noeuds["super_source"]
+        puits = self.index_noeuds["super_puits"]
+        cle = None
+        if self.cache is not None and self.cache.actif:
+            cle = empreinte_flot(
+                self.matrice_sparse, source, puits, self.moteur_utilise
+            )
+            trouve = self.cache.lire(cle)
+            if trouve is not None:
+                compter("cache_succes")
+                self._valeur_flot, self._flux, _, self._coupe = trouve
+                return
+        compter("flot_maximal")
+        noter_matrice(self.matrice_sparse.shape[0], self.matrice_sparse.nnz)
+        with mesurer("resolution"):
+            self._valeur_flot, self._flux = MOTEURS[self.moteur_utilise](
+                self.matrice_sparse, source, puits
+            )
+        if cle is not None:
+            coupe = self._positions_coupe() if self.cache.coupe_requise else None
+            self.cache.ecrire(
+                cle, self._valeur_flot, self._flux, self.moteur_utilise, coupe
+            )
+
+    def _moteur_calcul(self) -> str:
+        """Nom du moteur à utiliser pour un calcul complet (résout le mode 'auto')."""
+        if self.moteur == "auto":
+            return choisir_moteur(self.matrice_sparse)
+        return self.moteur
+
+    def resultat_courant(self) -> ResultatFlot:
+        """
+        Retourne le flot maximal courant (après d'éventuelles mises à jour incrémentales)
+        sous forme de `ResultatFlot`, sans relancer de calcul s'il est déjà connu.
+        """
+        if self._flux is None:
+            self._resoudre()
+        with mesurer("extraction"):
+            return ResultatFlot(
+                self._valeur_flot,
+                self.departs_aretes,
+                self.arrivees_aretes,
+                self._flux.copy(),
+                self.matrice_sparse.data.copy(),
+                self.index_inverse,
+                self.moteur_utilise,
+            )
+
+    def valeur_flot(self) -> int:
+        """
+        Retourne la valeur du flot maximal courant (calculée au besoin).
+        """
+        if self._flux is None:
+            self._resoudre()
+        return self._valeur_flot
+
+    def _graphe_residuel(self) -> GrapheResiduel:
+        if self._residuel is None:
+            matrice = self.matrice_sparse
+            self._residuel = GrapheResiduel(
+                matrice.indptr, matrice.indices, matrice.shape[0]
+            )
+        return self._residuel
+
+    def _inserer_liaison(self, depart: str, arrivee: str) -> int:
+        """
+        Ajoute une liaison de capacité nulle en conservant le flot courant.
+
+        Returns:
+            int: Position de la nouvelle arête dans `matrice_sparse.data`.
+
+        Raises: KeyError: si un des deux nœuds n'existe pas (le réseau est inchangé).
+        """
+        for nom in (depart, arrivee):
+            if nom not in self.index_noeuds:
+                raise KeyError(f"❌ Nœud inconnu : {nom}.")
+        n = self.matrice_sparse.shape[0]
+        anciennes_cles = self.departs_aretes.astype(np.int64) * n + self.arrivees_aretes
+        ancien_flux = self._flux
+
+        self.liaisons = list(self.liaisons) + [Liaison(depart, arrivee, 0)]
+        self._liaisons_copiees = True
+        self._construire()
+
+        if ancien_flux is not None:
+            cles = self.departs_aretes.astype(np.int64) * n + self.arrivees_aretes
+            self._flux = np.zeros(len(cles), dtype=np.int64)
+            self._flux[np.searchsorted(cles, anciennes_cles)] = ancien_flux
+        return self.position_arete(depart, arrivee)
+
+    def _fixer_capacite(self, position: int, capacite: int) -> None:
+        """
+        Change la capacité d'une arête dans la matrice et dans les objets du réseau.
+
+        Les objets `Liaison` et `Noeud` reçus à la construction ne sont jamais modifiés :
+        ils sont remplacés par des copies portant la nouvelle capacité (la liste des liaisons
+        est copiée au premier changement).
+        """
+        self.matrice_sparse.data[position] = capacite
+        self._coupe = None
+        concernees = np.flatnonzero(self.positions_liaisons == position)
+        if len(concernees):
+            if not self._liaisons_copiees:
+                self.liaisons = list(self.liaisons)
+                self._liaisons_copiees = True
+            self.capacites_liaisons[concernees] = capacite
+            for k in concernees.tolist():
+                ancienne = self.liaisons[k]
+                self.liaisons[k] = Liaison(ancienne.depart, ancienne.arrivee, capacite)
+
+        i = self.index_inverse[int(self.departs_aretes[position])]
+        j = self.index_inverse[int(self.arrivees_aretes[position])]
+        if i == "super_source" or j == "super_puits":
+            nom = j if i == "super_source" else i
+            noeud = self.noeuds[nom]
+            self.noeuds[nom] = Noeud(noeud.nom, noeud.type, capacite)
+
+    def modifier_capacite(self, depart: str, arrivee: str, nouvelle_cap: int) -> int:
+        """
+        Change la capacité d'une liaison et met à jour le flot maximal à chaud.
+
+        Le flot courant et le graphe résiduel sont conservés :
+            - après une hausse, seuls les nouveaux chemins augmentants sont recherchés,
+            - après une baisse, seul le flux excédentaire est dévié ou annulé, puis le flot
+              est ré-augmenté là où c'est possible.
+        Une liaison absente du réseau est créée. Les arêtes de la super source et du super
+        puits sont accessibles par les noms 'super_source' et 'super_puits'.
+
+        Args:
+            depart (str): Nom du nœud de départ.
+            arrivee (str): Nom du nœud d'arrivée.
+            nouvelle_cap (int): Nouvelle capacité (>= 0).
+
+        Returns:
+            int: Nouvelle valeur du flot maximal.
+
+        Raises:
+            KeyError: si un des deux nœuds n'existe pas (le réseau est inchangé).
+            ValueError: si la capacité est négative.
+        """
+        if nouvelle_cap < 0:
+            raise ValueError("❌ La capacité doit être un entier positif ou nul.")
+        if self._flux is None:
+            self._resoudre()
+        try:
+            position = self.position_arete(depart, arrivee)
+        except KeyError:
+            position = self._inserer_liaison(depart, arrivee)
+
+        capacites = self.matrice_sparse.data
+        compter("mise_a_jour")
+        with mesurer("mise_a_jour"):
+            self._valeur_flot += appliquer_capacite(
+                self._graphe_residuel(),
+                capacites,
+                self._flux,
+                position,
+                nouvelle_cap,
+                self.index_noeuds["super_source"],
+                self.index_noeuds["super_puits"],
+            )
+        self._fixer_capacite(position, nouvelle_cap)
+        return self._valeur_flot
+
+    def augmenter_capacite(self, depart: str, arrivee: str, nouvelle_cap: int) -> int:
+        """
+        Augmente la capacité d'une liaison et met à jour le flot maximal à chaud.
+
+        Seuls les nouveaux chemins augmentants rendus possibles par la hausse sont
+        recherchés. Une liaison absente du réseau est créée.
+
+        Returns:
+            int: Nouvelle valeur du flot maximal.
+
+        Raises:
+            KeyError: si un des deux nœuds n'existe pas (le réseau est inchangé).
+            ValueError: si la nouvelle capacité est inférieure à la capacité actuelle.
+        """
+        try:
+            actuelle = self.matrice_sparse.data[self.position_arete(depart, arrivee)]
+        except KeyError:
+            actuelle = 0
+        if nouvelle_cap < actuelle:
+            raise ValueError(
+                "❌ La nouvelle capacité doit être supérieure ou égale à la capacité actuelle."
+            )
+        return self.modifier_capacite(depart, arrivee, nouvelle_cap)
+
+    def diminuer_capacite(self, depart: str, arrivee: str, nouvelle_cap: int) -> int:
+        """
+        Abaisse la capacité d'une liaison (rupture de canalisation : `nouvelle_cap` = 0)
+        et répare le flot maximal sans le recalculer depuis zéro.
+
+        Returns:
+            int: Nouvelle valeur du flot maximal.
+
+        Raises:
+            KeyError: si la liaison n'existe pas dans le réseau.
+            ValueError: si la nouvelle capacité est supérieure à la capacité actuelle.
+        """
+        actuelle = self.matrice_sparse.data[self.position_arete(depart, arrivee)]
+        if nouvelle_cap > actuelle:
+            raise ValueError(
+                "❌ La nouvelle capacité doit être inférieure ou égale à la capacité actuelle."
+            )
+        return self.modifier_capacite(depart, arrivee, nouvelle_cap)
+
+    def modifier_capacite_noeud(self, nom: str, nouvelle_cap: int) -> int:
+        """
+        Change la capacité d'une source ou d'une ville et met à jour le flot à chaud.
+
+        Permet par exemple d'assécher une source (`nouvelle_cap` = 0) sans reconstruire
+        le réseau ; les assèchements successifs se cumulent.
+
+        Returns:
+            int: Nouvelle valeur du flot maximal.
+
+        Raises:
+            KeyError: si le nœud n'existe pas.
+            ValueError: si le nœud est un intermédiaire.
+        """
+        noeud = self.noeuds[nom]
+        if noeud.type == "source":
+            return self.modifier_capacite("super_source", nom, nouvelle_cap)
+        if noeud.type == "ville":
+            return self.modifier_capacite(nom, "super_puits", nouvelle_cap)
+        raise ValueError("❌ Seules les sources et les villes ont une capacité.")
+
+    def evaluer_capacite(self, depart: str, arrivee: str, nouvelle_cap: int) -> int:
+        """
+        Retourne le flot maximal qu'on obtiendrait en portant une liaison existante
+        à `nouvelle_cap` (hausse ou baisse), sans modifier le réseau.
+
+        Le calcul repart du flot courant (redémarrage à chaud) sur une copie des flux.
+
+        Raises: KeyError: si la liaison n'existe pas dans le réseau.
+        """
+        if self._flux is None:
+            self._resoudre()
+        compter("evaluation")
+        with mesurer("evaluation"):
+            variation = evaluer_capacite(
+                self._graphe_residuel(),
+                self.matrice_sparse.data,
+                self._flux,
+                self.position_arete(depart, arrivee),
+                nouvelle_cap,
+                self.index_noeuds["super_source"],
+                self.index_noeuds["super_puits"],
+            )
+        return self._valeur_flot + variation
+
+    def dimensionner_capacite(
+        self,
+        depart: str,
+        arrivee: str,
+        cap_max: int,
+        pas: int = 1,
+        niveaux: Optional[List[int]] = None,
+    ) -> Tuple[int, int]:
+        """
+        Calcule la plus petite capacité d'une liaison existante qui apporte le gain de flot
+        maximal possible, sans modifier le réseau.
+
+        Les capacités testées sont les niveaux fournis, ou à défaut cap_actuelle + pas,
+        cap_actuelle + 2 * pas, ... jusqu'à `cap_max`. Le flot maximal en fonction de la
+        capacité c d'une seule arête vaut min(F + (c - cap_actuelle), F_haut) : un seul
+        calcul à la capacité la plus haute donne F_haut, donc la capacité à partir de
+        laquelle la liaison n'est plus un goulot. Si la vérification de cette capacité
+        échoue, une recherche dichotomique sur les capacités testées est utilisée.
+
+        Args:
+            depart (str): Nom du nœud de départ.
+            arrivee (str): Nom du nœud d'arrivée.
+            cap_max (int): Capacité maximale autorisée (ignorée si `niveaux` est donné).
+            pas (int): Pas entre deux capacités testées.
+            niveaux (List[int], optional): Capacités autorisées.
+
+        Returns:
+            Tuple (capacité retenue, flot maximal obtenu) ; la capacité actuelle et le flot
+            courant si aucune hausse n'augmente le flot.
+
+        Raises: KeyError: si la liaison n'existe pas dans le réseau.
+        """
+        position = self.position_arete(depart, arrivee)
+        flot = self.valeur_flot()
+        compter("dimensionnement")
+        with mesurer("dimensionnement"):
+            capacite, gain = dimensionner(
+                self._graphe_residuel(),
+                self.matrice_sparse.data,
+                self._flux,
+                position,
+                self.capacites_candidates(position, cap_max, pas, niveaux),
+                self.index_noeuds["super_source"],
+                self.index_noeuds["super_puits"],
+            )
+        return capacite, flot + gain
+
+    def capacites_candidates(
+        self,
+        position: int,
+        cap_max: int,
+        pas: int = 1,
+        niveaux: Optional[List[int]] = None,
+    ):
+        """
+        Capacités à tester (croissantes) pour l'arête `position` : les niveaux supérieurs à
+        sa capacité actuelle, ou à défaut cap_actuelle + pas, ... jusqu'à `cap_max`.
+        """
+        cap_actuelle = int(self.matrice_sparse.data[position])
+        if niveaux is not None:
+            return sorted(c for c in set(niveaux) if c > cap_actuelle)
+        return range(cap_actuelle + pas, cap_max + 1, pas)
+
+    def topologie(self) -> tuple:
+        """
+        Forme compacte de la structure du réseau (indptr, indices, n, source, puits),
+        transmise une seule fois aux processus de calcul.
+        """
+        matrice = self.matrice_sparse
+        return (
+            matrice.indptr,
+            matrice.indices,
+            matrice.shape[0],
             self.index_noeuds["super_source"],
             self.index_noeuds["super_puits"],
         )
-        print(
-            f"💧 Flot maximal total : {result.flow_value} unités\n➡️ Détail des flux utilisés :\n"
+
+    def scenarios_capacites(
+        self, modifications: List[Dict[Tuple[str, str], int]]
+    ) -> np.ndarray:
+        """
+        Construit le tableau des capacités (une ligne par scénario, une colonne par arête de
+        `matrice_sparse.data`) à partir des capacités actuelles et, pour chaque scénario,
+        d'un dictionnaire {(depart, arrivee): nouvelle capacité}.
+
+        Les capacités des sources et des villes sont accessibles par les arêtes
+        ('super_source', source) et (ville, 'super_puits').
+
+        Raises: KeyError: si une arête n'existe pas dans le réseau.
+        """
+        capacites = np.tile(self.matrice_sparse.data, (len(modifications), 1))
+        for ligne, modification in enumerate(modifications):
+            for (depart, arrivee), cap in modification.items():
+                capacites[ligne, self.position_arete(depart, arrivee)] = cap
+        return capacites
+
+    def evaluer_scenarios(
+        self,
+        capacites: np.ndarray,
+        avec_flux: bool = False,
+        n_jobs: int = 1,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Calcule le flot maximal pour un lot de vecteurs de capacités sur la topologie du
+        réseau, sans construire de nouveau réseau ni modifier celui-ci.
+
+        Les index de la topologie sont partagés par tous les scénarios ; les lignes sont
+        réparties sur `n_jobs` processus (ou sur `executor`). Un scénario proche du flot
+        courant (quelques arêtes modifiées) en repart par mises à jour à chaud.
+
+        Args:
+            capacites (np.ndarray): Tableau (scénarios x arêtes) dans l'ordre de
+                `matrice_sparse.data` (voir `scenarios_capacites`).
+            avec_flux (bool): Retourne aussi le flux de chaque arête pour chaque scénario.
+            n_jobs (int): Nombre de processus de calcul.
+            executor (Executor, optional): Exécuteur à utiliser à la place de `n_jobs`.
+
+        Returns:
+            np.ndarray des valeurs du flot (une par scénario), ou le tuple
+            (valeurs, flux par arête) si `avec_flux`.
+
+        Raises: ValueError: si le tableau n'a pas une colonne par arête ou contient une
+            capacité négative.
+        """
+        capacites = np.asarray(capacites, dtype=np.int64)
+        if capacites.ndim != 2 or capacites.shape[1] != self.matrice_sparse.nnz:
+            raise ValueError(
+                f"❌ Les capacités doivent former un tableau (scénarios x {self.matrice_sparse.nnz})."
+            )
+        if (capacites < 0).any():
+            raise ValueError(
+                "❌ Les capacités doivent être des entiers positifs ou nuls."
+            )
+        compter("scenarios", len(capacites))
+        with (
+            mesurer("scenarios"),
+            EvaluateurCandidats(self, n_jobs, executor) as evaluateur,
+        ):
+            valeurs, flux = evaluateur.evaluer_scenarios(capacites, avec_flux)
+        return (valeurs, flux) if avec_flux else valeurs
+
+    def _atteignables(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Masques des nœuds atteignables depuis la super source, et des nœuds depuis lesquels
+        le super puits est atteignable, dans le graphe résiduel du flot courant.
+        """
+        if self._flux is None:
+            self._resoudre()
+        graphe = self._graphe_residuel()
+        residus = graphe.residus(self.matrice_sparse.data, self._flux)
+        amont = graphe.atteignables(residus, self.index_noeuds["super_source"])
+        aval = graphe.atteignables(
+            residus, self.index_noeuds["super_puits"], inverse=True
         )
+        return amont, aval
 
-        # result.flow est une matrice sparse contenant le flot passant par chaque arc
-        flow_matrix = result.flow
+    def _positions_coupe(self) -> np.ndarray:
+        """
+        Positions dans `matrice_sparse.data` des arêtes de la coupe minimale du flot
+        courant (reprises du cache ou calculées, puis mémorisées jusqu'au prochain
+        changement de capacité).
+        """
+        if self._flux is None:
+            self._resoudre()
+        if self._coupe is None:
+            graphe = self._graphe_residuel()
+            residus = graphe.residus(self.matrice_sparse.data, self._flux)
+            amont = graphe.atteignables(residus, self.index_noeuds["super_source"])
+            self._coupe = np.flatnonzero(
+                amont[self.departs_aretes] & ~amont[self.arrivees_aretes]
+            )
+        return self._coupe
 
-        for i in range(flow_matrix.shape[0]):
-            for j in range(flow_matrix.shape[1]):
-                try:
-                    used_flow = flow_matrix[i, j]
-                    if used_flow > 0:
-                        nom_i = self.index_inverse.get(i, f"[inconnu:{i}]")
-                        nom_j = self.index_inverse.get(j, f"[inconnu:{j}]")
-                        print(f"{nom_i} ➝ {nom_j} : {used_flow} unités")
-                except Exception as e:
-                    print(f"(Erreur lors de la lecture du flux de {i} à {j}) : {e}")
+    def coupe_minimale(self) -> List[Tuple[str, str, int]]:
+        """
+        Retourne la coupe minimale du flot courant : arêtes allant des nœuds atteignables
+        depuis la super source (graphe résiduel) vers les autres nœuds.
 
-        return result, self.index_noeuds
+        Ces arêtes, toutes saturées, forment le goulot d'étranglement du réseau : leur
+        capacité totale est égale au flot maximal. Une source ou une ville limitante y
+        figure sous la forme ('super_source', source) ou (ville, 'super_puits').
+
+        Returns:
+            Liste des arêtes de la coupe sous forme (nom_depart, nom_arrivee, capacite)
+        """
+        coupe = self._positions_coupe()
+        noms = self.index_inverse
+        return [
+            (noms[i], noms[j], c)
+            for i, j, c in zip(
+                self.departs_aretes[coupe].tolist(),
+                self.arrivees_aretes[coupe].tolist(),
+                self.matrice_sparse.data[coupe].tolist(),
+            )
+        ]
+
+    def liaisons_ameliorables(self) -> np.ndarray:
+        """
+        Retourne le masque (même ordre que `liaisons`) des liaisons dont une hausse de
+        capacité suffirait à augmenter le flot maximal courant.
+
+        Une telle liaison part d'un nœud atteignable depuis la super source et arrive sur
+        un nœud depuis lequel le super puits est atteignable : elle traverse une coupe
+        minimale. Les autres liaisons n'ont pas besoin d'être testées.
+        """
+        amont, aval = self._atteignables()
+        ameliorables = amont[self.departs_aretes] & aval[self.arrivees_aretes]
+        return ameliorables[self.positions_liaisons]
+
+    def position_arete(self, depart: str, arrivee: str) -> int:
+        """
+        Retourne la position de l'arête (depart, arrivee) dans `matrice_sparse.data`.
+
+        Les arêtes vers la super source et le super puits sont accessibles sous les noms
+        'super_source' et 'super_puits'. La table est construite au premier appel.
+
+        Raises: KeyError: si l'arête n'existe pas dans le réseau.
+        """
+        if self._index_aretes is None:
+            noms = self.index_inverse
+            self._index_aretes = {
+                (noms[i], noms[j]): k
+                for k, (i, j) in enumerate(
+                    zip(self.departs_aretes.tolist(), self.arrivees_aretes.tolist())
+                )
+            }
+        return self._index_aretes[(depart, arrivee)]
+
+    def flux_liaisons(self, result) -> np.ndarray:
+        """
+        Retourne le flux de chaque liaison (même ordre que `liaisons`).
+
+        Args:
+            result: `ResultatFlot` calculé sur ce réseau.
+        """
+        return result.flux[self.positions_liaisons]
+
+    def taux_utilisation(self, result) -> np.ndarray:
+        """
+        Retourne le taux d'utilisation (flux / capacité) de chaque liaison.
+        Vaut NaN pour une liaison de capacité nulle.
+        """
+        flux = self.flux_liaisons(result).astype(float)
+        capacites = self.capacites_liaisons
+        taux = np.full(len(capacites), np.nan)
+        np.divide(flux, capacites, out=taux, where=capacites > 0)
+        return taux
+
+    def capacites_residuelles(self, result) -> np.ndarray:
+        """
+        Retourne la capacité encore disponible (capacité - flux) sur chaque liaison.
+        """
+        return self.capacites_liaisons - self.flux_liaisons(result)
 
     def liaisons_saturees(self, result):
         """
-        Retourne la liste des liaisons saturées (utilisé == capacité).
+        Retourne la liste des liaisons saturées (utilisé == capacité).
+
+        Avec un `ResultatFlot`, la comparaison est faite pour toutes les liaisons en une seule
+        opération vectorisée grâce à la table des positions d'arêtes.
 
         Args:
-            result: Résultat de maximum_flow (contenant result.flow)
+            result: `ResultatFlot`, ou résultat de maximum_flow (contenant result.flow)
 
         Returns:
             Liste des liaisons saturées sous forme (nom_depart, nom_arrivee, capacite)
         """
+        if isinstance(result, ResultatFlot):
+            saturees = np.flatnonzero(
+                self.flux_liaisons(result) == self.capacites_liaisons
+            )
+            liaisons = self.liaisons
+            return [
+                (liaisons[k].depart, liaisons[k].arrivee, liaisons[k].capacite)
+                for k in saturees.tolist()
+            ]
+
+        flow = result.flow
         return [
             (liaison.depart, liaison.arrivee, liaison.capacite)
             for liaison in self.liaisons
-            if result.flow[
+            if flow[
                 self.index_noeuds[liaison.depart], self.index_noeuds[liaison.arrivee]
             ]
             == liaison.capacite
         ]
 
 
+class EvaluateurCandidats:
+    """
+    Dimensionne des liaisons candidates d'un `ReseauHydraulique`, en série ou réparties
+    sur plusieurs processus.
+
+    En parallèle, la topologie du réseau est transmise une seule fois à chaque processus ;
+    un lot ne contient ensuite que les capacités et flux courants (tableaux NumPy) et les
+    positions à évaluer. Les résultats sont rendus dans l'ordre des candidats : le choix
+    qui en découle (égalités comprises) est identique au calcul en série.
+
+    Attributs :
+        reseau (ReseauHydraulique) : Réseau évalué (sa topologie ne doit plus changer).
+        executor (Executor) : Exécuteur utilisé, None pour un calcul en série.
+        nb_lots (int) : Nombre de lots envoyés à chaque évaluation.
+
+    Exemple d'utilisation :
+
+        >>> with EvaluateurCandidats(reseau, n_jobs=8) as evaluateur:
+        ...     resultats = evaluateur.dimensionner([("A", "E"), ("I", "L")], cap_max=25)
+    """
+
+    def __init__(
+        self,
+        reseau: "ReseauHydraulique",
+        n_jobs: int = 1,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.reseau = reseau
+        self.executor = executor
+        self._pool = None
+        self._topologie_lot = None
+        if executor is not None:
+            # Un exécuteur fourni ne peut pas être initialisé : la topologie suit chaque lot
+            self._topologie_lot = reseau.topologie()
+            self.nb_lots = n_jobs if n_jobs > 1 else os.cpu_count() or 1
+        elif n_jobs > 1:
+            self._pool = ProcessPoolExecutor(
+                n_jobs,
+                initializer=initialiser_travailleur,
+                initargs=(reseau.topologie(),),
+            )
+            self.executor = self._pool
+            self.nb_lots = n_jobs
+        else:
+            self.nb_lots = 1
+
+    def __enter__(self) -> "EvaluateurCandidats":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    def fermer(self) -> None:
+        """Arrête les processus lancés par l'évaluateur (pas un exécuteur fourni)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def dimensionner(
+        self,
+        candidats: List[Tuple[str, str]],
+        cap_max: int,
+        pas: int = 1,
+        niveaux: Optional[List[int]] = None,
+    ) -> List[Tuple[int, int]]:
+        """
+        Applique `ReseauHydraulique.dimensionner_capacite` à chaque liaison candidate.
+
+        Returns:
+            Liste des (capacité retenue, flot maximal obtenu), dans l'ordre des candidats.
+        """
+        reseau = self.reseau
+        if self.executor is None or len(candidats) < 2:
+            return [
+                reseau.dimensionner_capacite(depart, arrivee, cap_max, pas, niveaux)
+                for depart, arrivee in candidats
+            ]
+
+        flot = reseau.valeur_flot()
+        taches = []
+        for depart, arrivee in candidats:
+            position = reseau.position_arete(depart, arrivee)
+            taches.append(
+                (position, reseau.capacites_candidates(position, cap_max, pas, niveaux))
+            )
+        taille = -(-len(taches) // self.nb_lots)
+        futures = [
+            self.executor.submit(
+                dimensionner_lot,
+                reseau.matrice_sparse.data,
+                reseau._flux,
+                taches[debut : debut + taille],
+                self._topologie_lot,
+            )
+            for debut in range(0, len(taches), taille)
+        ]
+        return [
+            (capacite, flot + gain)
+            for future in futures
+            for capacite, gain in future.result()
+        ]
+
+    def evaluer_scenarios(
+        self, capacites: np.ndarray, avec_flux: bool = False
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Flot maximal de chaque ligne de `capacites` (voir `moteurs.flots_scenarios`),
+        les lignes étant réparties par lots contigus sur l'exécuteur.
+
+        Returns:
+            Tuple (valeurs du flot, flux par arête ou None).
+        """
+        reseau = self.reseau
+        valeur = reseau.valeur_flot()
+        reference = (reseau.matrice_sparse.data, reseau._flux, valeur)
+        moteur = reseau._moteur_calcul()
+        if self.executor is None or len(capacites) < 2:
+            return flots_scenarios(
+                capacites, reference, moteur, avec_flux, reseau.topologie()
+            )
+
+        taille = -(-len(capacites) // self.nb_lots)
+        futures = [
+            self.executor.submit(
+                flots_scenarios,
+                capacites[debut : debut + taille],
+                reference,
+                moteur,
+                avec_flux,
+                self._topologie_lot,
+            )
+            for debut in range(0, len(capacites), taille)
+        ]
+        resultats = [future.result() for future in futures]
+        valeurs = np.concatenate([valeurs for valeurs, _ in resultats])
+        flux = np.concatenate([flux for _, flux in resultats]) if avec_flux else None
+        return valeurs, flux
+
+
+def calibrer_moteurs(
+    reseaux: List[ReseauHydraulique],
+    moteurs: Optional[List[str]] = None,
+    repetitions: int = 3,
+) -> Dict[Tuple[int, str], Dict[str, float]]:
+    """
+    Mesure les moteurs de flot sur des réseaux représentatifs et retient le plus rapide
+    pour chaque profil (taille, densité). Les réseaux en mode 'auto' de même profil
+    utiliseront ensuite ce moteur.
+
+    Args:
+        reseaux: Réseaux servant de banc d'essai.
+        moteurs: Noms des moteurs à comparer (tous par défaut).
+        repetitions: Nombre de mesures par moteur et par réseau.
+
+    Returns:
+        Dict {profil: {moteur: durée totale en secondes}}.
+    """
+    instances = [
+        (
+            reseau.matrice_sparse,
+            reseau.index_noeuds["super_source"],
+            reseau.index_noeuds["super_puits"],
+        )
+        for reseau in reseaux
+    ]
+    return calibrer(instances, moteurs, repetitions)
+
+
 def optimiser_liaisons(
     noeuds: List[Noeud],
     liaisons_actuelles: List[Liaison],
     liaisons_a_optimiser: List[Tuple[str, str]],
+    niveaux: Optional[List[int]] = None,
+    cap_max: int = 20,
+    pas: int = 1,
+    n_jobs: int = 1,
+    executor: Optional[Executor] = None,
+    mode: str = "glouton",
+    max_travaux: Optional[int] = None,
 ) -> Tuple[List[Liaison], List[Tuple[Tuple[str, str], int, int]]]:
     """
     Optimise l'ordre et la capacités des flots des liaisons choisies afin de maximiser le flot global.
 
+    Deux modes sont disponibles :
+        - 'glouton' : à chaque itération, la liaison apportant le plus grand gain est renforcée,
+        - 'exact' : les hausses (au plus `max_travaux`, toutes par défaut) et leurs capacités
+          sont choisies ensemble par programmation linéaire en nombres entiers, ce qui
+          trouve aussi les combinaisons dont le gain n'apparaît qu'à deux liaisons ou plus.
+          Les travaux retenus sont ensuite ordonnés pour maximiser le flot après chacun.
+
+    Pour chaque liaison, la capacité retenue est la plus petite qui apporte le gain de flot
+    maximal (voir `ReseauHydraulique.dimensionner_capacite`), parmi `niveaux` s'ils sont
+    donnés, sinon parmi les capacités cap_actuelle + pas, ... jusqu'à `cap_max`.
+    Les liaisons d'une même itération sont évaluées sur `n_jobs` processus (ou avec
+    `executor`), avec un résultat identique au calcul en série.
+
     >>> Retourne l'ordre des travaux à effectuer :
         Travaux #1 : Liaison A -> E
         Travaux #2 : Liaison I -> L
@@ -569,77 +2090,176 @@ def optimiser_liaisons(
             - La nouvelle configuration optimisée des liaisons.
             - La liste des travaux effectués sous forme : ((départ, arrivée), capacité choisie, flot atteint)
     """
+    if mode not in ("glouton", "exact"):
+        raise ValueError(f"❌ Mode d'optimisation inconnu : {mode} (glouton ou exact).")
     meilleure_config = liaisons_actuelles[:]
     liaisons_restantes = liaisons_a_optimiser[:]
     travaux_effectues = []
 
-    reseau_temp = ReseauHydraulique(noeuds, meilleure_config)
-    result_init, _ = reseau_temp.calculerFlotMaximal()
-
-    while liaisons_restantes:
-        meilleur_gain = result_init.flow_value
-        meilleure_liaison = None
-        meilleure_config_temp = None
-        meilleur_result_temp = None
-        meilleure_capacite = 0
+    # Réseau d'évaluation unique : les liaisons à optimiser absentes de la configuration y
+    # figurent avec une capacité nulle, et chaque essai repart du flot courant.
+    existantes = {(liaison.depart, liaison.arrivee) for liaison in meilleure_config}
+    reseau_temp = ReseauHydraulique(
+        noeuds,
+        meilleure_config
+        + [
+            Liaison(depart, arrivee, 0)
+            for depart, arrivee in dict.fromkeys(liaisons_restantes)
+            if (depart, arrivee) not in existantes
+        ],
+        verbeux=False,
+    )
+    flot_courant = reseau_temp.valeur_flot()
+
+    if mode == "exact":
+        meilleure_config, travaux_effectues = _planifier_travaux_exacts(
+            reseau_temp,
+            meilleure_config,
+            liaisons_restantes,
+            niveaux,
+            cap_max,
+            pas,
+            max_travaux,
+        )
+        _journaliser_travaux(travaux_effectues)
+        return meilleure_config, travaux_effectues
+
+    with EvaluateurCandidats(reseau_temp, n_jobs, executor) as evaluateur:
+        while liaisons_restantes:
+            meilleur_gain = flot_courant
+            meilleure_liaison = None
+            meilleure_capacite = 0
+            # Seules les liaisons traversant une coupe minimale peuvent augmenter le flot
+            ameliorables = {
+                (liaison.depart, liaison.arrivee)
+                for liaison, ameliorable in zip(
+                    reseau_temp.liaisons, reseau_temp.liaisons_ameliorables().tolist()
+                )
+                if ameliorable
+            }
 
-        for liaison_cible in liaisons_restantes:
-            depart, arrivee = liaison_cible
+            candidats = [
+                tuple(liaison_cible)
+                for liaison_cible in liaisons_restantes
+                if tuple(liaison_cible) in ameliorables
+            ]
+            resultats = evaluateur.dimensionner(candidats, cap_max, pas, niveaux)
 
-            for cap_test in [5, 10, 15, 20]:
-                config_temp = []
-                liaison_trouvee = False
+            for (depart, arrivee), (cap_test, flot_test) in zip(candidats, resultats):
+                if flot_test > meilleur_gain:
+                    meilleur_gain = flot_test
+                    meilleure_liaison = (depart, arrivee)
+                    meilleure_capacite = cap_test
 
-                for liaison in meilleure_config:
-                    if (liaison.depart, liaison.arrivee) == (depart, arrivee):
-                        config_temp.append(Liaison(depart, arrivee, cap_test))
-                        liaison_trouvee = True
-                    else:
-                        config_temp.append(liaison)
+            if meilleure_liaison:
+                depart, arrivee = meilleure_liaison
+                flot_courant = reseau_temp.augmenter_capacite(
+                    depart, arrivee, meilleure_capacite
+                )
 
-                if not liaison_trouvee:
-                    config_temp.append(Liaison(depart, arrivee, cap_test))
+                meilleure_config = _remplacer_liaison(
+                    meilleure_config, depart, arrivee, meilleure_capacite
+                )
 
-                reseau_hydro = ReseauHydraulique(noeuds, config_temp)
-                try:
-                    result, _ = reseau_hydro.calculerFlotMaximal()
-                except Exception as e:
-                    print(
-                        f"Erreur lors du calcul pour {depart}->{arrivee} cap={cap_test} : {e}"
+                travaux_effectues.append(
+                    (meilleure_liaison, meilleure_capacite, flot_courant)
+                )
+                if meilleure_liaison in liaisons_restantes:
+                    liaisons_restantes.remove(meilleure_liaison)
+                else:
+                    logger.warning(
+                        "⚠️ Liaison %s -> %s déjà supprimée ou non trouvée, arrêt de la "
+                        "boucle pour éviter un blocage.",
+                        *meilleure_liaison,
                     )
-                    continue
-
-                if result.flow_value > meilleur_gain:
-                    meilleur_gain = result.flow_value
-                    meilleure_liaison = (depart, arrivee)
-                    meilleure_capacite = cap_test
-                    meilleure_config_temp = config_temp[:]
-                    meilleur_result_temp = result
-
-        if meilleure_liaison:
-            meilleure_config = meilleure_config_temp
-            travaux_effectues.append(
-                (meilleure_liaison, meilleure_capacite, meilleur_result_temp.flow_value)
-            )
-            if meilleure_liaison in liaisons_restantes:
-                liaisons_restantes.remove(meilleure_liaison)
+                    break
             else:
-                print(
-                    "⚠️ Liaison déjà supprimée ou non trouvée, arrêt de la boucle pour éviter un blocage."
+                logger.info(
+                    "🚫 Aucun gain supplémentaire possible. Arrêt de l’optimisation."
                 )
                 break
-            result_init = meilleur_result_temp  # mise à jour du flot de référence
-        else:
-            print("🚫 Aucun gain supplémentaire possible. Arrêt de l’optimisation.")
-            break
 
-    print("\n📋 Résumé des travaux effectués :")
+    _journaliser_travaux(travaux_effectues)
+    return meilleure_config, travaux_effectues
+
+
+def _journaliser_travaux(travaux_effectues) -> None:
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("📋 Résumé des travaux effectués :")
     for i, (liaison, cap, flot) in enumerate(travaux_effectues, 1):
-        print(
-            f"Travaux #{i} : {liaison[0]} -> {liaison[1]}, capacité {cap} ➝ flot atteint : {flot} unités"
+        logger.info(
+            "Travaux #%d : %s -> %s, capacité %d ➝ flot atteint : %d unités",
+            i,
+            liaison[0],
+            liaison[1],
+            cap,
+            flot,
         )
 
-    return meilleure_config, travaux_effectues
+
+def _remplacer_liaison(
+    config: List[Liaison], depart: str, arrivee: str, capacite: int
+) -> List[Liaison]:
+    """
+    Retourne une copie de `config` où la liaison (depart, arrivee) porte `capacite`
+    (ajoutée en fin de liste si elle n'existe pas).
+    """
+    config_temp = []
+    liaison_trouvee = False
+    for liaison in config:
+        if (liaison.depart, liaison.arrivee) == (depart, arrivee):
+            config_temp.append(Liaison(depart, arrivee, capacite))
+            liaison_trouvee = True
+        else:
+            config_temp.append(liaison)
+    if not liaison_trouvee:
+        config_temp.append(Liaison(depart, arrivee, capacite))
+    return config_temp
+
+
+def _planifier_travaux_exacts(
+    reseau: ReseauHydraulique,
+    config: List[Liaison],
+    liaisons_a_optimiser: List[Tuple[str, str]],
+    niveaux: Optional[List[int]],
+    cap_max: int,
+    pas: int,
+    max_travaux: Optional[int],
+) -> Tuple[List[Liaison], List[Tuple[Tuple[str, str], int, int]]]:
+    """
+    Mode exact de `optimiser_liaisons` : choisit les hausses par `planifier_milp`, puis les
+    applique une à une en commençant par celle qui donne le plus grand flot.
+    """
+    candidats = list(dict.fromkeys(tuple(liaison) for liaison in liaisons_a_optimiser))
+    positions = {liaison: reseau.position_arete(*liaison) for liaison in candidats}
+    niveaux_par_position = {}
+    for position in positions.values():
+        capacites = list(reseau.capacites_candidates(position, cap_max, pas, niveaux))
+        if capacites:
+            niveaux_par_position[position] = capacites
+
+    retenues = planifier_milp(
+        reseau.matrice_sparse,
+        reseau.index_noeuds["super_source"],
+        reseau.index_noeuds["super_puits"],
+        niveaux_par_position,
+        len(niveaux_par_position) if max_travaux is None else max_travaux,
+    )
+    a_faire = [
+        (liaison, retenues[positions[liaison]])
+        for liaison in candidats
+        if positions[liaison] in retenues
+    ]
+
+    travaux_effectues = []
+    while a_faire:
+        flots = [reseau.evaluer_capacite(*liaison, cap) for liaison, cap in a_faire]
+        liaison, cap = a_faire.pop(flots.index(max(flots)))
+        flot = reseau.augmenter_capacite(*liaison, cap)
+        config = _remplacer_liaison(config, *liaison, cap)
+        travaux_effectues.append((liaison, cap, flot))
+    return config, travaux_effectues
 
 
 def demander_cap_max(valeur_defaut=25, essais_max=3) -> int:
@@ -668,7 +2288,15 @@ def demander_cap_max(valeur_defaut=25, essais_max=3) -> int:
 
 
 def satisfaction(
-    noeuds, liaisons, optimiser_fonction=None, objectif=None, cap_max=25, max_travaux=5
+    noeuds,
+    liaisons,
+    optimiser_fonction=None,
+    objectif=None,
+    cap_max=25,
+    max_travaux=5,
+    pas=1,
+    n_jobs=1,
+    executor=None,
 ) -> Tuple[List[Liaison], List[Tuple[Tuple[str, str], int, int]]]:
     """
     Optimise les capacités du réseau hydraulique pour satisfaire la demande des villes.
@@ -678,7 +2306,10 @@ def satisfaction(
     villes, jusqu'à satisfaire entièrement la demande ou atteindre une limite fixée de travaux.
 
     À chaque itération :
-    - on teste une augmentation de capacité pour chaque liaison,
+    - on journalise la coupe minimale du flot courant (goulot d'étranglement, niveau INFO),
+    - on teste une augmentation de capacité pour chaque liaison traversant une coupe
+      minimale (les autres ne peuvent pas augmenter le flot), dimensionnée directement à
+      la plus petite capacité qui apporte le gain maximal,
     - on applique la meilleure amélioration détectée (celle qui maximise le flot),
     - on répète jusqu'à `max_travaux` améliorations ou jusqu'à atteindre l'objectif.
 
@@ -689,122 +2320,126 @@ def satisfaction(
         objectif (int, optional): Flot cible à atteindre. Si non spécifié, la somme des demandes des villes est utilisée.
         cap_max (int, optional): Capacité maximale autorisée pour une liaison après amélioration. Par défaut à 25.
         max_travaux (int, optional): Nombre maximal de travaux (améliorations) autorisés. Par défaut à 5.
+        pas (int, optional): Pas entre deux capacités testées (1 : capacité exacte). Par défaut à 1.
+        n_jobs (int, optional): Nombre de processus évaluant les liaisons candidates. Par défaut à 1.
+        executor (Executor, optional): Exécuteur à utiliser à la place des processus de `n_jobs`.
 
     Returns:
         Tuple:
             - List[Liaison]: Liste des liaisons après optimisation.
             - List[Tuple[Tuple[str, str], int, int]]: Liste des travaux réalisés, avec pour chacun :
             (liaison modifiée, capacité finale, flot maximal obtenu après modification).
+
+    Rien n'est affiché : le déroulement est journalisé (module `logging`, niveau INFO) et
+    `resume_travaux(liaisons, travaux)` regroupe les travaux par liaison.
     """
     objectif_utilisateur = objectif or sum(
         n.capaciteMax for n in noeuds if n.type == "ville"
     )
-    reseau = ReseauHydraulique(noeuds, liaisons)
-    result, index_noeuds = reseau.calculerFlotMaximal()
+    # Un seul réseau est construit : chaque essai de capacité repart du flot courant
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    flot_courant = reseau.valeur_flot()
     travaux_effectues = []
     liaisons_courantes = liaisons[:]
     essais = 0
 
-    while result.flow_value < objectif_utilisateur and essais < max_travaux:
-        meilleure_amelioration = None
-        meilleur_gain = 0
-        meilleur_cap = None
-        meilleur_new_flot = None
-
-        # Pour chaque liaison, on essaie d'augmenter d'autant que possible d'un coup
-        for liaison in liaisons_courantes:
-            depart, arrivee, cap_actuelle = (
-                liaison.depart,
-                liaison.arrivee,
-                liaison.capacite,
-            )
-            cap_test = cap_actuelle
-            flot_ref = result.flow_value
-            last_gain = 0
-            # On augmente la capacité tant que le flot augmente et qu'on ne dépasse pas cap_max
-            for cap_test in range(cap_actuelle + 5, cap_max + 1, 5):
-                liaisons_test = [
-                    Liaison(
-                        liaison_obj.depart,
-                        liaison_obj.arrivee,
-                        (
-                            cap_test
-                            if liaison_obj.depart == depart
-                            and liaison_obj.arrivee == arrivee
-                            else liaison_obj.capacite
-                        ),
-                    )
-                    for liaison_obj in liaisons_courantes
-                ]
-                reseau_test = ReseauHydraulique(noeuds, liaisons_test)
-                result_test, _ = reseau_test.calculerFlotMaximal()
-                gain = result_test.flow_value - flot_ref
-                if gain > 0:
-                    last_gain = gain
-                    meilleur_cap_temp = cap_test
-                    meilleur_new_flot_temp = result_test.flow_value
-                    break  # On s'arrête dès qu'on trouve un gain pour cette liaison
-
-            # Si on a trouvé une amélioration sur cette liaison
-            if (
-                last_gain > 0
-                and (meilleur_new_flot_temp - result.flow_value) > meilleur_gain
-            ):
-                meilleure_amelioration = (depart, arrivee)
-                meilleur_cap = meilleur_cap_temp
-                meilleur_gain = meilleur_new_flot_temp - result.flow_value
-                meilleur_new_flot = meilleur_new_flot_temp
-
-        if meilleure_amelioration is None:
-            print("Aucune amélioration possible, arrêt.")
-            break
-
-        # Appliquer la meilleure amélioration trouvée
-        depart, arrivee = meilleure_amelioration
-        for i, liaison_courante in enumerate(liaisons_courantes):
-            if (
-                liaison_courante.depart == depart
-                and liaison_courante.arrivee == arrivee
-            ):
-                liaisons_courantes[i] = Liaison(depart, arrivee, meilleur_cap)
-                break
+    with EvaluateurCandidats(reseau, n_jobs, executor) as evaluateur:
+        while flot_courant < objectif_utilisateur and essais < max_travaux:
+            meilleure_amelioration = None
+            meilleur_gain = 0
+            meilleur_cap = None
+            meilleur_new_flot = None
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "🔻 Goulot d'étranglement (coupe minimale) : %s",
+                    ", ".join(
+                        f"{depart} ➝ {arrivee} ({cap})"
+                        for depart, arrivee, cap in reseau.coupe_minimale()
+                    ),
+                )
+            ameliorables = reseau.liaisons_ameliorables()
 
-        travaux_effectues.append(((depart, arrivee), meilleur_cap, meilleur_new_flot))
-        reseau = ReseauHydraulique(noeuds, liaisons_courantes)
-        result, _ = reseau.calculerFlotMaximal()
-        essais += 1
+            # Chaque liaison de la coupe est portée d'un coup à la capacité utile
+            candidats = [
+                (liaison.depart, liaison.arrivee)
+                for liaison, ameliorable in zip(
+                    liaisons_courantes, ameliorables.tolist()
+                )
+                if ameliorable
+            ]
+            resultats = evaluateur.dimensionner(candidats, cap_max, pas)
+            for (depart, arrivee), (cap_test, flot_test) in zip(candidats, resultats):
+                if flot_test - flot_courant > meilleur_gain:
+                    meilleure_amelioration = (depart, arrivee)
+                    meilleur_cap = cap_test
+                    meilleur_gain = flot_test - flot_courant
+                    meilleur_new_flot = flot_test
+
+            if meilleure_amelioration is None:
+                logger.info("Aucune amélioration possible, arrêt.")
+                break
 
-    print(
-        f"✅ Objectif atteint ou optimisation maximale atteinte. Flot final : {result.flow_value} / {objectif_utilisateur}"
-    )
-    if travaux_effectues:
-        # Regroupe les travaux par liaison
-        resume_travaux = {}
-        for (depart, arrivee), cap, new_flot in travaux_effectues:
-            key = (depart, arrivee)
-            if key not in resume_travaux:
-                resume_travaux[key] = {
-                    "cap_depart": None,
-                    "cap_fin": cap,
-                    "flot": new_flot,
-                }
-            else:
-                resume_travaux[key]["cap_fin"] = cap
-                resume_travaux[key]["flot"] = new_flot
-        # Cherche la capacité de départ pour chaque liaison
-        for depart, arrivee in resume_travaux:
-            cap_depart = None
-            for liaison_obj in liaisons:
-                if liaison_obj.depart == depart and liaison_obj.arrivee == arrivee:
-                    cap_depart = liaison_obj.capacite
+            # Appliquer la meilleure amélioration trouvée
+            depart, arrivee = meilleure_amelioration
+            for i, liaison_courante in enumerate(liaisons_courantes):
+                if (
+                    liaison_courante.depart == depart
+                    and liaison_courante.arrivee == arrivee
+                ):
+                    liaisons_courantes[i] = Liaison(depart, arrivee, meilleur_cap)
                     break
-            resume_travaux[(depart, arrivee)]["cap_depart"] = cap_depart
 
-        print("📋 Résumé des travaux réalisés :")
-        for (depart, arrivee), infos in resume_travaux.items():
-            print(
-                f"  - Liaison {depart} ➝ {arrivee} : capacité {infos['cap_depart']} ➔ {infos['cap_fin']} unités, flot maximal atteint lors du dernier changement : {infos['flot']} unités"
+            travaux_effectues.append(
+                ((depart, arrivee), meilleur_cap, meilleur_new_flot)
+            )
+            flot_courant = reseau.augmenter_capacite(depart, arrivee, meilleur_cap)
+            essais += 1
+
+    logger.info(
+        "✅ Objectif atteint ou optimisation maximale atteinte. Flot final : %d / %d",
+        flot_courant,
+        objectif_utilisateur,
+    )
+    if logger.isEnabledFor(logging.INFO):
+        resume = resume_travaux(liaisons, travaux_effectues)
+        if resume:
+            logger.info("📋 Résumé des travaux réalisés :")
+        else:
+            logger.info("Aucune amélioration n'a pu être réalisée.")
+        for (depart, arrivee), infos in resume.items():
+            logger.info(
+                "  - Liaison %s ➝ %s : capacité %s ➔ %d unités, flot maximal atteint "
+                "lors du dernier changement : %d unités",
+                depart,
+                arrivee,
+                infos["cap_depart"],
+                infos["cap_fin"],
+                infos["flot"],
             )
-    else:
-        print("Aucune amélioration n'a pu être réalisée.")
     return liaisons_courantes, travaux_effectues
+
+
+def resume_travaux(
+    liaisons_initiales: List[Liaison],
+    travaux: List[Tuple[Tuple[str, str], int, int]],
+) -> Dict[Tuple[str, str], Dict[str, Optional[int]]]:
+    """
+    Regroupe les travaux par liaison (voir `satisfaction` et `optimiser_liaisons`).
+
+    Returns:
+        Dict[(depart, arrivee), Dict]: pour chaque liaison modifiée, sa capacité dans
+        `liaisons_initiales` ("cap_depart", None si elle n'existait pas), sa capacité
+        finale ("cap_fin") et le flot atteint lors de son dernier changement ("flot").
+    """
+    capacites = {
+        (li.depart, li.arrivee): li.capacite for li in reversed(liaisons_initiales)
+    }
+    resume = {}
+    for (depart, arrivee), cap, flot in travaux:
+        infos = resume.setdefault(
+            (depart, arrivee), {"cap_depart": capacites.get((depart, arrivee))}
+        )
+        infos["cap_fin"] = cap
+        infos["flot"] = flot
+    return resume
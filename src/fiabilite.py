@@ -0,0 +1,232 @@
+"""
+fiabilite.py – Simulation de Monte-Carlo de la fiabilité d'un réseau hydraulique.
+
+Les rendements des sources et la disponibilité des liaisons sont aléatoires : chaque
+tirage fixe la capacité de toutes les arêtes du réseau, puis le flot maximal est calculé
+pour chaque tirage. Les tirages sont vectorisés (NumPy, une seule graine pour toute la
+simulation, quel que soit le nombre de processus) et résolus par lots sur la topologie du
+réseau, éventuellement répartis sur plusieurs processus.
+
+Lois disponibles pour le rendement d'un nœud (facteur appliqué à sa capacité, tronqué
+à 0) :
+    - ("uniforme", bas, haut),
+    - ("normale", moyenne, ecart_type),
+    - ("beta", a, b) : rendement dans [0, 1],
+    - ("bernoulli", p) : capacité pleine avec la probabilité p, nulle sinon.
+
+Le module fournit :
+    - LOIS_RENDEMENT : lois disponibles,
+    - tirer_capacites(...) : tableau (tirages x arêtes) des capacités tirées,
+    - simuler_fiabilite(...) : distribution du flot livré, probabilité de service
+      complet de chaque ville, fréquence de saturation de chaque liaison.
+
+Exemple d'utilisation :
+
+    >>> simulation = simuler_fiabilite(
+    ...     noeuds, liaisons, nb_tirages=5000, pannes=0.02,
+    ...     rendements={"A": ("beta", 8, 2)}, graine=1)
+    >>> simulation["quantiles"], simulation["probabilite_villes"]
+"""
+
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from contingence import CELLULES_LOT, elements_reseau
+from data import EvaluateurCandidats, Liaison, Noeud, ReseauHydraulique
+from instrumentation import compter, mesurer
+
+LOIS_RENDEMENT = ("uniforme", "normale", "beta", "bernoulli")
+
+Loi = Tuple
+
+
+def _tirer_rendements(rng: np.random.Generator, loi: Loi, taille: int) -> np.ndarray:
+    """Facteurs de rendement (>= 0) tirés selon `loi`."""
+    nom, *parametres = loi
+    if nom == "uniforme":
+        valeurs = rng.uniform(*parametres, size=taille)
+    elif nom == "normale":
+        valeurs = rng.normal(*parametres, size=taille)
+    elif nom == "beta":
+        valeurs = rng.beta(*parametres, size=taille)
+    elif nom == "bernoulli":
+        valeurs = (rng.random(taille) < parametres[0]).astype(float)
+    else:
+        raise ValueError(f"❌ Loi inconnue : '{nom}'. Choisir parmi {LOIS_RENDEMENT}.")
+    return np.maximum(valeurs, 0.0)
+
+
+def tirer_capacites(
+    reseau: ReseauHydraulique,
+    nb_tirages: int,
+    pannes: Union[float, Dict[Tuple[str, str], float]] = 0.0,
+    rendements: Optional[Dict[str, Loi]] = None,
+    rendement_sources: Optional[Loi] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Tire `nb_tirages` vecteurs de capacités dans l'ordre de `matrice_sparse.data`.
+
+    Args:
+        reseau (ReseauHydraulique): Réseau de référence (capacités nominales).
+        nb_tirages (int): Nombre de tirages.
+        pannes: Probabilité de panne (capacité nulle) de chaque liaison, commune ou par
+            liaison {(depart, arrivee): probabilité} (0 pour les liaisons absentes).
+        rendements: Loi du rendement de chaque nœud nommé (source ou ville).
+        rendement_sources: Loi du rendement des sources absentes de `rendements`.
+        rng (np.random.Generator, optional): Générateur aléatoire.
+
+    Returns:
+        np.ndarray (tirages x arêtes) des capacités entières.
+
+    Raises:
+        ValueError: si une probabilité ou une loi est invalide, ou si un nœud n'a pas
+            de capacité.
+        KeyError: si une liaison ou un nœud n'existe pas.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    capacites_base = reseau.matrice_sparse.data
+    capacites = np.tile(capacites_base, (nb_tirages, 1))
+
+    liaisons = elements_reseau(reseau, ("liaison",))
+    positions = np.array([p[0] for _, p in liaisons], dtype=np.int64)
+    if isinstance(pannes, dict):
+        probabilites = np.zeros(len(liaisons))
+        index = {paire: i for i, ((_, paire), _) in enumerate(liaisons)}
+        for paire, p in pannes.items():
+            if paire not in index:
+                raise KeyError(f"❌ Liaison inconnue : {paire[0]} ➝ {paire[1]}.")
+            probabilites[index[paire]] = p
+    else:
+        probabilites = np.full(len(liaisons), float(pannes))
+    if ((probabilites < 0) | (probabilites > 1)).any():
+        raise ValueError("❌ Les probabilités de panne doivent être dans [0, 1].")
+    if probabilites.any():
+        en_panne = rng.random((nb_tirages, len(liaisons))) < probabilites
+        colonnes = capacites[:, positions]
+        colonnes[en_panne] = 0
+        capacites[:, positions] = colonnes
+
+    lois = {}
+    if rendement_sources is not None:
+        lois = {
+            nom: rendement_sources
+            for nom, n in reseau.noeuds.items()
+            if n.type == "source"
+        }
+    lois.update(rendements or {})
+    for nom, loi in lois.items():
+        noeud = reseau.noeuds[nom]
+        if noeud.type == "source":
+            position = reseau.position_arete("super_source", nom)
+        elif noeud.type == "ville":
+            position = reseau.position_arete(nom, "super_puits")
+        else:
+            raise ValueError(f"❌ Le nœud {nom} n'a pas de capacité (intermédiaire).")
+        facteurs = _tirer_rendements(rng, loi, nb_tirages)
+        capacites[:, position] = np.floor(capacites_base[position] * facteurs)
+    return capacites
+
+
+def simuler_fiabilite(
+    noeuds: List[Noeud],
+    liaisons: List[Liaison],
+    nb_tirages: int = 1000,
+    pannes: Union[float, Dict[Tuple[str, str], float]] = 0.0,
+    rendements: Optional[Dict[str, Loi]] = None,
+    rendement_sources: Optional[Loi] = None,
+    graine: Optional[int] = 0,
+    n_jobs: int = 1,
+    executor: Optional[Executor] = None,
+    moteur: str = "auto",
+) -> Dict:
+    """
+    Simule `nb_tirages` états aléatoires du réseau et calcule le flot maximal de chacun.
+
+    Les capacités sont tirées en une fois (voir `tirer_capacites`), puis résolues par
+    lots sur la topologie du réseau, répartis sur `n_jobs` processus (ou sur
+    `executor`). Le résultat ne dépend que de la graine.
+
+    Args:
+        noeuds (List[Noeud]): Nœuds du réseau.
+        liaisons (List[Liaison]): Liaisons du réseau.
+        nb_tirages (int): Nombre de tirages.
+        pannes: Probabilité de panne de chaque liaison (voir `tirer_capacites`).
+        rendements: Loi du rendement de chaque nœud nommé (voir `LOIS_RENDEMENT`).
+        rendement_sources: Loi du rendement des sources absentes de `rendements`.
+        graine (int, optional): Graine du générateur aléatoire.
+        n_jobs (int): Nombre de processus de calcul.
+        executor (Executor, optional): Exécuteur à utiliser à la place de `n_jobs`.
+        moteur (str): Moteur de calcul du flot.
+
+    Returns:
+        Dictionnaire :
+            - nb_tirages, flot_base : nombre de tirages et flot maximal nominal,
+            - flots : flot livré à chaque tirage (np.ndarray),
+            - flot_moyen, ecart_type, quantiles ({5, 25, 50, 75, 95: flot}),
+            - probabilite_villes : {ville: probabilité que sa demande (tirée) soit
+              entièrement servie},
+            - probabilite_service_complet : probabilité que toutes les villes le soient,
+            - frequence_saturation : {(depart, arrivee): part des tirages où la liaison,
+              disponible, est saturée}.
+
+    Raises: ValueError: si `nb_tirages` est inférieur à 1 (voir aussi `tirer_capacites`).
+    """
+    if nb_tirages < 1:
+        raise ValueError(
+            f"❌ Au moins un tirage est nécessaire (nb_tirages={nb_tirages})."
+        )
+    reseau = ReseauHydraulique(noeuds, liaisons, moteur=moteur)
+    rng = np.random.default_rng(graine)
+    villes = [nom for nom, n in reseau.noeuds.items() if n.type == "ville"]
+    pos_villes = np.array(
+        [reseau.position_arete(ville, "super_puits") for ville in villes],
+        dtype=np.int64,
+    )
+    liaisons_distinctes = elements_reseau(reseau, ("liaison",))
+    pos_liaisons = np.array([p[0] for _, p in liaisons_distinctes], dtype=np.int64)
+
+    flots = np.empty(nb_tirages, dtype=np.int64)
+    servies = np.zeros(len(villes), dtype=np.int64)
+    toutes_servies = 0
+    saturations = np.zeros(len(pos_liaisons), dtype=np.int64)
+    taille_lot = max(1, CELLULES_LOT // max(1, reseau.matrice_sparse.nnz))
+
+    with mesurer("fiabilite"):
+        capacites = tirer_capacites(
+            reseau, nb_tirages, pannes, rendements, rendement_sources, rng
+        )
+        with EvaluateurCandidats(reseau, n_jobs, executor) as evaluateur:
+            for debut in range(0, nb_tirages, taille_lot):
+                lot = capacites[debut : debut + taille_lot]
+                compter("scenarios", len(lot))
+                valeurs, flux = evaluateur.evaluer_scenarios(lot, avec_flux=True)
+                flots[debut : debut + len(lot)] = valeurs
+
+                service = flux[:, pos_villes] >= lot[:, pos_villes]
+                servies += service.sum(axis=0)
+                toutes_servies += int(service.all(axis=1).sum())
+                caps = lot[:, pos_liaisons]
+                saturations += ((flux[:, pos_liaisons] == caps) & (caps > 0)).sum(
+                    axis=0
+                )
+
+    quantiles = (5, 25, 50, 75, 95)
+    return {
+        "nb_tirages": nb_tirages,
+        "flot_base": reseau.valeur_flot(),
+        "flots": flots,
+        "flot_moyen": float(flots.mean()),
+        "ecart_type": float(flots.std()),
+        "quantiles": dict(zip(quantiles, np.percentile(flots, quantiles).tolist())),
+        "probabilite_villes": dict(zip(villes, (servies / nb_tirages).tolist())),
+        "probabilite_service_complet": toutes_servies / nb_tirages,
+        "frequence_saturation": {
+            paire: frequence
+            for ((_, paire), _), frequence in zip(
+                liaisons_distinctes, (saturations / nb_tirages).tolist()
+            )
+        },
+    }
@@ -0,0 +1,265 @@
+"""
+generateur.py – Génération de réseaux hydrauliques synthétiques, reproductibles par graine.
+
+Les réseaux produits sont organisés en couches : sources -> couches d'intermédiaires ->
+villes. Chaque nœud est relié à `fan_out` nœuds de la couche suivante et chaque nœud
+reçoit au moins une liaison de la couche précédente. On peut en outre :
+    - choisir la loi des capacités (uniforme ou log-normale, bornée),
+    - ajouter des liaisons redondantes sautant une couche (`redondance`),
+    - créer des goulots d'étranglement : toutes les liaisons entre deux couches voisines
+      tirées au hasard voient leur capacité réduite (`goulots`, `facteur_goulot`).
+
+Le même jeu de paramètres et la même graine donnent toujours le même réseau. Le module
+fournit :
+    - generer_tableaux(...) : le réseau sous forme de tableaux NumPy (sans objets),
+    - generer_compact(...) : un `ReseauCompact`, pour les très grands réseaux,
+    - generer_reseau(...) : un `GestionReseau` (listes de `Noeud` et `Liaison`),
+    - parametres_echelle(nb_noeuds) : paramètres d'un réseau d'environ `nb_noeuds` nœuds,
+    - ecrire_reseau(...) : écriture dans un format de sauvegarde (JSON, SQLite, binaire).
+
+Utilisation :
+-------------
+    ```bash
+    uv run src/generateur.py --noeuds 100000 --graine 3 --sortie reseaux_test.db
+    ```
+"""
+
+import argparse
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data import GestionReseau, Liaison, Noeud, ReseauCompact
+from stockage import est_base_sqlite
+
+LOIS = ("uniforme", "lognormale")
+
+
+def _tirer_capacites(
+    rng: np.random.Generator, taille: int, bornes: Tuple[int, int], loi: str
+) -> np.ndarray:
+    """Capacités entières dans [bornes[0], bornes[1]] selon la loi demandée."""
+    bas, haut = bornes
+    if loi == "uniforme":
+        return rng.integers(bas, haut + 1, size=taille, dtype=np.int64)
+    # Log-normale de médiane la moyenne géométrique des bornes
+    mediane = np.sqrt(bas * haut)
+    valeurs = rng.lognormal(np.log(mediane), 0.5, size=taille)
+    return np.clip(np.rint(valeurs), bas, haut).astype(np.int64)
+
+
+def _liaisons_entre(
+    rng: np.random.Generator, amont: range, aval: range, fan_out: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Liaisons de la couche `amont` vers la couche `aval` : `fan_out` par nœud amont,
+    plus une liaison vers chaque nœud aval ; les doublons sont retirés.
+    """
+    departs = np.concatenate(
+        (
+            np.repeat(np.arange(amont.start, amont.stop), fan_out),
+            rng.integers(amont.start, amont.stop, size=len(aval)),
+        )
+    )
+    arrivees = np.concatenate(
+        (
+            rng.integers(aval.start, aval.stop, size=len(amont) * fan_out),
+            np.arange(aval.start, aval.stop),
+        )
+    )
+    _, premiers = np.unique(departs * aval.stop + arrivees, return_index=True)
+    premiers.sort()
+    return departs[premiers], arrivees[premiers]
+
+
+def generer_tableaux(
+    nb_sources: int = 4,
+    nb_villes: int = 3,
+    couches: Sequence[int] = (5, 5),
+    fan_out: int = 2,
+    capacites_liaisons: Tuple[int, int] = (5, 30),
+    capacites_sources: Tuple[int, int] = (10, 50),
+    capacites_villes: Tuple[int, int] = (10, 40),
+    loi: str = "uniforme",
+    redondance: float = 0.0,
+    goulots: int = 0,
+    facteur_goulot: float = 0.2,
+    graine: Optional[int] = 0,
+) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Génère un réseau en couches sous forme de tableaux.
+
+    Args:
+        nb_sources, nb_villes: Nombre de sources et de villes (>= 1).
+        couches: Nombre de nœuds intermédiaires de chaque couche.
+        fan_out: Nombre de liaisons partant de chaque nœud vers la couche suivante.
+        capacites_liaisons, capacites_sources, capacites_villes: Bornes (incluses)
+            des capacités tirées.
+        loi: Loi des capacités, "uniforme" ou "lognormale".
+        redondance: Nombre de liaisons supplémentaires sautant une couche, en proportion
+            des liaisons entre couches voisines.
+        goulots: Nombre de frontières entre couches dont les liaisons sont affaiblies.
+        facteur_goulot: Facteur appliqué aux capacités des liaisons d'un goulot.
+        graine: Graine du générateur aléatoire.
+
+    Returns:
+        Tuple (noms, types, capacites_noeuds, departs, arrivees, capacites), les types
+        étant codés comme dans `ReseauCompact.TYPES`.
+
+    Raises: ValueError: si un paramètre est invalide.
+    """
+    if nb_sources < 1 or nb_villes < 1 or fan_out < 1:
+        raise ValueError("❌ Il faut au moins une source, une ville et fan_out >= 1.")
+    if any(largeur < 1 for largeur in couches):
+        raise ValueError("❌ Chaque couche doit contenir au moins un nœud.")
+    if loi not in LOIS:
+        raise ValueError(f"❌ Loi inconnue : '{loi}'. Choisir parmi {LOIS}.")
+    if not 0 <= goulots <= len(couches) + 1:
+        raise ValueError("❌ Nombre de goulots supérieur au nombre de frontières.")
+    for bas, haut in (capacites_liaisons, capacites_sources, capacites_villes):
+        if not 1 <= bas <= haut:
+            raise ValueError("❌ Bornes de capacité invalides.")
+
+    rng = np.random.default_rng(graine)
+    largeurs = [nb_sources, *couches, nb_villes]
+    debuts = np.concatenate(([0], np.cumsum(largeurs)))
+    plages = [range(d, f) for d, f in zip(debuts[:-1].tolist(), debuts[1:].tolist())]
+
+    noms = [f"S{i}" for i in range(nb_sources)]
+    for k, largeur in enumerate(couches, 1):
+        noms += [f"I{k}_{i}" for i in range(largeur)]
+    noms += [f"V{i}" for i in range(nb_villes)]
+    codes = {t: c for c, t in enumerate(ReseauCompact.TYPES)}
+    types = np.full(len(noms), codes["intermediaire"], dtype=np.int8)
+    types[plages[0].start : plages[0].stop] = codes["source"]
+    types[plages[-1].start : plages[-1].stop] = codes["ville"]
+    capacites_noeuds = np.zeros(len(noms), dtype=np.int64)
+    capacites_noeuds[:nb_sources] = _tirer_capacites(
+        rng, nb_sources, capacites_sources, loi
+    )
+    capacites_noeuds[-nb_villes:] = _tirer_capacites(
+        rng, nb_villes, capacites_villes, loi
+    )
+
+    departs, arrivees, capacites = [], [], []
+    for amont, aval in zip(plages[:-1], plages[1:]):
+        d, a = _liaisons_entre(rng, amont, aval, fan_out)
+        departs.append(d)
+        arrivees.append(a)
+        capacites.append(_tirer_capacites(rng, len(d), capacites_liaisons, loi))
+
+    for k in rng.choice(len(plages) - 1, size=goulots, replace=False).tolist():
+        capacites[k] = np.maximum(1, (capacites[k] * facteur_goulot).astype(np.int64))
+
+    nb_voisines = sum(len(d) for d in departs)
+    nb_redondantes = int(round(redondance * nb_voisines)) if len(plages) > 2 else 0
+    if nb_redondantes:
+        k = rng.integers(0, len(plages) - 2, size=nb_redondantes)
+        tirage = rng.random((2, nb_redondantes))
+        debut, largeur = debuts[k], np.asarray(largeurs)[k]
+        departs.append(debut + (tirage[0] * largeur).astype(np.int64))
+        debut, largeur = debuts[k + 2], np.asarray(largeurs)[k + 2]
+        arrivees.append(debut + (tirage[1] * largeur).astype(np.int64))
+        capacites.append(_tirer_capacites(rng, nb_redondantes, capacites_liaisons, loi))
+
+    departs, arrivees = np.concatenate(departs), np.concatenate(arrivees)
+    capacites = np.concatenate(capacites)
+    _, premiers = np.unique(departs * len(noms) + arrivees, return_index=True)
+    premiers.sort()
+    return (
+        noms,
+        types,
+        capacites_noeuds,
+        departs[premiers].astype(np.int32),
+        arrivees[premiers].astype(np.int32),
+        capacites[premiers],
+    )
+
+
+def generer_compact(**parametres) -> ReseauCompact:
+    """Génère un réseau (voir `generer_tableaux`) sous forme de `ReseauCompact`."""
+    return ReseauCompact(*generer_tableaux(**parametres))
+
+
+def generer_reseau(**parametres) -> GestionReseau:
+    """
+    Génère un réseau (voir `generer_tableaux`) sous forme de `GestionReseau`, les
+    liaisons étant rangées couche par couche.
+    """
+    noms, types, capacites_noeuds, departs, arrivees, capacites = generer_tableaux(
+        **parametres
+    )
+    noeuds = [
+        Noeud(nom, ReseauCompact.TYPES[code], cap)
+        for nom, code, cap in zip(noms, types.tolist(), capacites_noeuds.tolist())
+    ]
+    liaisons = [
+        Liaison(noms[d], noms[a], cap)
+        for d, a, cap in zip(departs.tolist(), arrivees.tolist(), capacites.tolist())
+    ]
+    return GestionReseau(noeuds, liaisons)
+
+
+def parametres_echelle(nb_noeuds: int, fan_out: int = 3) -> dict:
+    """
+    Paramètres d'un réseau d'environ `nb_noeuds` nœuds : 2 % de sources, 5 % de villes,
+    intermédiaires répartis en couches carrées (autant de couches que de nœuds par
+    couche).
+    """
+    nb_sources = max(2, nb_noeuds // 50)
+    nb_villes = max(2, nb_noeuds // 20)
+    nb_inter = max(1, nb_noeuds - nb_sources - nb_villes)
+    largeur = max(1, int(np.sqrt(nb_inter)))
+    couches = [largeur] * (nb_inter // largeur)
+    if nb_inter % largeur:
+        couches.append(nb_inter % largeur)
+    return {
+        "nb_sources": nb_sources,
+        "nb_villes": nb_villes,
+        "couches": couches,
+        "fan_out": fan_out,
+    }
+
+
+def ecrire_reseau(destination: str, reseau_nom: str = "genere", **parametres) -> None:
+    """
+    Génère un réseau et l'écrit dans `destination` : fichier JSON (.json) ou base SQLite
+    (.db, .sqlite) via `GestionReseau.sauvegarder_reseaux`, sinon dossier au format
+    binaire de `ReseauCompact` (sans créer d'objets Python par nœud ou liaison).
+    """
+    if est_base_sqlite(destination) or destination.lower().endswith(".json"):
+        gestion = generer_reseau(**parametres)
+        GestionReseau.sauvegarder_reseaux(
+            gestion.ListeNoeuds, gestion.ListeLiaisons, destination, reseau_nom
+        )
+    else:
+        generer_compact(**parametres).enregistrer(destination)
+
+
+def main(arguments=None) -> None:
+    parser = argparse.ArgumentParser(description="Génère un réseau synthétique.")
+    parser.add_argument("--noeuds", type=int, default=1000)
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--loi", choices=LOIS, default="uniforme")
+    parser.add_argument("--redondance", type=float, default=0.0)
+    parser.add_argument("--goulots", type=int, default=0)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--nom", default="genere")
+    parser.add_argument("--sortie", required=True)
+    args = parser.parse_args(arguments)
+
+    ecrire_reseau(
+        args.sortie,
+        args.nom,
+        **parametres_echelle(args.noeuds, args.fan_out),
+        loi=args.loi,
+        redondance=args.redondance,
+        goulots=args.goulots,
+        graine=args.graine,
+    )
+    print(f"✅ Réseau écrit dans {os.path.abspath(args.sortie)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+instrumentation.py – Compteurs et chronomètres des points chauds du calcul de flot.
+
+L'instrumentation est désactivée par défaut : chaque point de mesure se réduit alors à
+la lecture d'une variable globale. Elle est activée le temps d'un bloc `with` :
+
+    >>> with instrumenter() as stats:
+    ...     satisfaction(noeuds, liaisons)
+    >>> stats.compteurs["flot_maximal"]
+    >>> print(stats.rapport())
+
+Sont relevés :
+    - compteurs : nombre de réseaux construits, de calculs complets de flot, de mises à
+      jour à chaud, de scénarios évalués...,
+    - temps par phase (construction de la matrice, résolution, extraction du résultat,
+      mises à jour à chaud...) et nombre de passages dans chaque phase,
+    - tailles des matrices résolues (nombre de nœuds et d'arêtes).
+
+Avec `instrumenter(profileur=True)`, le bloc est en outre profilé par pyinstrument
+(dépendance de développement) ; le profil est disponible dans `stats.profil`.
+
+Seuls les calculs exécutés dans le processus courant sont comptés : les calculs répartis
+sur plusieurs processus (`n_jobs > 1`) ne le sont pas.
+"""
+
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+_ACTIVES = []
+_NUL = nullcontext()
+
+
+class Statistiques:
+    """
+    Mesures relevées pendant un bloc `instrumenter()`.
+
+    Attributs :
+        compteurs (Counter) : Nombre d'occurrences de chaque événement.
+        temps (Dict[str, float]) : Temps cumulé (s) de chaque phase.
+        passages (Counter) : Nombre de passages dans chaque phase.
+        matrices (Dict[str, int]) : Nombre de matrices résolues, plus grandes
+            dimensions rencontrées (noeuds_max, aretes_max) et arêtes cumulées.
+        profil : Profil pyinstrument (`pyinstrument.Profiler`) si demandé, sinon None.
+    """
+
+    def __init__(self) -> None:
+        self.compteurs = Counter()
+        self.temps: Dict[str, float] = defaultdict(float)
+        self.passages = Counter()
+        self.matrices = {"nombre": 0, "noeuds_max": 0, "aretes_max": 0, "aretes": 0}
+        self.profil = None
+
+    def resume(self) -> dict:
+        """Mesures sous forme de dictionnaire (sérialisable en JSON)."""
+        return {
+            "compteurs": dict(self.compteurs),
+            "temps_s": dict(self.temps),
+            "passages": dict(self.passages),
+            "matrices": dict(self.matrices),
+        }
+
+    def rapport(self) -> str:
+        """Rapport lisible : compteurs puis phases triées par temps décroissant."""
+        lignes = ["=== Instrumentation ==="]
+        lignes += [f"{nom:<24} {n:>10}" for nom, n in sorted(self.compteurs.items())]
+        for phase, duree in sorted(self.temps.items(), key=lambda p: -p[1]):
+            lignes.append(
+                f"{phase:<24} {duree:>9.4f} s ({self.passages[phase]} passages)"
+            )
+        m = self.matrices
+        lignes.append(
+            f"matrices résolues : {m['nombre']} (max {m['noeuds_max']} nœuds, "
+            f"{m['aretes_max']} arêtes)"
+        )
+        return "\n".join(lignes)
+
+
+@contextmanager
+def instrumenter(profileur: bool = False):
+    """
+    Active l'instrumentation pendant le bloc et fournit l'objet `Statistiques`.
+
+    Les blocs peuvent être imbriqués : chaque bloc actif reçoit les mesures.
+
+    Args:
+        profileur (bool): Profile aussi le bloc avec pyinstrument.
+
+    Raises: ImportError: si `profileur` est demandé et que pyinstrument n'est pas installé.
+    """
+    stats = Statistiques()
+    if profileur:
+        from pyinstrument import Profiler
+
+        stats.profil = Profiler()
+        stats.profil.start()
+    _ACTIVES.append(stats)
+    try:
+        yield stats
+    finally:
+        _ACTIVES.remove(stats)
+        if stats.profil is not None:
+            stats.profil.stop()
+
+
+def compter(evenement: str, n: int = 1) -> None:
+    """Ajoute `n` occurrences de `evenement` (sans effet si l'instrumentation est inactive)."""
+    if not _ACTIVES:
+        return
+    for stats in _ACTIVES:
+        stats.compteurs[evenement] += n
+
+
+@contextmanager
+def _chronometre(phase: str):
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        duree = time.perf_counter() - debut
+        for stats in _ACTIVES:
+            stats.temps[phase] += duree
+            stats.passages[phase] += 1
+
+
+def mesurer(phase: str):
+    """
+    Contexte chronométrant une phase. Instrumentation inactive : contexte vide partagé,
+    sans chronométrage.
+    """
+    if not _ACTIVES:
+        return _NUL
+    return _chronometre(phase)
+
+
+def noter_matrice(nb_noeuds: int, nb_aretes: int) -> None:
+    """Enregistre la taille d'une matrice résolue."""
+    if not _ACTIVES:
+        return
+    for stats in _ACTIVES:
+        m = stats.matrices
+        m["nombre"] += 1
+        m["aretes"] += nb_aretes
+        m["noeuds_max"] = max(m["noeuds_max"], nb_noeuds)
+        m["aretes_max"] = max(m["aretes_max"], nb_aretes)
+
+
+def actif() -> Optional[Statistiques]:
+    """Statistiques du bloc `instrumenter()` le plus interne, ou None."""
+    return _ACTIVES[-1] if _ACTIVES else None
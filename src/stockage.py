@@ -0,0 +1,343 @@
+"""
+stockage.py – Stockage des réseaux sauvegardés, un enregistrement par réseau.
+
+Le fichier `reseaux.json` regroupe tous les réseaux dans un seul document : sauvegarder
+un réseau impose de relire et de réécrire tous les autres. Ce module range chaque réseau
+dans sa propre ligne d'une base SQLite, de sorte que :
+    - sauvegarder ou charger un réseau ne coûte que la taille de ce réseau,
+    - lister les réseaux ne lit que leurs métadonnées (nom, nombre de nœuds et de
+      liaisons, empreinte), jamais leur contenu.
+
+Comme `moteurs.py`, ce module ne manipule aucun objet `Noeud` ou `Liaison` : un réseau y
+est décrit par le même dictionnaire que dans `reseaux.json`
+({"noeuds": [...], "liaisons": [...]}). Il fournit :
+    - StockageSQLite : base de réseaux (enregistrer, lire, supprimer, noms),
+    - importer_json / exporter_json : conversion depuis et vers le format `reseaux.json`,
+    - est_base_sqlite(...) : choix du format d'après l'extension du fichier,
+    - catalogue(...) / lire_reseau(...) : liste des réseaux d'un fichier (JSON ou SQLite)
+      sans instancier leur contenu, mise en cache selon la date de modification du
+      fichier, et lecture d'un seul réseau,
+    - ecrire_tableaux / ouvrir_tableaux : format binaire d'un réseau (un dossier de
+      fichiers .npy ouverts en mémoire projetée, sans décodage).
+
+Il est utilisé par `GestionReseau` (data.py) lorsque le fichier de sauvegarde porte une
+extension `.db`, `.sqlite` ou `.sqlite3`.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+EXTENSIONS_SQLITE = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reseaux (
+    nom TEXT PRIMARY KEY,
+    nb_noeuds INTEGER NOT NULL,
+    nb_liaisons INTEGER NOT NULL,
+    empreinte TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contenus (
+    nom TEXT PRIMARY KEY,
+    donnees TEXT NOT NULL
+);
+"""
+
+
+def est_base_sqlite(fichier: str) -> bool:
+    """Indique si `fichier` désigne une base SQLite (d'après son extension)."""
+    return os.path.splitext(str(fichier))[1].lower() in EXTENSIONS_SQLITE
+
+
+def serialiser(contenu: Dict) -> str:
+    """Forme compacte (sans espaces) du dictionnaire d'un réseau."""
+    return json.dumps(contenu, separators=(",", ":"))
+
+
+def empreinte(donnees: str) -> str:
+    """Empreinte SHA-256 de la forme sérialisée d'un réseau."""
+    return hashlib.sha256(donnees.encode("utf-8")).hexdigest()
+
+
+class StockageSQLite:
+    """
+    Base SQLite de réseaux hydrauliques, un enregistrement par réseau.
+
+    Les métadonnées (table `reseaux`) et le contenu JSON (table `contenus`) sont rangés
+    séparément : lister les réseaux ne lit jamais leur contenu.
+
+    Args:
+        chemin: Chemin de la base (créée si elle n'existe pas).
+
+    Exemple d'utilisation :
+
+        >>> with StockageSQLite("reseaux.db") as base:
+        ...     base.enregistrer("reseau_1", {"noeuds": [...], "liaisons": [...]})
+        ...     contenu = base.lire("reseau_1")
+    """
+
+    def __init__(self, chemin: str) -> None:
+        self.chemin = str(chemin)
+        self._connexion = sqlite3.connect(self.chemin)
+        self._connexion.executescript(_SCHEMA)
+
+    def __enter__(self) -> "StockageSQLite":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    def fermer(self) -> None:
+        self._connexion.close()
+
+    def __contains__(self, nom: str) -> bool:
+        requete = "SELECT 1 FROM reseaux WHERE nom = ?"
+        return self._connexion.execute(requete, (nom,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connexion.execute("SELECT COUNT(*) FROM reseaux").fetchone()[0]
+
+    def catalogue(self) -> Dict[str, Dict]:
+        """Métadonnées de chaque réseau (nb_noeuds, nb_liaisons, empreinte)."""
+        requete = (
+            "SELECT nom, nb_noeuds, nb_liaisons, empreinte FROM reseaux ORDER BY rowid"
+        )
+        return {
+            nom: {"nb_noeuds": nb_noeuds, "nb_liaisons": nb_liaisons, "empreinte": emp}
+            for nom, nb_noeuds, nb_liaisons, emp in self._connexion.execute(requete)
+        }
+
+    def noms(self) -> List[str]:
+        """Noms des réseaux enregistrés, dans l'ordre de leur premier enregistrement."""
+        requete = "SELECT nom FROM reseaux ORDER BY rowid"
+        return [nom for (nom,) in self._connexion.execute(requete)]
+
+    def enregistrer(self, nom: str, contenu: Dict) -> None:
+        """Enregistre (ou remplace) le réseau `nom` sans toucher aux autres réseaux."""
+        self.enregistrer_plusieurs({nom: contenu})
+
+    def enregistrer_plusieurs(self, reseaux: Dict[str, Dict]) -> None:
+        """Enregistre plusieurs réseaux en une seule transaction."""
+        with self._connexion:
+            for nom, contenu in reseaux.items():
+                donnees = serialiser(contenu)
+                self._connexion.execute(
+                    "INSERT INTO reseaux (nom, nb_noeuds, nb_liaisons, empreinte) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(nom) DO UPDATE SET "
+                    "nb_noeuds = excluded.nb_noeuds, "
+                    "nb_liaisons = excluded.nb_liaisons, "
+                    "empreinte = excluded.empreinte",
+                    (
+                        nom,
+                        len(contenu.get("noeuds", [])),
+                        len(contenu.get("liaisons", [])),
+                        empreinte(donnees),
+                    ),
+                )
+                self._connexion.execute(
+                    "INSERT OR REPLACE INTO contenus (nom, donnees) VALUES (?, ?)",
+                    (nom, donnees),
+                )
+
+    def lire(self, nom: str) -> Dict:
+        """
+        Contenu du réseau `nom` ({"noeuds": [...], "liaisons": [...]}).
+
+        Raises: KeyError: si aucun réseau de ce nom n'est enregistré.
+        """
+        requete = "SELECT donnees FROM contenus WHERE nom = ?"
+        ligne = self._connexion.execute(requete, (nom,)).fetchone()
+        if ligne is None:
+            raise KeyError(nom)
+        return json.loads(ligne[0])
+
+    def supprimer(self, nom: str) -> None:
+        """Supprime le réseau `nom` (sans effet s'il n'existe pas)."""
+        with self._connexion:
+            self._connexion.execute("DELETE FROM reseaux WHERE nom = ?", (nom,))
+            self._connexion.execute("DELETE FROM contenus WHERE nom = ?", (nom,))
+
+
+def importer_json(fichier_json: str, base: StockageSQLite) -> List[str]:
+    """
+    Importe dans `base` tous les réseaux d'un fichier au format `reseaux.json`.
+
+    Returns: les noms des réseaux importés.
+    """
+    with open(fichier_json, 'r', encoding="utf-8") as f:
+        data = json.load(f)
+    base.enregistrer_plusieurs(data)
+    return list(data)
+
+
+def exporter_json(base: StockageSQLite, fichier_json: str) -> None:
+    """Écrit tous les réseaux de `base` dans un fichier au format `reseaux.json`."""
+    data = {nom: base.lire(nom) for nom in base.noms()}
+    with open(fichier_json, 'w', encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+
+
+_ESPACES = re.compile(r"\s*")
+_CATALOGUES: Dict[str, Tuple[Tuple[int, int], Dict[str, Dict]]] = {}
+
+
+def indexer_json(fichier_json: str) -> Dict[str, Dict]:
+    """
+    Catalogue d'un fichier au format `reseaux.json`.
+
+    Le fichier est parcouru réseau par réseau : un seul réseau est décodé à la fois, et
+    la position (en octets) de chacun est relevée pour que `lire_reseau` puisse ensuite
+    relire ce réseau seul.
+
+    Returns: {nom: {"nb_noeuds", "nb_liaisons", "empreinte", "debut", "fin"}}.
+    """
+    # newline="" : les fins de ligne CRLF sont conservées, sans quoi les positions en
+    # octets ne correspondraient plus au fichier.
+    with open(fichier_json, 'r', encoding="utf-8", newline="") as f:
+        texte = f.read()
+
+    decodeur = json.JSONDecoder()
+    catalogue = {}
+    i = _ESPACES.match(texte).end()
+    if texte[i : i + 1] != "{":
+        raise ValueError(f"{fichier_json} : un objet JSON est attendu.")
+    i = _ESPACES.match(texte, i + 1).end()
+    octets, lu = 0, 0
+    while texte[i : i + 1] != "}":
+        nom, i = decodeur.raw_decode(texte, i)
+        i = _ESPACES.match(texte, i).end()
+        if texte[i : i + 1] != ":":
+            raise ValueError(f"{fichier_json} : ':' attendu à la position {i}.")
+        debut = _ESPACES.match(texte, i + 1).end()
+        contenu, fin = decodeur.raw_decode(texte, debut)
+
+        # Positions en caractères -> positions en octets (UTF-8)
+        octets += len(texte[lu:debut].encode("utf-8"))
+        taille = len(texte[debut:fin].encode("utf-8"))
+        catalogue[nom] = {
+            "nb_noeuds": len(contenu.get("noeuds", [])),
+            "nb_liaisons": len(contenu.get("liaisons", [])),
+            "empreinte": empreinte(serialiser(contenu)),
+            "debut": octets,
+            "fin": octets + taille,
+        }
+        octets, lu = octets + taille, fin
+
+        i = _ESPACES.match(texte, fin).end()
+        if texte[i : i + 1] == ",":
+            i = _ESPACES.match(texte, i + 1).end()
+        elif texte[i : i + 1] != "}":
+            raise ValueError(f"{fichier_json} : ',' ou '}}' attendu à la position {i}.")
+    return catalogue
+
+
+def catalogue(fichier: str) -> Dict[str, Dict]:
+    """
+    Catalogue des réseaux d'un fichier JSON ou d'une base SQLite : pour chaque nom,
+    nombre de nœuds, nombre de liaisons et empreinte du contenu.
+
+    Le résultat est mis en cache et n'est recalculé que si la date de modification
+    ou la taille du fichier change.
+
+    Raises: FileNotFoundError: si le fichier n'existe pas.
+    """
+    if not os.path.exists(fichier):
+        raise FileNotFoundError(f"Fichier {fichier} non trouvé.")
+    chemin = os.path.abspath(fichier)
+    etat = os.stat(chemin)
+    version = (etat.st_mtime_ns, etat.st_size)
+    en_cache = _CATALOGUES.get(chemin)
+    if en_cache is not None and en_cache[0] == version:
+        return en_cache[1]
+
+    if est_base_sqlite(chemin):
+        with StockageSQLite(chemin) as base:
+            resultat = base.catalogue()
+    else:
+        resultat = indexer_json(chemin)
+    _CATALOGUES[chemin] = (version, resultat)
+    return resultat
+
+
+def lire_reseau(fichier: str, nom: str) -> Dict:
+    """
+    Contenu d'un seul réseau d'un fichier JSON ou d'une base SQLite.
+
+    Pour un fichier JSON, seuls les octets de ce réseau (repérés par `catalogue`)
+    sont relus et décodés.
+
+    Raises:
+        FileNotFoundError: si le fichier n'existe pas.
+        KeyError: si le réseau n'existe pas dans ce fichier.
+    """
+    entrees = catalogue(fichier)
+    if nom not in entrees:
+        raise KeyError(nom)
+    if est_base_sqlite(fichier):
+        with StockageSQLite(fichier) as base:
+            return base.lire(nom)
+    entree = entrees[nom]
+    with open(fichier, 'rb') as f:
+        f.seek(entree["debut"])
+        return json.loads(f.read(entree["fin"] - entree["debut"]).decode("utf-8"))
+
+
+FORMAT_BINAIRE = "reseau-compact"
+VERSION_BINAIRE = 1
+_ENTETE = "format.json"
+
+
+def ecrire_tableaux(dossier: str, tableaux: Dict[str, np.ndarray], **entete) -> None:
+    """
+    Écrit un réseau au format binaire : un fichier `<nom>.npy` par tableau et un
+    fichier `format.json` (format, version et champs de `entete`).
+
+    L'en-tête est écrit en dernier : un dossier sans `format.json` est incomplet.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    chemin_entete = os.path.join(dossier, _ENTETE)
+    if os.path.exists(chemin_entete):
+        os.remove(chemin_entete)
+    for nom, tableau in tableaux.items():
+        np.save(os.path.join(dossier, f"{nom}.npy"), np.ascontiguousarray(tableau))
+    entete = {
+        "format": FORMAT_BINAIRE,
+        "version": VERSION_BINAIRE,
+        "tableaux": sorted(tableaux),
+        **entete,
+    }
+    with open(chemin_entete, 'w') as f:
+        json.dump(entete, f, indent=4)
+
+
+def ouvrir_tableaux(dossier: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """
+    Ouvre un réseau écrit par `ecrire_tableaux`. Les tableaux sont projetés en mémoire
+    (`numpy.memmap`, lecture seule) : rien n'est lu avant d'être utilisé.
+
+    Returns: Tuple (en-tête, {nom: tableau}).
+
+    Raises:
+        FileNotFoundError: si le dossier ne contient pas de réseau binaire complet.
+        ValueError: si le format ou la version ne sont pas reconnus.
+    """
+    chemin_entete = os.path.join(dossier, _ENTETE)
+    if not os.path.exists(chemin_entete):
+        raise FileNotFoundError(f"Réseau binaire {dossier} non trouvé.")
+    with open(chemin_entete, 'r') as f:
+        entete = json.load(f)
+    if (
+        entete.get("format") != FORMAT_BINAIRE
+        or entete.get("version") != VERSION_BINAIRE
+    ):
+        raise ValueError(f"{dossier} : format binaire non reconnu.")
+    tableaux = {
+        nom: np.load(os.path.join(dossier, f"{nom}.npy"), mmap_mode="r")
+        for nom in entete["tableaux"]
+    }
+    return entete, tableaux
@@ -0,0 +1,16 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+)
+from cache import CACHE_FLOTS
+
+
+@pytest.fixture(autouse=True)
+def cache_flots_vide():
+    """Chaque test part d'un cache de flots vide (les moteurs peuvent être simulés)."""
+    CACHE_FLOTS.vider()
+    yield
+    CACHE_FLOTS.vider()
@@ -202,3 +202,28 @@ def test_couverture_boucles(monkeypatch, montrer_saturees, with_result):
         edge_labels_texts = [t.get_text() for t in ax.texts if t.get_text().isdigit()]
         assert any("10" == label for label in edge_labels_texts)
         assert any("5" == label for label in edge_labels_texts)
+
+
+def test_afficherCarte_avec_resultat_flot():
+    noeuds = [
+        Noeud("A", "source", 10),
+        Noeud("B", "ville", 5),
+        Noeud("C", "intermediaire"),
+    ]
+    liaisons = [Liaison("A", "C", 10), Liaison("C", "B", 5)]
+    result, index_noeuds = ReseauHydraulique(
+        noeuds, liaisons, verbeux=False
+    ).calculerFlotMaximal()
+    fig = afficherCarte(
+        result=result,
+        index_noeuds=index_noeuds,
+        noeuds=noeuds,
+        liaisons=liaisons,
+        montrer_saturees=True,
+    )
+    texts = [t.get_text() for t in fig.axes[0].texts]
+    assert "A\n(5 u.)" in texts
+    assert "B\n(5 u.)" in texts
+    assert "5 / 10" in texts
+    assert "5 / 5" in texts
+    plt.close(fig)
@@ -0,0 +1,53 @@
+import sys
+import os
+import json
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+)
+from benchmark import comparer, executer, main, reseau_echelle
+
+
+def test_executer_demo_json():
+    resultats = executer(["demo"], ["init", "flot_maximal", "satisfaction"], 1)
+    json.dumps(resultats)
+    mesures = {r["cas"]: r for r in resultats["resultats"]}
+    assert set(mesures) == {"init", "flot_maximal", "satisfaction"}
+    assert mesures["flot_maximal"]["appels_flot"] == 1
+    assert mesures["init"]["appels_flot"] == 0
+    assert all(r["temps_s"] > 0 and r["memoire_pic_o"] > 0 for r in mesures.values())
+    assert mesures["init"]["nb_noeuds"] == 12
+
+
+def test_cas_limite_par_taille():
+    resultats = executer(["1e3"], ["afficherCarte"], 1)
+    assert resultats["resultats"] == []
+    noeuds, liaisons = reseau_echelle("1e3")
+    assert 900 <= len(noeuds) <= 1100 and len(liaisons) > len(noeuds)
+
+
+def test_comparaison_reference(tmp_path):
+    reference = {
+        "resultats": [
+            {
+                "cas": "init",
+                "echelle": "demo",
+                "temps_s": 1.0,
+                "memoire_pic_o": 100,
+                "appels_flot": 0,
+            }
+        ]
+    }
+    resultats = {"resultats": [dict(reference["resultats"][0], temps_s=1.5)]}
+    (comparaison,) = comparer(resultats, reference)
+    assert comparaison["regression"] and comparaison["rapport_temps"] == 1.5
+    assert not comparer(resultats, reference, tolerance=0.6)[0]["regression"]
+
+    fichier = tmp_path / "reference.json"
+    assert main(["--echelles", "demo", "--cas", "init", "--sortie", str(fichier)]) == 0
+    assert json.loads(fichier.read_text())["resultats"][0]["cas"] == "init"
+    lent = json.loads(fichier.read_text())
+    lent["resultats"][0]["temps_s"] = 1e-9
+    fichier.write_text(json.dumps(lent))
+    code = main(["--echelles", "demo", "--cas", "init", "--reference", str(fichier)])
+    assert code == 1
@@ -0,0 +1,143 @@
+import sys
+import os
+import subprocess
+import numpy as np
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+)
+from cache import CACHE_FLOTS, CacheDisque, CacheFlots, empreinte_flot
+from data import Liaison, Noeud, ReseauCompact, ReseauHydraulique
+from instrumentation import instrumenter
+
+
+def _reseau(capacite=5):
+    noeuds = [
+        Noeud("S", "source", 20),
+        Noeud("I", "intermediaire"),
+        Noeud("V", "ville", 15),
+    ]
+    return noeuds, [Liaison("S", "I", capacite), Liaison("I", "V", 10)]
+
+
+def test_reseau_identique_repris_du_cache():
+    with instrumenter() as stats:
+        premier = ReseauHydraulique(*_reseau())
+        result_1, _ = premier.calculerFlotMaximal()
+        second = ReseauHydraulique(*_reseau())
+        result_2, _ = second.calculerFlotMaximal()
+        ReseauHydraulique(*_reseau(capacite=7)).calculerFlotMaximal()
+    assert stats.compteurs["flot_maximal"] == 2
+    assert stats.compteurs["cache_succes"] == 1
+    assert result_1.flow_value == result_2.flow_value == 5
+    assert result_2.moteur == result_1.moteur
+    assert np.array_equal(result_1.flux, result_2.flux)
+
+    # Une mise à jour à chaud ne modifie pas l'entrée du cache
+    assert second.augmenter_capacite("S", "I", 8) == 8
+    result_3, _ = ReseauHydraulique(*_reseau()).calculerFlotMaximal()
+    assert result_3.flow_value == 5
+    assert CACHE_FLOTS.statistiques()["entrees"] == 2
+
+    # Sans cache, ou avec un autre moteur, le flot est recalculé
+    with instrumenter() as stats:
+        ReseauHydraulique(*_reseau(), cache=None).calculerFlotMaximal()
+        autre = next(m for m in ("dinic", "edmonds_karp") if m != result_1.moteur)
+        ReseauHydraulique(*_reseau(), moteur=autre).calculerFlotMaximal()
+    assert stats.compteurs["flot_maximal"] == 2
+
+
+def test_eviction_lru_par_nombre_et_par_taille():
+    cache = CacheFlots(max_entrees=2)
+    flux = np.arange(10, dtype=np.int64)
+    cache.ecrire("a", 1, flux, "dinic")
+    cache.ecrire("b", 2, flux, "dinic")
+    assert cache.lire("a")[0] == 1
+    cache.ecrire("c", 3, flux, "dinic")
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.lire("b") is None
+
+    copie = cache.lire("a")[1]
+    copie[0] = 99
+    assert cache.lire("a")[1][0] == 0
+
+    cache.configurer(max_entrees=10, max_octets=flux.nbytes)
+    assert len(cache) == 1 and "c" not in cache
+    stats = cache.statistiques()
+    assert stats["evictions"] == 2 and stats["octets"] == flux.nbytes
+    assert stats["succes"] == 3 and stats["echecs"] == 1
+
+    cache.configurer(max_entrees=0)
+    cache.ecrire("d", 4, flux, "dinic")
+    assert len(cache) == 0 and not cache.actif
+
+
+def test_reseau_compact_partage_le_cache():
+    noeuds, liaisons = _reseau()
+    compact = ReseauCompact.depuis_listes(noeuds, liaisons)
+    valeur, flux = compact.flot_maximal()
+    with instrumenter() as stats:
+        assert compact.flot_maximal()[0] == valeur
+    assert stats.compteurs == {"cache_succes": 1}
+    assert np.array_equal(compact.flot_maximal()[1], flux)
+
+
+def test_cache_disque_persistant_entre_processus(tmp_path):
+    chemin = str(tmp_path / "flots.db")
+    noeuds, liaisons = _reseau()
+    with CacheDisque(chemin) as disque:
+        reseau = ReseauHydraulique(noeuds, liaisons, cache=CacheFlots(disque=disque))
+        result, _ = reseau.calculerFlotMaximal()
+        coupe = reseau.coupe_minimale()
+        assert len(disque) == 1
+
+    # Nouvelle exécution : cache mémoire vide, résultat et coupe relus sur disque
+    with CacheDisque(chemin) as disque:
+        cache = CacheFlots(disque=disque)
+        with instrumenter() as stats:
+            relu = ReseauHydraulique(noeuds, liaisons, cache=cache)
+            result_relu, _ = relu.calculerFlotMaximal()
+        assert stats.compteurs["flot_maximal"] == 0
+        assert relu._coupe is not None and relu.coupe_minimale() == coupe
+        assert result_relu.flow_value == result.flow_value
+        assert np.array_equal(result_relu.flux, result.flux)
+        assert cache.statistiques()["disque"]["succes"] == 1
+        cle = empreinte_flot(
+            relu.matrice_sparse,
+            relu.index_noeuds["super_source"],
+            relu.index_noeuds["super_puits"],
+            relu.moteur_utilise,
+        )
+
+    # Lecture depuis un autre processus
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]); from cache import CacheDisque; "
+        "print(CacheDisque(sys.argv[2]).lire(sys.argv[3])[0])"
+    )
+    src = os.path.join(os.path.dirname(__file__), '..', 'src')
+    sortie = subprocess.run(
+        [sys.executable, "-c", script, src, chemin, cle],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert int(sortie) == result.flow_value
+
+
+def test_cache_disque_eviction_par_taille(tmp_path):
+    rng = np.random.default_rng(0)
+    flux = {c: rng.integers(0, 2**62, size=100) for c in "abc"}
+    with CacheDisque(str(tmp_path / "flots.db"), max_octets=1700) as disque:
+        disque.ecrire("a", 1, flux["a"], "dinic")
+        disque.ecrire("b", 2, flux["b"], "dinic", coupe=np.array([3, 5]))
+        assert disque.lire("a")[0] == 1
+        disque.ecrire("c", 3, flux["c"], "dinic")
+        assert "b" not in disque and "a" in disque and "c" in disque
+        valeur, relu, moteur, coupe = disque.lire("c")
+        assert valeur == 3 and moteur == "dinic" and coupe is None
+        assert np.array_equal(relu, flux["c"])
+        stats = disque.statistiques()
+        assert stats["evictions"] == 1 and stats["entrees"] == 2
+        assert stats["octets"] <= 1700
+        disque.vider()
+        assert len(disque) == 0
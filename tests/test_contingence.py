@@ -0,0 +1,148 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+)
+from contingence import analyse_contingence, analyse_n_k, libelle_element
+from data import GestionReseau, Liaison, Noeud, ReseauHydraulique
+
+RESEAUX = os.path.join(os.path.dirname(__file__), '..', 'reseaux.json')
+
+
+def _sans_element(noeuds, liaisons, element):
+    """Réseau reconstruit sans l'élément (source asséchée, liaison ou nœud retiré)."""
+    type_element, identifiant = element
+    if type_element == "source":
+        noeuds = [
+            Noeud(n.nom, n.type, 0 if n.nom == identifiant else n.capaciteMax)
+            for n in noeuds
+        ]
+    elif type_element == "liaison":
+        liaisons = [li for li in liaisons if (li.depart, li.arrivee) != identifiant]
+    else:
+        liaisons = [li for li in liaisons if identifiant not in (li.depart, li.arrivee)]
+    return ReseauHydraulique(noeuds, liaisons, cache=None).resultat_courant()
+
+
+def test_contingence_n1_egale_reconstruction():
+    noeuds, liaisons = GestionReseau.charger_reseau(RESEAUX, "Demo")
+    base = ReseauHydraulique(noeuds, liaisons).valeur_flot()
+    tableau = analyse_contingence(
+        noeuds, liaisons, elements=("source", "liaison", "intermediaire")
+    )
+    nb_sources = sum(n.type == "source" for n in noeuds)
+    nb_inter = sum(n.type == "intermediaire" for n in noeuds)
+    assert len(tableau) == nb_sources + len(liaisons) + nb_inter
+    assert [ligne["perte"] for ligne in tableau] == sorted(
+        (ligne["perte"] for ligne in tableau), reverse=True
+    )
+
+    demandes = {n.nom: n.capaciteMax for n in noeuds if n.type == "ville"}
+    for ligne in tableau:
+        (element,) = ligne["elements"]
+        attendu = _sans_element(noeuds, liaisons, element)
+        assert ligne["flot"] == attendu.flow_value, libelle_element(element)
+        assert ligne["perte"] == base - attendu.flow_value
+        # La répartition entre villes d'un flot maximal n'est pas unique
+        assert sum(ligne["deficits"].values()) == sum(demandes.values()) - ligne["flot"]
+        assert all(0 < d <= demandes[v] for v, d in ligne["deficits"].items())
+
+
+def test_contingence_niveau_et_saturations():
+    noeuds = [
+        Noeud("S1", "source", 10),
+        Noeud("S2", "source", 10),
+        Noeud("I", "intermediaire"),
+        Noeud("V", "ville", 20),
+    ]
+    liaisons = [Liaison("S1", "I", 10), Liaison("S2", "I", 10), Liaison("I", "V", 12)]
+    premiere, seconde = analyse_contingence(noeuds, liaisons)
+    assert premiere["flot"] == 10 and premiere["perte"] == 2
+    assert premiere["deficits"] == {"V": 10}
+    # Une seule source : sa liaison vers I devient saturée
+    assert len(premiere["nouvelles_saturees"]) == 1
+
+    (double,) = analyse_contingence(noeuds, liaisons, niveau=2, n_jobs=2)
+    assert double["elements"] == (("source", "S1"), ("source", "S2"))
+    assert double["flot"] == 0 and double["perte_relative"] == 1.0
+    with pytest.raises(ValueError):
+        analyse_contingence(noeuds, liaisons, niveau=0)
+    with pytest.raises(ValueError):
+        analyse_contingence(noeuds, liaisons, elements=("ville",))
+
+
+def _reseau_sources(nb_sources=8):
+    """
+    Sources reliées à deux collecteurs, puis à deux villes ; le nœud R, sans issue, ne
+    reçoit jamais de flot.
+    """
+    noeuds = [Noeud(f"S{i}", "source", 5 + 3 * i) for i in range(nb_sources)]
+    noeuds += [
+        Noeud("C1", "intermediaire"),
+        Noeud("C2", "intermediaire"),
+        Noeud("R", "intermediaire"),
+        Noeud("V1", "ville", 60),
+        Noeud("V2", "ville", 40),
+    ]
+    liaisons = [Liaison(f"S{i}", f"C{1 + i % 2}", 12) for i in range(nb_sources)]
+    liaisons += [
+        Liaison("C1", "V1", 45),
+        Liaison("C2", "V2", 40),
+        Liaison("C1", "V2", 5),
+        Liaison("C1", "R", 10),
+    ]
+    return noeuds, liaisons
+
+
+def test_n_k_enumeration_et_elagage():
+    noeuds, liaisons = _reseau_sources()
+    analyse = analyse_n_k(noeuds, liaisons, k=2, elements=("source", "liaison"))
+    tableau = analyse_contingence(
+        noeuds, liaisons, niveau=2, elements=("source", "liaison")
+    )
+    pertes = [ligne["perte"] for ligne in tableau]
+    assert analyse["methode"] == "enumeration" and analyse["pires_exactes"]
+    assert analyse["nb_combinaisons"] == len(tableau)
+    assert analyse["perte_moyenne"] == pytest.approx(sum(pertes) / len(pertes))
+    assert analyse["probabilite_perte"] == pytest.approx(
+        sum(p > 0 for p in pertes) / len(pertes)
+    )
+    # Les combinaisons sans flot (liaison C1 -> R) ne sont pas calculées
+    assert analyse["scenarios_calcules"] < len(tableau)
+    assert [ligne["perte"] for ligne in analyse["pires"]] == pertes[:20]
+
+
+def test_n_k_pires_et_echantillonnage_stratifie():
+    noeuds, liaisons = _reseau_sources(12)
+    exacte = analyse_n_k(noeuds, liaisons, k=3, elements=("source",), nb_pires=5)
+    estimee = analyse_n_k(
+        noeuds,
+        liaisons,
+        k=3,
+        elements=("source",),
+        nb_pires=5,
+        max_combinaisons=50,
+        nb_tirages=60,
+        graine=1,
+    )
+    assert estimee["methode"] == "monte_carlo" and estimee["pires_exactes"]
+    assert [ligne["perte"] for ligne in estimee["pires"]] == [
+        ligne["perte"] for ligne in exacte["pires"]
+    ]
+    bas, haut = estimee["intervalle_perte"]
+    assert bas <= exacte["perte_moyenne"] <= haut
+    assert sum(s["tirages"] for s in estimee["strates"]) <= 62
+    assert estimee == analyse_n_k(
+        noeuds,
+        liaisons,
+        k=3,
+        elements=("source",),
+        nb_pires=5,
+        max_combinaisons=50,
+        nb_tirages=60,
+        graine=1,
+    )
+    with pytest.raises(ValueError):
+        analyse_n_k(noeuds, liaisons, k=13, elements=("source",))
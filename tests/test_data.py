@@ -1,5 +1,7 @@
 import sys
 import os
+import json
+import numpy as np
 import pytest
 
 sys.path.insert(
@@ -7,11 +9,15 @@ sys.path.insert(
 )
 from data import (
     ReseauHydraulique,
+    ReseauCompact,
+    convertir_binaire_en_json,
+    convertir_json_en_binaire,
     Liaison,
     Noeud,
     creer_liaison,
     creer_noeud,
     GestionReseau,
+    ListeIndexee,
     satisfaction,
     demander_cap_max,
 )
@@ -294,6 +300,99 @@ def test_sauvegarder_et_charger_reseaux(tmp_path, noeuds_et_liaisons):
     assert noeuds_charges[0].nom == "A"
 
 
+def test_sauvegarde_sqlite_par_reseau(tmp_path, noeuds_et_liaisons):
+    from stockage import StockageSQLite, exporter_json, importer_json
+
+    base = str(tmp_path / "reseaux.db")
+    noeuds, liaisons = noeuds_et_liaisons
+    GestionReseau.sauvegarder_reseaux(noeuds, liaisons, base, "r1")
+    GestionReseau.sauvegarder_reseaux(noeuds[:1], [], base, "r2")
+    GestionReseau.sauvegarder_reseaux(noeuds, liaisons[:0], base, "r1")  # remplace
+
+    reseaux = GestionReseau.charger_reseaux(base)
+    assert list(reseaux) == ["r1", "r2"]
+    assert reseaux["r1"] == (noeuds, []) and reseaux["r2"] == (noeuds[:1], [])
+
+    # Aller-retour sans perte avec le format reseaux.json
+    fichier = tmp_path / "export.json"
+    with StockageSQLite(base) as stockage:
+        assert "r2" in stockage and len(stockage) == 2
+        exporter_json(stockage, str(fichier))
+        stockage.supprimer("r2")
+        assert stockage.noms() == ["r1"]
+        with pytest.raises(KeyError):
+            stockage.lire("r2")
+    assert GestionReseau.charger_reseaux(str(fichier)) == reseaux
+    with StockageSQLite(str(tmp_path / "copie.sqlite")) as copie:
+        assert importer_json(str(fichier), copie) == ["r1", "r2"]
+        assert copie.lire("r1") == {
+            "noeuds": [n.to_dict() for n in noeuds],
+            "liaisons": [],
+        }
+
+    GestionReseau.supprimer_reseaux(base)
+    assert not os.path.exists(base)
+
+
+def test_catalogue_et_chargement_selectif(tmp_path, monkeypatch):
+    import stockage
+
+    fichier = tmp_path / "reseaux.json"
+    fichier.write_text(
+        '{"Démo": {"noeuds": [{"nom": "É", "type": "source", "capaciteMax": 5}],\n'
+        '  "liaisons": []},\n "R2" : {"noeuds": [], "liaisons": '
+        '[{"depart": "É", "arrivee": "B", "capacite": 3}]}}',
+        encoding="utf-8",
+    )
+    base = str(tmp_path / "reseaux.db")
+    for nom, (noeuds, liaisons) in GestionReseau.charger_reseaux(str(fichier)).items():
+        GestionReseau.sauvegarder_reseaux(noeuds, liaisons, base, nom)
+
+    for source in (str(fichier), base):
+        catalogue = GestionReseau.catalogue_reseaux(source)
+        assert list(catalogue) == ["Démo", "R2"]
+        assert catalogue["R2"]["nb_noeuds"] == 0 and catalogue["R2"]["nb_liaisons"] == 1
+        noeuds, liaisons = GestionReseau.charger_reseau(source, "R2")
+        assert noeuds == [] and liaisons == [Liaison("É", "B", 3)]
+        assert GestionReseau.charger_reseau(source, "Démo")[0] == [
+            Noeud("É", "source", 5)
+        ]
+        with pytest.raises(KeyError):
+            GestionReseau.charger_reseau(source, "inconnu")
+    assert (
+        GestionReseau.catalogue_reseaux(str(fichier))["R2"]["empreinte"]
+        == GestionReseau.catalogue_reseaux(base)["R2"]["empreinte"]
+    )
+
+    # Catalogue en cache tant que le fichier n'est pas modifié
+    monkeypatch.setattr(
+        stockage, "indexer_json", lambda f: pytest.fail("catalogue non mis en cache")
+    )
+    GestionReseau.catalogue_reseaux(str(fichier))
+    monkeypatch.undo()
+    GestionReseau.sauvegarder_reseaux([], [], str(fichier), "R3")
+    assert list(GestionReseau.catalogue_reseaux(str(fichier))) == ["Démo", "R2", "R3"]
+
+
+def test_lire_reseau_fins_de_ligne_crlf(tmp_path):
+    from stockage import lire_reseau
+
+    fichier = tmp_path / "reseaux.json"
+    reseaux = {
+        "Premier": {"noeuds": [{"nom": "É", "type": "source", "capaciteMax": 5}]},
+        "Second": {"liaisons": [{"depart": "É", "arrivee": "B", "capacite": 3}]},
+    }
+    fichier.write_bytes(
+        json.dumps(reseaux, indent=4, ensure_ascii=False)
+        .replace("\n", "\r\n")
+        .encode("utf-8")
+    )
+    assert lire_reseau(str(fichier), "Second") == reseaux["Second"]
+    assert GestionReseau.charger_reseau(str(fichier), "Second")[1] == [
+        Liaison("É", "B", 3)
+    ]
+
+
 def test_supprimer_reseaux(tmp_path, noeuds_et_liaisons):
     fichier = tmp_path / "reseaux.json"
     noeuds, liaisons = noeuds_et_liaisons
@@ -367,3 +466,125 @@ def test_liaisons_saturees():
     result, _ = reseau.calculerFlotMaximal()
     saturees = reseau.liaisons_saturees(result)
     assert ("A", "B", 10) in saturees
+
+
+# Tests ReseauCompact
+
+
+def test_noeud_liaison_slots():
+    noeud, liaison = Noeud("A", "source", 10), Liaison("A", "B", 5)
+    assert not hasattr(noeud, "__dict__") and not hasattr(liaison, "__dict__")
+    with pytest.raises(AttributeError):
+        liaison.debit = 3
+
+
+def test_reseau_compact_aller_retour():
+    noeuds = [
+        Noeud("S", "source", 15),
+        Noeud("I", "intermediaire"),
+        Noeud("V", "ville", 10),
+    ]
+    liaisons = [Liaison("I", "V", 8), Liaison("S", "I", 12), Liaison("S", "V", 4)]
+    compact = ReseauCompact.depuis_listes(noeuds, liaisons)
+    assert compact.departs.dtype == np.int32 and compact.capacites.dtype == np.int64
+    assert compact.departs.tolist() == [0, 0, 1]  # ordre CSR
+    assert compact.vers_listes() == (noeuds, liaisons)
+
+    matrice = compact.matrice_csr()
+    assert np.shares_memory(matrice.data, compact.capacites)
+    assert matrice[compact.index["S"], compact.index["I"]] == 12
+
+    valeur, flux = compact.flot_maximal()
+    attendu, _ = ReseauHydraulique(noeuds, liaisons).calculerFlotMaximal(afficher=False)
+    assert valeur == attendu.flow_value == 10
+    assert (flux <= compact.capacites).all()
+    assert compact.types_noeuds("ville").tolist() == [2]
+
+
+def test_gestion_reseau_index_synchronise():
+    import copy
+
+    gestion = GestionReseau([Noeud("A", "source", 10)], [Liaison("A", "B", 5)])
+    gestion.ListeNoeuds.append(Noeud("B", "ville", 5))
+    assert gestion.noeud_existe("B") and "A" in gestion.noms_noeuds()
+    assert GestionReseau.liaison_existe("a", "b", gestion.ListeLiaisons)
+
+    gestion.ListeLiaisons.remove(Liaison("A", "B", 5))
+    assert not GestionReseau.liaison_existe("A", "B", gestion.ListeLiaisons)
+    gestion.ListeLiaisons += [Liaison("B", "A", 3)]
+    del gestion.ListeNoeuds[0]
+    assert not gestion.noeud_existe("A")
+
+    copie = copy.deepcopy(gestion)
+    assert copie.ListeLiaisons.contient(("B", "A")) and len(copie.ListeLiaisons) == 1
+    gestion.ListeLiaisons = [Liaison("C", "D", 1)]  # liste ordinaire ré-indexée
+    assert gestion.ListeLiaisons.contient(("C", "D"))
+    assert not gestion.ListeLiaisons.contient(("B", "A"))
+
+    # Clés nommées : l'index insensible à la casse ne dépend pas de l'ordre des clés
+    liaisons = ListeIndexee(
+        [Liaison("c", "d", 1)],
+        {
+            "liaison_majuscules": lambda li: (li.depart.upper(), li.arrivee.upper()),
+            "liaison": lambda li: (li.depart, li.arrivee),
+        },
+    )
+    assert liaisons.contient(("C", "D"), "liaison_majuscules")
+    assert not liaisons.contient(("C", "D"), "liaison")
+    assert GestionReseau.liaison_existe("C", "d", liaisons)
+    sans_majuscules = ListeIndexee(liaisons, {"liaison": lambda li: li.depart})
+    assert not sans_majuscules.indexe("liaison_majuscules")
+    assert GestionReseau.liaison_existe("C", "D", sans_majuscules)  # parcours linéaire
+
+
+def test_gestion_reseau_ajout_en_lot():
+    gestion = GestionReseau()
+    gestion.ajouter_noeuds(
+        [Noeud(f"N{i}", "intermediaire") for i in range(2000)]
+        + [Noeud("S", "source", 10)]
+    )
+    gestion.ajouter_liaisons(Liaison(f"N{i}", f"N{i + 1}", 5) for i in range(1999))
+    assert len(gestion.ListeLiaisons) == 1999
+    assert GestionReseau.liaison_existe("n0", "n1", gestion.ListeLiaisons)
+
+    # Doublon au sein du lot : rien n'est ajouté
+    with pytest.raises(ValueError, match="liaison existe déjà"):
+        gestion.ajouter_liaisons([Liaison("S", "N0", 5), Liaison("S", "N0", 7)])
+    assert not gestion.ListeLiaisons.contient(("S", "N0"))
+    with pytest.raises(ValueError, match="liaison existe déjà"):
+        gestion.ajouter_liaisons([Liaison("N0", "N1", 5)])
+    with pytest.raises(ValueError, match="introuvable"):
+        gestion.ajouter_liaisons([Liaison("S", "X", 5)])
+    with pytest.raises(ValueError, match="déjà utilisé"):
+        gestion.ajouter_noeuds([Noeud("V", "ville", 5), Noeud("S", "ville", 5)])
+    assert not gestion.noeud_existe("V")
+
+
+def test_format_binaire_memoire_projetee(tmp_path):
+    fichier = str(tmp_path / "reseaux.json")
+    noeuds = [
+        Noeud("SÉ", "source", 15),
+        Noeud("I", "intermediaire"),
+        Noeud("V", "ville", 10),
+    ]
+    liaisons = [Liaison("I", "V", 8), Liaison("SÉ", "I", 12), Liaison("SÉ", "V", 4)]
+    GestionReseau.sauvegarder_reseaux(noeuds, liaisons, fichier, "Demo")
+
+    dossier = str(tmp_path / "demo_bin")
+    convertir_json_en_binaire(fichier, "Demo", dossier)
+    compact = ReseauCompact.ouvrir(dossier)
+    assert isinstance(compact.capacites, np.memmap) and compact._noms is None
+    assert compact.flot_maximal()[0] == 10 and compact._noms is None
+    assert compact.index["SÉ"] == 0
+
+    convertir_binaire_en_json(dossier, fichier, "Copie")
+    reseaux = GestionReseau.charger_reseaux(fichier)
+    assert reseaux["Copie"] == reseaux["Demo"] == (noeuds, liaisons)
+
+    GestionReseau.sauvegarder_reseaux(
+        noeuds, liaisons + [Liaison("I", "V", 2)], fichier, "Doublon"
+    )
+    with pytest.raises(ValueError, match="en double"):
+        convertir_json_en_binaire(fichier, "Doublon", str(tmp_path / "doublon"))
+    with pytest.raises(FileNotFoundError):
+        ReseauCompact.ouvrir(str(tmp_path / "doublon"))
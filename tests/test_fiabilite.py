@@ -0,0 +1,95 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+)
+from fiabilite import simuler_fiabilite, tirer_capacites
+from data import GestionReseau, Liaison, Noeud, ReseauHydraulique
+
+RESEAUX = os.path.join(os.path.dirname(__file__), '..', 'reseaux.json')
+
+
+def test_fiabilite_egale_reconstruction():
+    noeuds, liaisons = GestionReseau.charger_reseau(RESEAUX, "Demo")
+    reseau = ReseauHydraulique(noeuds, liaisons)
+    parametres = dict(
+        pannes=0.2,
+        rendement_sources=("beta", 4, 2),
+        rendements={"K": ("uniforme", 0.5, 1)},
+    )
+    capacites = tirer_capacites(reseau, 30, rng=np.random.default_rng(3), **parametres)
+    simulation = simuler_fiabilite(
+        noeuds, liaisons, nb_tirages=30, graine=3, **parametres
+    )
+
+    attendus = []
+    for ligne in capacites:
+        tires = [
+            (
+                Noeud(
+                    n.nom,
+                    n.type,
+                    ligne[
+                        (
+                            reseau.position_arete("super_source", n.nom)
+                            if n.type == "source"
+                            else reseau.position_arete(n.nom, "super_puits")
+                        )
+                    ],
+                )
+                if n.type in ("source", "ville")
+                else n
+            )
+            for n in noeuds
+        ]
+        disponibles = [
+            Liaison(li.depart, li.arrivee, ligne[position])
+            for li, position in zip(reseau.liaisons, reseau.positions_liaisons)
+        ]
+        attendus.append(ReseauHydraulique(tires, disponibles, cache=None).valeur_flot())
+    assert simulation["flots"].tolist() == attendus
+    assert simulation["flot_base"] == reseau.valeur_flot()
+    assert min(attendus) < reseau.valeur_flot()
+    assert (
+        0
+        <= simulation["probabilite_service_complet"]
+        <= min(simulation["probabilite_villes"].values())
+    )
+    assert set(simulation["frequence_saturation"]) == {
+        (li.depart, li.arrivee) for li in liaisons
+    }
+
+    with pytest.raises(ValueError):
+        simuler_fiabilite(noeuds, liaisons, nb_tirages=2, pannes=1.5)
+    with pytest.raises(ValueError, match="Au moins un tirage"):
+        simuler_fiabilite(noeuds, liaisons, nb_tirages=0)
+    with pytest.raises(ValueError):
+        simuler_fiabilite(
+            noeuds, liaisons, nb_tirages=2, rendements={"A": ("gamma", 1)}
+        )
+    with pytest.raises(KeyError):
+        simuler_fiabilite(noeuds, liaisons, nb_tirages=2, pannes={("A", "L"): 0.5})
+
+
+def test_fiabilite_reproductible_et_parallele():
+    noeuds, liaisons = GestionReseau.charger_reseau(RESEAUX, "Demo")
+    nominal = simuler_fiabilite(noeuds, liaisons, nb_tirages=5)
+    base = ReseauHydraulique(noeuds, liaisons)
+    assert set(nominal["flots"].tolist()) == {base.valeur_flot()}
+    satures = {(d, a) for d, a, _ in base.liaisons_saturees(base.resultat_courant())}
+    assert {
+        paire for paire, f in nominal["frequence_saturation"].items() if f == 1.0
+    } == satures
+
+    parametres = dict(
+        nb_tirages=200, pannes=0.1, rendement_sources=("normale", 0.8, 0.2)
+    )
+    a = simuler_fiabilite(noeuds, liaisons, graine=7, **parametres)
+    b = simuler_fiabilite(noeuds, liaisons, graine=7, n_jobs=2, **parametres)
+    assert np.array_equal(a["flots"], b["flots"])
+    assert a["probabilite_villes"] == b["probabilite_villes"]
+    assert a["frequence_saturation"] == b["frequence_saturation"]
+    assert a["quantiles"][5] <= a["quantiles"][50] <= a["quantiles"][95]
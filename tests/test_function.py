@@ -1,6 +1,10 @@
 import sys
 import os
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
+from scipy.sparse import csr_matrix
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -11,9 +15,14 @@ from data import (
     satisfaction,
     optimiser_liaisons,
     ReseauHydraulique,
+    ResultatFlot,
+    EvaluateurCandidats,
     Liaison,
     Noeud,
+    calibrer_moteurs,
 )
+import moteurs
+from moteurs import MOTEURS
 
 liaison_existe = GestionReseau.liaison_existe
 
@@ -59,20 +68,12 @@ def test_resau_hydraulique_calculer_flot_maximal_and_liaisons_saturees(monkeypat
     mock_result = MagicMock()
     mock_result.flow_value = 15
 
-    def flow_getitem(index):
-        i, j = index
-        nom_i = reseau_hydro.index_inverse.get(i)
-        nom_j = reseau_hydro.index_inverse.get(j)
-        if (nom_i, nom_j) == ("A", "B"):
-            return 5
-        if (nom_i, nom_j) == ("B", "C"):
-            return 10
-        return 0
-
-    mock_flow = MagicMock()
-    mock_flow.__getitem__.side_effect = flow_getitem
-    mock_result.flow = mock_flow
-    monkeypatch.setattr('data.maximum_flow', lambda *args, **kwargs: mock_result)
+    idx = reseau_hydro.index_noeuds
+    mock_result.flow = csr_matrix(
+        ([5, 10], ([idx["A"], idx["B"]], [idx["B"], idx["C"]])),
+        shape=reseau_hydro.matrice_sparse.shape,
+    )
+    monkeypatch.setattr('moteurs.maximum_flow', lambda *args, **kwargs: mock_result)
     result, index_noeuds = reseau_hydro.calculerFlotMaximal()
     assert result.flow_value == 15
     assert "A" in index_noeuds
@@ -98,6 +99,24 @@ def test_construction_matrice():
     assert reseau_hydro.matrice_np.shape == (n, n)
 
 
+def test_construction_matrice_sparse_sans_dense():
+    noeuds = [
+        Noeud("A", "source", 10),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 15),
+    ]
+    liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 10), Liaison("A", "B", 7)]
+    reseau_hydro = ReseauHydraulique(noeuds, liaisons)
+    idx = reseau_hydro.index_noeuds
+    matrice = reseau_hydro.matrice_sparse
+    assert matrice[idx["A"], idx["B"]] == 7  # la dernière liaison en double l'emporte
+    assert matrice[idx["B"], idx["C"]] == 10
+    assert matrice[idx["super_source"], idx["A"]] == 10
+    assert matrice[idx["C"], idx["super_puits"]] == 15
+    assert matrice.nnz == 4
+    assert (reseau_hydro.matrice_np == matrice.toarray()).all()
+
+
 def test_calcul_flot_maximal():
     noeuds = [
         Noeud("A", "source", 10),
@@ -110,6 +129,44 @@ def test_calcul_flot_maximal():
     assert result.flow_value == 5  # Correction : le flot max est bien 5
 
 
+def test_resultat_flot_structure():
+    noeuds = [
+        Noeud("A", "source", 10),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 15),
+    ]
+    liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 10)]
+    reseau_hydro = ReseauHydraulique(noeuds, liaisons)
+    result, index = reseau_hydro.calculerFlotMaximal(afficher=False)
+    assert isinstance(result, ResultatFlot)
+    flux = result.flux_par_arc()
+    assert flux[("A", "B")] == 5
+    assert flux[("B", "C")] == 5
+    assert flux[("super_source", "A")] == 5
+    assert flux[("C", "super_puits")] == 5
+    saturees = {
+        (result.index_inverse[i], result.index_inverse[j])
+        for i, j in zip(
+            result.departs[result.saturees], result.arrivees[result.saturees]
+        )
+    }
+    assert saturees == {("A", "B")}
+    assert result.flow[index["A"], index["B"]] == 5
+
+
+def test_calculer_flot_rapport_optionnel(capsys):
+    noeuds = [Noeud("A", "source", 10), Noeud("B", "ville", 10)]
+    liaisons = [Liaison("A", "B", 4)]
+    reseau_hydro = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    result, _ = reseau_hydro.calculerFlotMaximal()
+    assert capsys.readouterr().out == ""
+    reseau_hydro.calculerFlotMaximal(afficher=True)
+    out = capsys.readouterr().out
+    assert "Flot maximal total : 4 unités" in out
+    assert "A ➝ B : 4 unités" in out
+    assert "A ➝ B : 4 unités" in result.rapport()
+
+
 def test_liaisons_saturees_simple():
     noeuds = [
         Noeud("A", "source", 10),
@@ -124,6 +181,28 @@ def test_liaisons_saturees_simple():
     assert ("B", "C", 8) not in saturees  # liaison non saturée car 8 < 10
 
 
+def test_indicateurs_vectorises_liaisons():
+    noeuds = [
+        Noeud("S1", "source", 10),
+        Noeud("S2", "source", 5),
+        Noeud("V1", "ville", 15),
+    ]
+    liaisons = [Liaison("S1", "V1", 10), Liaison("S2", "V1", 8), Liaison("S1", "S2", 0)]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    result, _ = reseau.calculerFlotMaximal()
+    assert reseau.flux_liaisons(result).tolist() == [10, 5, 0]
+    assert reseau.capacites_residuelles(result).tolist() == [0, 3, 0]
+    taux = reseau.taux_utilisation(result)
+    assert taux[0] == 1.0
+    assert taux[1] == 5 / 8
+    assert np.isnan(taux[2])
+    pos = reseau.position_arete("S2", "V1")
+    assert reseau.matrice_sparse.data[pos] == 8
+    assert reseau.matrice_sparse.data[reseau.position_arete("super_source", "S2")] == 5
+    with pytest.raises(KeyError):
+        reseau.position_arete("V1", "S1")
+
+
 def test_default_value_on_empty_input(monkeypatch):
     inputs = iter([''])
     monkeypatch.setattr('builtins.input', lambda _: next(inputs))
@@ -165,20 +244,20 @@ def test_optimiser_liaisons(monkeypatch):
         Liaison("B", "C", 10),
     ]
     liaisons_a_optimiser = [("A", "B"), ("B", "C")]
-    flow_values = [15, 18, 22, 25]
 
-    def mock_calculerFlotMaximal(self):
-        flow_value = flow_values.pop(0) if flow_values else 25
-        mock_result = MagicMock()
-        mock_result.flow_value = flow_value
-        return mock_result, self.index_noeuds
+    # Un seul calcul complet : les essais de capacité repartent du flot courant
+    resolutions = {"count": 0}
+    resoudre = ReseauHydraulique._resoudre
 
-    monkeypatch.setattr(
-        ReseauHydraulique, "calculerFlotMaximal", mock_calculerFlotMaximal
-    )
+    def compter_resoudre(self):
+        resolutions["count"] += 1
+        resoudre(self)
+
+    monkeypatch.setattr(ReseauHydraulique, "_resoudre", compter_resoudre)
     meilleure_config, travaux_effectues = optimiser_liaisons(
         noeuds, liaisons_actuelles, liaisons_a_optimiser
     )
+    assert resolutions["count"] == 1
     assert len(travaux_effectues) > 0
     assert all(isinstance(liaison, Liaison) for liaison in meilleure_config)
     for travail in travaux_effectues:
@@ -186,7 +265,9 @@ def test_optimiser_liaisons(monkeypatch):
         assert isinstance(liaison, tuple) and len(liaison) == 2
         assert isinstance(cap, int)
         assert isinstance(flot, (int, float))
-        assert flot >= 15
+        assert flot >= 10
+    assert travaux_effectues == [(("A", "B"), 10, 10)]
+    assert liaisons_actuelles[0].capacite == 5
 
 
 def test_modification_liaison_ameliore_flot():
@@ -213,56 +294,419 @@ def test_satisfaction_amelioration_progresive(monkeypatch):
     ]
     liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 10)]
 
-    class MockResult:
-        def __init__(self, flow_value):
-            self.flow_value = flow_value
+    resolutions = {"count": 0}
+    resoudre = ReseauHydraulique._resoudre
 
-    flot_values = [10, 12, 15, 15]
-    calls = {"count": 0}
+    def compter_resoudre(self):
+        resolutions["count"] += 1
+        resoudre(self)
+
+    monkeypatch.setattr(ReseauHydraulique, "_resoudre", compter_resoudre)
+    liaisons_finales, travaux = satisfaction(
+        noeuds, liaisons, cap_max=15, max_travaux=5
+    )
+    assert resolutions["count"] == 1
+    assert travaux == [(("A", "B"), 10, 10)]
+    assert [liaison.capacite for liaison in liaisons_finales] == [10, 10]
+    assert liaisons[0].capacite == 5
 
-    def mock_calculerFlotMaximal(self):
-        val = flot_values[calls["count"]]
-        calls["count"] += 1
-        return MockResult(val), None
 
-    saturations_sequence = [[("A", "B", 5)], [("A", "B", 10)], [("B", "C", 10)], []]
+def test_satisfaction_arret_sans_amelioration():
+    noeuds = [Noeud("A", "source", 10), Noeud("C", "ville", 10)]
+    liaisons = [Liaison("A", "C", 10)]
+    liaisons_finales, travaux = satisfaction(
+        noeuds, liaisons, cap_max=15, max_travaux=3
+    )
+    assert len(travaux) == 0
+    assert liaisons_finales == liaisons
 
-    def mock_liaisons_saturees(self, result):
-        idx = calls["count"] - 1
-        if idx < len(saturations_sequence):
-            return saturations_sequence[idx]
-        return []
 
+def test_augmenter_capacite_mise_a_jour_a_chaud():
+    noeuds = [
+        Noeud("A", "source", 20),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 15),
+    ]
+    liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 10)]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    assert reseau.valeur_flot() == 5
+    assert reseau.evaluer_capacite("A", "B", 8) == 8
+    assert reseau.valeur_flot() == 5  # l'évaluation ne modifie pas le réseau
+    assert reseau.augmenter_capacite("A", "B", 12) == 10
+    assert reseau.augmenter_capacite("A", "C", 3) == 13  # nouvelle liaison
+    assert liaisons[0].capacite == 5  # les liaisons d'origine ne sont pas modifiées
+    assert ("A", "C", 3) in reseau.liaisons_saturees(reseau.resultat_courant())
+    flot_complet, _ = ReseauHydraulique(noeuds, reseau.liaisons).calculerFlotMaximal()
+    assert flot_complet.flow_value == 13
+    with pytest.raises(ValueError):
+        reseau.augmenter_capacite("A", "B", 1)
+
+
+def test_insertion_liaison_noeud_inconnu_sans_effet():
+    noeuds = [Noeud("A", "source", 10), Noeud("B", "ville", 10)]
+    reseau = ReseauHydraulique(noeuds, [Liaison("A", "B", 4)], verbeux=False)
+    assert reseau.valeur_flot() == 4
+    liaisons = list(reseau.liaisons)
+    matrice = reseau.matrice_sparse.copy()
+    for appel in (reseau.augmenter_capacite, reseau.modifier_capacite):
+        with pytest.raises(KeyError, match="ZZ"):
+            appel("A", "ZZ", 3)
+        with pytest.raises(KeyError, match="ZZ"):
+            appel("ZZ", "B", 3)
+    assert reseau.liaisons == liaisons
+    assert (reseau.matrice_sparse != matrice).nnz == 0
+    assert reseau.valeur_flot() == 4
+    assert ReseauHydraulique(noeuds, reseau.liaisons).valeur_flot() == 4
+    assert reseau.augmenter_capacite("A", "B", 6) == 6
+
+
+def test_diminuer_capacite_reparation_du_flot():
+    noeuds = [
+        Noeud("S1", "source", 10),
+        Noeud("S2", "source", 10),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 15),
+    ]
+    liaisons = [
+        Liaison("S1", "B", 10),
+        Liaison("S2", "B", 10),
+        Liaison("S1", "C", 5),
+        Liaison("B", "C", 10),
+    ]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    assert reseau.valeur_flot() == 15
+    assert reseau.evaluer_capacite("B", "C", 4) == 9
+    assert reseau.valeur_flot() == 15  # l'évaluation ne modifie pas le réseau
+    assert reseau.diminuer_capacite("S1", "B", 0) == 15  # flux dévié par S2
+    assert reseau.diminuer_capacite("B", "C", 4) == 9
+    flot_complet, _ = ReseauHydraulique(
+        noeuds, reseau.liaisons, verbeux=False
+    ).calculerFlotMaximal()
+    assert flot_complet.flow_value == 9
+    with pytest.raises(ValueError):
+        reseau.diminuer_capacite("B", "C", 6)
+    with pytest.raises(KeyError):
+        reseau.diminuer_capacite("C", "S1", 0)
+
+
+def test_assechement_source_mise_a_jour_a_chaud():
+    noeuds = [
+        Noeud("S1", "source", 10),
+        Noeud("S2", "source", 8),
+        Noeud("C", "ville", 20),
+    ]
+    liaisons = [Liaison("S1", "C", 10), Liaison("S2", "C", 10)]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    assert reseau.valeur_flot() == 18
+    assert reseau.modifier_capacite_noeud("S1", 0) == 8
+    assert reseau.modifier_capacite_noeud("S2", 0) == 0  # assèchements cumulés
+    assert noeuds[0].capaciteMax == 10  # les nœuds d'origine ne sont pas modifiés
+    assert reseau.resultat_courant().flux.sum() == 0
+    with pytest.raises(ValueError):
+        reseau.modifier_capacite_noeud("C", -1)
+
+
+def test_mises_a_jour_a_chaud_sans_reconstruction(monkeypatch):
+    from generateur import generer_reseau, parametres_echelle
+
+    gestion = generer_reseau(**parametres_echelle(300), graine=4)
+    reseau = ReseauHydraulique(gestion.ListeNoeuds, gestion.ListeLiaisons, cache=None)
+    reseau.valeur_flot()
+
+    # Un seul graphe de parcours par recherche, quel que soit le nombre de chemins
+    constructions, chemins = [], []
+    graphe_parcours = moteurs.GrapheResiduel.graphe_parcours
+    chemin = moteurs.GrapheResiduel.chemin
     monkeypatch.setattr(
-        ReseauHydraulique, "calculerFlotMaximal", mock_calculerFlotMaximal
+        moteurs.GrapheResiduel,
+        "graphe_parcours",
+        lambda self, positifs: constructions.append(1)
+        or graphe_parcours(self, positifs),
     )
-    monkeypatch.setattr(ReseauHydraulique, "liaisons_saturees", mock_liaisons_saturees)
-    liaisons_finales, travaux = satisfaction(
-        noeuds, liaisons, cap_max=15, max_travaux=5
+    monkeypatch.setattr(
+        moteurs.GrapheResiduel,
+        "chemin",
+        lambda self, *args: chemins.append(1) or chemin(self, *args),
     )
-    assert len(travaux) >= 0
+
+    total_constructions = 0
+    for etape in range(12):
+        # Hausse d'une liaison de la coupe minimale, ou baisse d'une liaison saturée
+        if etape % 2 == 0:
+            coupe = reseau.coupe_minimale()
+            depart, arrivee, capacite = coupe[etape % len(coupe)]
+            capacite += 25
+        else:
+            saturees = reseau.liaisons_saturees(reseau.resultat_courant())
+            depart, arrivee, capacite = saturees[etape % len(saturees)]
+            capacite //= 2
+        constructions.clear()
+        flot = reseau.modifier_capacite(depart, arrivee, capacite)
+        assert len(constructions) <= 5  # une fois par recherche, pas par chemin
+        total_constructions += len(constructions)
+        complet = ReseauHydraulique(
+            list(reseau.noeuds.values()), reseau.liaisons, cache=None, moteur="dinic"
+        )
+        assert flot == complet.valeur_flot()
+        flux, capacites = reseau._flux, reseau.matrice_sparse.data
+        assert ((flux >= 0) & (flux <= capacites)).all()
+    assert len(chemins) > total_constructions
+
+
+@pytest.mark.parametrize("moteur", list(MOTEURS))
+def test_moteurs_de_flot_equivalents(moteur):
+    noeuds = [
+        Noeud("S1", "source", 10),
+        Noeud("S2", "source", 10),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 15),
+    ]
+    liaisons = [
+        Liaison("S1", "B", 10),
+        Liaison("S2", "B", 10),
+        Liaison("S1", "C", 5),
+        Liaison("B", "C", 10),
+    ]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False, moteur=moteur)
+    result, _ = reseau.calculerFlotMaximal()
+    assert result.flow_value == 15
+    assert result.moteur == moteur
+    assert (result.flux <= result.capacites).all()
+    assert reseau.flux_liaisons(result)[[2, 3]].tolist() == [5, 10]
 
 
-def test_satisfaction_arret_sans_amelioration(monkeypatch):
-    noeuds = [Noeud("A", "source", 10), Noeud("C", "ville", 10)]
-    liaisons = [Liaison("A", "C", 10)]
+def test_moteur_auto_et_calibration(monkeypatch):
+    monkeypatch.setattr("moteurs.CALIBRATION", {})
+    noeuds = [Noeud("A", "source", 10), Noeud("C", "ville", 15)]
+    liaisons = [Liaison("A", "C", 5)]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    result, _ = reseau.calculerFlotMaximal()
+    assert result.moteur in MOTEURS
+    durees = calibrer_moteurs([reseau], moteurs=["dinic", "networkx"], repetitions=1)
+    (mesures,) = durees.values()
+    gagnant = min(mesures, key=mesures.get)
+    result, _ = reseau.calculerFlotMaximal()
+    assert result.moteur == reseau.moteur_utilise == gagnant
+    with pytest.raises(ValueError):
+        ReseauHydraulique(noeuds, liaisons, moteur="simplexe")
 
-    class MockResult:
-        def __init__(self):
-            self.flow_value = 10
 
-    def mock_calculerFlotMaximal(self):
-        return MockResult(), None
+def test_coupe_minimale_et_liaisons_ameliorables():
+    noeuds = [
+        Noeud("A", "source", 30),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 8),
+        Noeud("D", "ville", 20),
+    ]
+    liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 10), Liaison("A", "D", 30)]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    coupe = reseau.coupe_minimale()
+    assert sum(cap for _, _, cap in coupe) == reseau.valeur_flot() == 25
+    assert ("A", "B", 5) in coupe and ("D", "super_puits", 20) in coupe
+    # Seule A -> B limite encore le flot : B -> C et A -> D ne sont pas saturées
+    assert reseau.liaisons_ameliorables().tolist() == [True, False, False]
 
-    def mock_liaisons_saturees(self, result):
-        return []
 
-    monkeypatch.setattr(
-        ReseauHydraulique, "calculerFlotMaximal", mock_calculerFlotMaximal
+def test_satisfaction_ne_teste_que_la_coupe(monkeypatch):
+    noeuds = [
+        Noeud("A", "source", 20),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 15),
+    ]
+    liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 20), Liaison("A", "C", 3)]
+    testees = set()
+    dimensionner = ReseauHydraulique.dimensionner_capacite
+
+    def tracer_dimensionner(self, depart, arrivee, *args):
+        testees.add((depart, arrivee))
+        return dimensionner(self, depart, arrivee, *args)
+
+    monkeypatch.setattr(ReseauHydraulique, "dimensionner_capacite", tracer_dimensionner)
+    _, travaux = satisfaction(noeuds, liaisons, cap_max=15, max_travaux=3)
+    assert travaux[0][0] in {("A", "B"), ("A", "C")}
+    assert ("B", "C") not in testees
+
+
+def test_dimensionner_capacite_analytique(monkeypatch):
+    noeuds = [
+        Noeud("A", "source", 12),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 20),
+    ]
+    liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 10)]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    evaluations = {"count": 0}
+    evaluer = moteurs.evaluer_capacite
+
+    def compter_evaluer(*args):
+        evaluations["count"] += 1
+        return evaluer(*args)
+
+    monkeypatch.setattr(moteurs, "evaluer_capacite", compter_evaluer)
+    # Au-delà de 10, B -> C devient le goulot : capacité utile exacte de A -> B
+    assert reseau.dimensionner_capacite("A", "B", 1000) == (10, 10)
+    assert evaluations["count"] <= 2
+    assert reseau.dimensionner_capacite("A", "B", 1000, pas=3) == (11, 10)
+    assert reseau.dimensionner_capacite("A", "B", 0, niveaux=[6, 15, 20]) == (15, 10)
+    assert reseau.dimensionner_capacite("B", "C", 25) == (10, 5)  # aucun gain
+
+
+def test_optimiser_liaisons_niveaux_configurables():
+    noeuds = [
+        Noeud("A", "source", 7),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 15),
+    ]
+    liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 10)]
+    _, travaux = optimiser_liaisons(noeuds, liaisons, [("A", "B")])
+    assert travaux == [(("A", "B"), 7, 7)]
+    _, travaux = optimiser_liaisons(
+        noeuds, liaisons, [("A", "B")], niveaux=[5, 10, 15, 20]
     )
-    monkeypatch.setattr(ReseauHydraulique, "liaisons_saturees", mock_liaisons_saturees)
-    liaisons_finales, travaux = satisfaction(
-        noeuds, liaisons, cap_max=15, max_travaux=3
+    assert travaux == [(("A", "B"), 10, 7)]
+    _, travaux = satisfaction(noeuds, liaisons, cap_max=25, pas=5)
+    assert travaux == [(("A", "B"), 10, 7)]
+
+
+def test_evaluation_parallele_identique_au_calcul_serie():
+    noeuds = [
+        Noeud("S1", "source", 30),
+        Noeud("S2", "source", 30),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 25),
+        Noeud("D", "ville", 25),
+    ]
+    liaisons = [
+        Liaison("S1", "B", 4),
+        Liaison("S2", "B", 4),
+        Liaison("B", "C", 6),
+        Liaison("B", "D", 6),
+        Liaison("S1", "C", 3),
+        Liaison("S2", "D", 3),
+    ]
+    candidats = [(liaison.depart, liaison.arrivee) for liaison in liaisons]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    serie = EvaluateurCandidats(reseau).dimensionner(candidats, 20)
+    with ThreadPoolExecutor(2) as executor:
+        avec_executeur = EvaluateurCandidats(reseau, executor=executor).dimensionner(
+            candidats, 20
+        )
+    with EvaluateurCandidats(reseau, n_jobs=2) as evaluateur:
+        en_processus = evaluateur.dimensionner(candidats, 20)
+    assert serie == avec_executeur == en_processus
+    assert reseau.valeur_flot() == 14  # le réseau évalué n'est pas modifié
+
+    # Même plan de travaux, égalités comprises (S1 -> C et S2 -> D apportent autant)
+    assert satisfaction(noeuds, liaisons, cap_max=20) == satisfaction(
+        noeuds, liaisons, cap_max=20, n_jobs=2
     )
-    assert len(travaux) == 0
-    assert liaisons_finales == liaisons
+
+
+def test_optimiser_liaisons_mode_exact_combinaison():
+    noeuds = [
+        Noeud("A", "source", 20),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 18),
+    ]
+    liaisons = [Liaison("A", "B", 5), Liaison("B", "C", 5)]
+    candidats = [("A", "B"), ("B", "C")]
+    # Aucune hausse seule n'augmente le flot : le mode glouton s'arrête
+    _, travaux = optimiser_liaisons(noeuds, liaisons, candidats, niveaux=[10, 15, 20])
+    assert travaux == []
+    config, travaux = optimiser_liaisons(
+        noeuds, liaisons, candidats, niveaux=[10, 15, 20], mode="exact"
+    )
+    assert travaux == [(("A", "B"), 20, 5), (("B", "C"), 20, 18)]
+    assert [liaison.capacite for liaison in config] == [20, 20]
+    _, travaux = optimiser_liaisons(
+        noeuds, liaisons, candidats, niveaux=[10, 15, 20], mode="exact", max_travaux=1
+    )
+    assert travaux == []
+    with pytest.raises(ValueError):
+        optimiser_liaisons(noeuds, liaisons, candidats, mode="aleatoire")
+
+
+def test_optimiser_liaisons_mode_exact_grande_echelle():
+    # Douze chemins A -> Bi -> C d'environ un million d'unités : seule la hausse des deux
+    # liaisons d'un chemin le porte à 2 000 000. Les plans optimaux ne diffèrent que de
+    # quelques unités, bien en deçà de l'écart relatif par défaut du solveur (1e-4).
+    entrees = [9, 16, 75, 166, 80, 157, 63, 47, 158, 175, 15, 11]
+    sorties = [143, 83, 189, 196, 252, 247, 241, 206, 299, 221, 168, 21]
+    noeuds = [Noeud("A", "source", 10**9), Noeud("C", "ville", 10**9)]
+    liaisons = []
+    for i, (entree, sortie) in enumerate(zip(entrees, sorties)):
+        noeuds.append(Noeud(f"B{i}", "intermediaire", 0))
+        liaisons += [
+            Liaison("A", f"B{i}", 1_000_000 + entree),
+            Liaison(f"B{i}", "C", 1_000_000 + sortie),
+        ]
+    candidats = [(liaison.depart, liaison.arrivee) for liaison in liaisons]
+    _, glouton = optimiser_liaisons(noeuds, liaisons, candidats, niveaux=[2_000_000])
+    config, exact = optimiser_liaisons(
+        noeuds, liaisons, candidats, niveaux=[2_000_000], mode="exact", max_travaux=7
+    )
+    # Optimum (programmation dynamique sur les chemins) : 15 001 115
+    assert exact[-1][2] == ReseauHydraulique(noeuds, config).valeur_flot() == 15_001_115
+    # Le mode glouton, arrêté après le même nombre de travaux, fait moins bien
+    assert len(exact) <= 7 and glouton[6][2] < exact[-1][2]
+
+
+def test_evaluer_scenarios_par_lot():
+    noeuds = [
+        Noeud("S1", "source", 10),
+        Noeud("S2", "source", 8),
+        Noeud("B", "intermediaire", 0),
+        Noeud("C", "ville", 20),
+    ]
+    liaisons = [Liaison("S1", "B", 10), Liaison("S2", "B", 10), Liaison("B", "C", 15)]
+    reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    capacites = reseau.scenarios_capacites(
+        [
+            {},
+            {("super_source", "S1"): 0},  # assèchement de S1
+            {("B", "C"): 5, ("S2", "B"): 2},
+        ]
+    )
+    capacites = np.vstack([capacites, np.ones(reseau.matrice_sparse.nnz)])
+    valeurs, flux = reseau.evaluer_scenarios(capacites, avec_flux=True)
+    assert valeurs.tolist() == [15, 8, 5, 1]
+    assert (flux <= capacites).all()
+
+    # Même flot qu'un réseau construit avec les capacités du scénario
+    attendu, _ = ReseauHydraulique(
+        noeuds, [Liaison("S1", "B", 10), Liaison("S2", "B", 2), Liaison("B", "C", 5)]
+    ).calculerFlotMaximal(afficher=False)
+    assert valeurs[2] == attendu.flow_value
+    assert flux[2, reseau.position_arete("B", "C")] == 5
+
+    with EvaluateurCandidats(reseau, n_jobs=2) as evaluateur:
+        assert (evaluateur.evaluer_scenarios(capacites)[0] == valeurs).all()
+    assert reseau.valeur_flot() == 15  # le réseau n'est pas modifié
+    with pytest.raises(ValueError):
+        reseau.evaluer_scenarios(capacites[:, :-1])
+
+
+def test_satisfaction_silencieuse_et_journalisee(capsys, caplog):
+    import logging
+    from data import resume_travaux
+
+    noeuds = [
+        Noeud("S", "source", 20),
+        Noeud("I", "intermediaire"),
+        Noeud("V", "ville", 15),
+    ]
+    liaisons = [Liaison("S", "I", 5), Liaison("I", "V", 10)]
+    ReseauHydraulique(noeuds, liaisons).calculerFlotMaximal()
+    config, travaux = satisfaction(noeuds, liaisons, cap_max=20)
+    assert capsys.readouterr().out == ""
+
+    with caplog.at_level(logging.INFO, logger="data"):
+        satisfaction(noeuds, liaisons, cap_max=20)
+    assert "Goulot d'étranglement" in caplog.text
+    assert "Flot final : 10 / 15" in caplog.text
+
+    travaux += [(("S", "I"), 12, 10), (("X", "V"), 3, 11)]
+    assert resume_travaux(liaisons, travaux) == {
+        ("S", "I"): {"cap_depart": 5, "cap_fin": 12, "flot": 10},
+        ("X", "V"): {"cap_depart": None, "cap_fin": 3, "flot": 11},
+    }
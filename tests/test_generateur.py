@@ -0,0 +1,74 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+)
+from data import GestionReseau, ReseauCompact, ReseauHydraulique
+from generateur import (
+    ecrire_reseau,
+    generer_compact,
+    generer_reseau,
+    generer_tableaux,
+    parametres_echelle,
+)
+
+
+def test_generation_reproductible_par_graine():
+    parametres = dict(couches=(6, 4), fan_out=2, redondance=0.3, loi="lognormale")
+    a = generer_tableaux(graine=7, **parametres)
+    b = generer_tableaux(graine=7, **parametres)
+    c = generer_tableaux(graine=8, **parametres)
+    assert a[0] == b[0]
+    assert all(np.array_equal(x, y) for x, y in zip(a[1:], b[1:]))
+    assert not np.array_equal(a[-1], c[-1])
+
+
+def test_reseau_en_couches_connexe():
+    gestion = generer_reseau(nb_sources=3, nb_villes=4, couches=(5, 6, 5), fan_out=2)
+    noms = {n.nom: n for n in gestion.ListeNoeuds}
+    types = [n.type for n in gestion.ListeNoeuds]
+    assert types.count("source") == 3 and types.count("ville") == 4
+    assert all(1 <= li.capacite <= 30 for li in gestion.ListeLiaisons)
+    # Chaque nœud non source reçoit au moins une liaison
+    recoivent = {li.arrivee for li in gestion.ListeLiaisons}
+    assert {nom for nom, n in noms.items() if n.type != "source"} <= recoivent
+    paires = [(li.depart, li.arrivee) for li in gestion.ListeLiaisons]
+    assert len(paires) == len(set(paires))
+
+    result, _ = ReseauHydraulique(
+        gestion.ListeNoeuds, gestion.ListeLiaisons, verbeux=False
+    ).calculerFlotMaximal()
+    assert result.flow_value > 0
+
+
+def test_goulot_limite_le_flot():
+    parametres = dict(couches=(8, 8), fan_out=3, capacites_liaisons=(20, 20))
+    libre = generer_compact(graine=1, **parametres).flot_maximal()[0]
+    etrangle = generer_compact(
+        graine=1, goulots=3, facteur_goulot=0.05, **parametres
+    ).flot_maximal()[0]
+    assert etrangle < libre
+    with pytest.raises(ValueError):
+        generer_tableaux(goulots=5, couches=(2,))
+    with pytest.raises(ValueError):
+        generer_tableaux(loi="normale")
+
+
+def test_formats_de_sortie(tmp_path):
+    parametres = dict(parametres_echelle(300), graine=2)
+    gestion = generer_reseau(**parametres)
+    assert 250 <= len(gestion.ListeNoeuds) <= 350
+
+    for destination in ("reseaux.json", "reseaux.db"):
+        chemin = str(tmp_path / destination)
+        ecrire_reseau(chemin, "synthese", **parametres)
+        noeuds, liaisons = GestionReseau.charger_reseau(chemin, "synthese")
+        assert noeuds == list(gestion.ListeNoeuds)
+        assert liaisons == list(gestion.ListeLiaisons)
+
+    ecrire_reseau(str(tmp_path / "binaire"), **parametres)
+    compact = ReseauCompact.ouvrir(str(tmp_path / "binaire"))
+    assert compact.vers_listes() == (gestion.ListeNoeuds, gestion.ListeLiaisons)
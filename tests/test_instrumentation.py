@@ -0,0 +1,67 @@
+import sys
+import os
+import json
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+)
+import instrumentation
+from data import Liaison, Noeud, ReseauHydraulique, satisfaction
+from instrumentation import instrumenter
+
+
+def _reseau():
+    noeuds = [
+        Noeud("S", "source", 20),
+        Noeud("I", "intermediaire"),
+        Noeud("V", "ville", 15),
+    ]
+    return noeuds, [Liaison("S", "I", 5), Liaison("I", "V", 10)]
+
+
+def test_compteurs_et_phases():
+    noeuds, liaisons = _reseau()
+    with instrumenter() as stats:
+        reseau = ReseauHydraulique(noeuds, liaisons, verbeux=False)
+        reseau.calculerFlotMaximal()
+        reseau.augmenter_capacite("S", "I", 8)
+        reseau.evaluer_capacite("S", "I", 12)
+    assert stats.compteurs == {
+        "ReseauHydraulique": 1,
+        "flot_maximal": 1,
+        "mise_a_jour": 1,
+        "evaluation": 1,
+    }
+    assert stats.passages["construction"] == stats.passages["resolution"] == 1
+    assert stats.matrices["nombre"] == 1 and stats.matrices["noeuds_max"] == 5
+    assert all(duree >= 0 for duree in stats.temps.values())
+    json.dumps(stats.resume())
+    assert "flot_maximal" in stats.rapport()
+
+    # Hors du bloc, rien n'est relevé
+    ReseauHydraulique(noeuds, liaisons, verbeux=False).calculerFlotMaximal()
+    assert stats.compteurs["ReseauHydraulique"] == 1
+    assert instrumentation.actif() is None
+    assert instrumentation.mesurer("resolution") is instrumentation._NUL
+
+
+def test_instrumentation_satisfaction_imbriquee(capsys):
+    noeuds, liaisons = _reseau()
+    with instrumenter() as externe:
+        with instrumenter() as interne:
+            satisfaction(noeuds, liaisons, cap_max=20, max_travaux=2)
+        ReseauHydraulique(noeuds, liaisons, verbeux=False)
+    assert interne.compteurs["flot_maximal"] >= 1
+    assert interne.compteurs["dimensionnement"] >= 1
+    assert externe.compteurs["ReseauHydraulique"] == (
+        interne.compteurs["ReseauHydraulique"] + 1
+    )
+
+
+def test_profileur_pyinstrument():
+    pytest.importorskip("pyinstrument")
+    noeuds, liaisons = _reseau()
+    with instrumenter(profileur=True) as stats:
+        ReseauHydraulique(noeuds, liaisons, verbeux=False).calculerFlotMaximal()
+    assert stats.profil is not None and not stats.profil.is_running